@@ -1,7 +1,6 @@
 package classes;
 
 import ev3dev.actuators.lego.motors.EV3LargeRegulatedMotor;
-import lejos.hardware.port.MotorPort;
 import lejos.utility.Delay;
 import java.lang.Math;
 
@@ -16,18 +15,17 @@ public class EV3MovePilot {
     EV3LargeRegulatedMotor rightMotor;
 
     public EV3MovePilot() {
-        // Start params
-		this.wheelDiameter = 5.6;
-		this.wheelDistance = 11.7;
+        // The robot parameters are generated from .env to RobotConfig.java
+        this.wheelDiameter = RobotConfig.wheelDiameter;
+        this.wheelDistance = RobotConfig.wheelDistance;
         this.wheelCircumference = Math.PI*this.wheelDiameter;
         this.rotationCircumference = Math.PI*wheelDistance;
-		this.motorSpeed = 500;
-		this.motorRotationSpeed = 250;
-		this.leftMotor = new EV3LargeRegulatedMotor(MotorPort.A);
-		this.rightMotor = new EV3LargeRegulatedMotor(MotorPort.B);
+        this.motorSpeed = RobotConfig.motorSpeed;
+        this.motorRotationSpeed = RobotConfig.motorRotationSpeed;
+        this.leftMotor = RobotConfig.createLeftMotor();
+        this.rightMotor = RobotConfig.createRightMotor();
         this.leftMotor.brake();
         this.rightMotor.brake();
-        // End params
     }
 
     public void setSpeed(int speed) {
@@ -0,0 +1,23 @@
+package classes;
+
+import ev3dev.actuators.lego.motors.EV3LargeRegulatedMotor;
+import lejos.hardware.port.MotorPort;
+
+// Generated by the compiler from the robot parameters in .env, changes will be overwritten.
+public final class RobotConfig {
+    public static final double wheelDiameter = 5.6;
+    public static final double wheelDistance = 11.7;
+    public static final int motorSpeed = 500;
+    public static final int motorRotationSpeed = 250;
+
+    private RobotConfig() {
+    }
+
+    public static EV3LargeRegulatedMotor createLeftMotor() {
+        return new EV3LargeRegulatedMotor(MotorPort.A);
+    }
+
+    public static EV3LargeRegulatedMotor createRightMotor() {
+        return new EV3LargeRegulatedMotor(MotorPort.B);
+    }
+}
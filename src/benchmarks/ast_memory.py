@@ -0,0 +1,91 @@
+"""AST memory benchmark. Parses a program of procedures and calls and prints the memory
+that the AST takes per node, measured with tracemalloc, and the shallow size of a node and
+of its position object.
+
+Run from the src directory:
+    python -m benchmarks.ast_memory [--procedures 300] [--parser descent]
+"""
+
+import argparse
+import gc
+import sys
+import tracemalloc
+from benchmarks.incremental_parsing import generate_program
+from compiler.compiler import PARSERS, PLY_PARSER
+from lexer.lexer import Lexer
+from parser.incremental_parser import walk
+
+DEFAULT_PROCEDURES = 300
+
+
+def shallow_size(obj):
+    """Returns the size of obj and of its instance dictionary, if it has one."""
+    size = sys.getsizeof(obj)
+    if hasattr(obj, "__dict__"):
+        size += sys.getsizeof(obj.__dict__)
+    return size
+
+
+def attribute_values(obj):
+    """Returns the values of the instance dictionary or the slots of obj."""
+    if hasattr(obj, "__dict__"):
+        return list(obj.__dict__.values())
+    names = [name for cls in type(obj).__mro__ for name in getattr(cls, "__slots__", ())]
+    return [getattr(obj, name) for name in names]
+
+
+def position_size(position):
+    """Returns the size of a position object and of the tuples it holds."""
+    return shallow_size(position) + sum(
+        sys.getsizeof(value) for value in attribute_values(position) if isinstance(value, tuple)
+    )
+
+
+def run(procedure_count=DEFAULT_PROCEDURES, parser_name=PLY_PARSER):
+    """Prints the memory of the AST of a generated program. Returns a dict of the node
+    count and the bytes per node."""
+    lexer = Lexer()
+    lexer.build()
+    parser = PARSERS[parser_name](lexer)
+    code = generate_program(procedure_count)
+    tokens = lexer.tokenize(code)
+    # Build the parser tables before measuring.
+    parser.parse(code, tokens=tokens)
+
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    start_node = parser.parse(code, tokens=tokens)
+    gc.collect()
+    total = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+
+    nodes = list(walk(start_node))
+    positions = {id(node.position): node.position for node in nodes if node.position}
+    results = {
+        "nodes": len(nodes),
+        "bytes_per_node": total / len(nodes),
+        "node_bytes": sum(shallow_size(node) for node in nodes) / len(nodes),
+        "position_bytes": sum(map(position_size, positions.values())) / len(positions),
+    }
+    print(f"{len(nodes)} nodes, {parser_name} parser")
+    print(f"AST {total / 1024:.1f} KiB, {results['bytes_per_node']:.1f} bytes per node")
+    print(f"node object {results['node_bytes']:.1f} bytes")
+    print(f"position object {results['position_bytes']:.1f} bytes")
+    return results
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument(
+        "--procedures", type=int, default=DEFAULT_PROCEDURES, help="Procedure count."
+    )
+    arg_parser.add_argument(
+        "--parser", choices=sorted(PARSERS), default=PLY_PARSER, help="Parser backend."
+    )
+    args = arg_parser.parse_args()
+    run(args.procedures, args.parser)
+
+
+if __name__ == "__main__":
+    main()
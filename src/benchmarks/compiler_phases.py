@@ -0,0 +1,209 @@
+"""Compiler phase benchmark. Compiles the programs in the logo/ directory and programs of
+benchmarks.program_generator with a profiling Compiler, and prints the minimum, median
+and percentile times of each phase: lexing, preparsing, parsing, type checking and code
+generation.
+
+The results can be saved as a baseline, and later runs are compared to it. The benchmark
+fails if a phase is slower than the baseline by more than the threshold. The phases are
+compared by their minimum time by default, because the median of a phase can change by
+tens of percents between runs on a busy machine, while the minimum stays close to the cost
+of the phase.
+
+Run from the src directory:
+    python -m benchmarks.compiler_phases [--repeat 20] [--save] [--threshold 0.2]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+from benchmarks.program_generator import ProgramGenerator
+from compiler.artifact_cache import ArtifactCache
+from compiler.batch import find_logo_files
+from compiler.compiler import Compiler, PARSERS, PLY_PARSER
+from utils.error_handler import FIN
+
+BENCHMARKS_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_PATH = os.path.join(BENCHMARKS_DIR, "..", "..", "logo")
+DEFAULT_BASELINE = os.path.join(BENCHMARKS_DIR, "baseline.json")
+DEFAULT_REPEAT = 20
+# A phase regresses if it is more than 20 % slower than in the baseline, and the
+# difference is more than MIN_DIFF_MS. Shorter differences are timer noise.
+DEFAULT_THRESHOLD = 0.2
+DEFAULT_STATISTIC = "min_ms"
+MIN_DIFF_MS = 0.05
+# Settings of the generated programs, see ProgramGenerator
+GENERATED_PROGRAMS = {
+    "generated": {},
+    "generated fin": {"language": FIN},
+    "generated large": {"procedures": 50, "depth": 4, "make_chain": 100, "statements": 1000},
+}
+
+PHASES = ("lex", "preparse", "parse", "check types", "generate code")
+# Sum of the phases of a compilation, excluding the lexer build of a new Compiler.
+TOTAL = "total"
+SETUP_PHASES = ("lexer build",)
+
+
+def load_cases(path=DEFAULT_PATH, generated_programs=None):
+    """Returns a dict of case name, list of programs. The logo/ programs are one case, and
+    each generated program is a case of its own."""
+    if generated_programs is None:
+        generated_programs = GENERATED_PROGRAMS
+    programs = []
+    for filepath in find_logo_files(path):
+        with open(filepath, "r", encoding="utf8") as file:
+            programs.append(file.read())
+
+    cases = {"samples": programs}
+    for case, settings in generated_programs.items():
+        cases[case] = [ProgramGenerator(**settings).generate()]
+    return cases
+
+
+def summarize(times):
+    """Returns the median, 90th and 95th percentile and the minimum of the times."""
+    if len(times) > 1:
+        percentiles = statistics.quantiles(times, n=20, method="inclusive")
+        p90, p95 = percentiles[17], percentiles[18]
+    else:
+        p90 = p95 = times[0]
+    return {
+        "median_ms": round(statistics.median(times), 3),
+        "p90_ms": round(p90, 3),
+        "p95_ms": round(p95, 3),
+        "min_ms": round(min(times), 3),
+    }
+
+
+def measure(compiler, programs, repeat, output_dir):
+    """Compiles the programs repeat times and returns a dict of phase name, list of the
+    milliseconds that each round of compiling all the programs spent in the phase."""
+    times = {phase: [] for phase in PHASES + (TOTAL,)}
+    for _ in range(repeat):
+        round_times = dict.fromkeys(times, 0.0)
+        for code in programs:
+            result = compiler.compile(
+                code, java_path=output_dir, errors_path=output_dir, write_errors_to_console=False
+            )
+            for phase, phase_times in result.profile["phases"].items():
+                if phase in round_times:
+                    round_times[phase] += phase_times["wall_ms"]
+                if phase not in SETUP_PHASES:
+                    round_times[TOTAL] += phase_times["wall_ms"]
+        for phase, milliseconds in round_times.items():
+            times[phase].append(milliseconds)
+    return times
+
+
+def run(cases, repeat=DEFAULT_REPEAT, parser_name=PLY_PARSER):
+    """Benchmarks each case and prints the phase timings. Returns a dict of case name,
+    dict of phase name, summary of the phase times."""
+    # The artifact cache is turned off, so that every compilation runs all the phases.
+    compiler = Compiler(
+        parser_name=parser_name, artifact_cache=ArtifactCache(maxsize=0), profile=True
+    )
+    results = {}
+    with tempfile.TemporaryDirectory() as output_dir:
+        print(
+            f"{'case':<18} {'phase':<14} {'min ms':>10} {'median ms':>10} {'p90 ms':>10}"
+            f" {'p95 ms':>10}"
+        )
+        for case, programs in cases.items():
+            # Build the parser tables before timing.
+            measure(compiler, programs, 1, output_dir)
+            times = measure(compiler, programs, repeat, output_dir)
+            results[case] = {phase: summarize(phase_times) for phase, phase_times in times.items()}
+            for phase, summary in results[case].items():
+                print(
+                    f"{case:<18} {phase:<14} {summary['min_ms']:>10.3f}"
+                    f" {summary['median_ms']:>10.3f} {summary['p90_ms']:>10.3f}"
+                    f" {summary['p95_ms']:>10.3f}"
+                )
+    return results
+
+
+def find_regressions(results, baseline, threshold=DEFAULT_THRESHOLD, statistic=DEFAULT_STATISTIC):
+    """Compares the statistic of the results, e.g. "median_ms", to the baseline. Returns a
+    list of (case, phase, baseline ms, result ms) of the phases that are slower by more than
+    threshold. Cases and phases missing from the baseline are skipped."""
+    regressions = []
+    for case, phases in results.items():
+        for phase, summary in phases.items():
+            baseline_summary = baseline.get(case, {}).get(phase)
+            if baseline_summary is None:
+                continue
+            before = baseline_summary[statistic]
+            after = summary[statistic]
+            if after > before * (1 + threshold) and after - before > MIN_DIFF_MS:
+                regressions.append((case, phase, before, after))
+    return regressions
+
+
+def load_baseline(path):
+    """Returns the results stored in the baseline file, or None if it doesn't exist."""
+    if not os.path.exists(path):
+        return None
+    with open(path, "r", encoding="utf-8") as file:
+        return json.load(file)["results"]
+
+
+def save_baseline(path, results, parser_name):
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump(
+            {"python": sys.version.split()[0], "parser": parser_name, "results": results},
+            file,
+            indent=2,
+        )
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument("--path", default=DEFAULT_PATH, help="directory of .logo files")
+    arg_parser.add_argument(
+        "--repeat", type=int, default=DEFAULT_REPEAT, help="compilations of each case"
+    )
+    arg_parser.add_argument(
+        "--parser", choices=sorted(PARSERS), default=PLY_PARSER, help="Parser backend."
+    )
+    arg_parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="baseline json file")
+    arg_parser.add_argument(
+        "--save", action="store_true", help="save the results as the new baseline"
+    )
+    arg_parser.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help="allowed slowdown of a phase, 0.2 is 20 %%",
+    )
+    arg_parser.add_argument(
+        "--statistic",
+        choices=("min_ms", "median_ms", "p90_ms", "p95_ms"),
+        default=DEFAULT_STATISTIC,
+        help="phase times compared to the baseline",
+    )
+    args = arg_parser.parse_args()
+
+    results = run(load_cases(args.path), args.repeat, args.parser)
+    if args.save:
+        save_baseline(args.baseline, results, args.parser)
+        print(f"Baseline saved to {args.baseline}")
+        return
+
+    baseline = load_baseline(args.baseline)
+    if baseline is None:
+        print(f"No baseline in {args.baseline}, save one with --save")
+        return
+
+    regressions = find_regressions(results, baseline, args.threshold, args.statistic)
+    for case, phase, before, after in regressions:
+        print(f"Regression: {case}, {phase}: {before:.3f} ms -> {after:.3f} ms")
+    if regressions:
+        sys.exit(1)
+    print(f"No phase is more than {args.threshold:.0%} slower than the baseline")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""Incremental parsing benchmark. Parses a program of procedures and calls in full, then
+types into one procedure and prints the average time of parsing each edit incrementally.
+
+Run from the src directory:
+    python -m benchmarks.incremental_parsing [--procedures 300] [--edits 50] [--parser descent]
+"""
+
+import argparse
+import time
+from compiler.compiler import PARSERS, PLY_PARSER
+from lexer.lexer import Lexer
+from parser.incremental_parser import IncrementalParser
+
+DEFAULT_PROCEDURES = 300
+DEFAULT_EDITS = 50
+
+PROCEDURE = """to p{0} :a :b
+    make "c :a + :b * 2
+    fd :c
+    rt 90
+    output :c
+end
+"""
+
+
+def generate_program(procedure_count):
+    """Returns a program of procedure_count procedures of six lines and a call of each."""
+    procedures = "".join(PROCEDURE.format(index) for index in range(procedure_count))
+    calls = "".join(f"show p{index} 1 2\n" for index in range(procedure_count))
+    return procedures + calls
+
+
+def run(procedure_count=DEFAULT_PROCEDURES, edits=DEFAULT_EDITS, parser_name=PLY_PARSER):
+    """Prints the time of a full parse and the average time of an edit. Returns them as a
+    (full seconds, edit seconds) pair."""
+    lexer = Lexer()
+    lexer.build()
+    parser = IncrementalParser(PARSERS[parser_name](lexer), lexer)
+    code = generate_program(procedure_count)
+    # Build the parser tables before timing.
+    parser.parse(code)
+
+    start = time.perf_counter()
+    parser.parse(code)
+    full = time.perf_counter() - start
+
+    # Type digits one at a time into a procedure in the middle of the program.
+    position = code.index("fd :c", len(code) // 3) + len("fd :c")
+    start = time.perf_counter()
+    for _ in range(edits):
+        parser.reparse(position, position, "1")
+        position += 1
+    edit = (time.perf_counter() - start) / edits
+
+    print(f"{code.count(chr(10))} lines, {parser_name} parser")
+    print(f"full parse {full * 1000:.2f} ms, edit {edit * 1000:.2f} ms")
+    return full, edit
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument(
+        "--procedures", type=int, default=DEFAULT_PROCEDURES, help="Procedure count."
+    )
+    arg_parser.add_argument("--edits", type=int, default=DEFAULT_EDITS, help="Edit count.")
+    arg_parser.add_argument(
+        "--parser", choices=sorted(PARSERS), default=PLY_PARSER, help="Parser backend."
+    )
+    args = arg_parser.parse_args()
+    run(args.procedures, args.edits, args.parser)
+
+
+if __name__ == "__main__":
+    main()
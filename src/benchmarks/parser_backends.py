@@ -0,0 +1,78 @@
+"""Parser backend benchmark. Parses the programs in the logo/ directory with the PLY parser
+and the recursive descent parser, and prints the time of the first parse, which for PLY
+includes generating the LALR tables, and the average time of the following parses.
+
+Run from the src directory:
+    python -m benchmarks.parser_backends [--repeat 50] [--path ../logo]
+"""
+
+import argparse
+import os
+import time
+from compiler.batch import find_logo_files
+from compiler.compiler import PARSERS
+from lexer.lexer import Lexer
+from parser.parser import Parser
+from parser.table_cache import TableCache
+
+DEFAULT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "logo")
+DEFAULT_REPEAT = 50
+
+
+def create_parser(parser_name):
+    """Returns a new parser of the backend. The PLY parser gets an empty table cache, so
+    that the first parse generates the tables."""
+    lexer = Lexer()
+    lexer.build()
+    if PARSERS[parser_name] is Parser:
+        return Parser(lexer, table_cache=TableCache(use_disk=False))
+    return PARSERS[parser_name](lexer)
+
+
+def measure(parser_name, programs, repeat):
+    """Returns the seconds of the first parse and the average seconds of a parse of all
+    the programs after it."""
+    parser = create_parser(parser_name)
+
+    start = time.perf_counter()
+    for code in programs:
+        parser.parse(code)
+    first = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for code in programs:
+            parser.parse(code)
+    return first, (time.perf_counter() - start) / repeat
+
+
+def run(path=DEFAULT_PATH, repeat=DEFAULT_REPEAT):
+    """Parses the programs with each backend and prints the timings. Returns a dict of
+    backend name, (first seconds, average seconds) pairs."""
+    programs = []
+    for filepath in find_logo_files(path):
+        with open(filepath, "r", encoding="utf8") as file:
+            programs.append(file.read())
+
+    results = {}
+    print(f"{len(programs)} programs from {os.path.normpath(path)}")
+    print(f"{'parser':>10} {'first ms':>10} {'average ms':>12}")
+    for parser_name in PARSERS:
+        first, average = measure(parser_name, programs, repeat)
+        results[parser_name] = (first, average)
+        print(f"{parser_name:>10} {first * 1000:>10.2f} {average * 1000:>12.2f}")
+    return results
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument("--path", default=DEFAULT_PATH, help="directory of .logo files")
+    arg_parser.add_argument(
+        "--repeat", type=int, default=DEFAULT_REPEAT, help="parses of each program"
+    )
+    args = arg_parser.parse_args()
+    run(args.path, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""Parser scaling benchmark. Parses programs of growing statement counts and prints the
+parse time per statement, which stays flat when parsing is linear in the program size.
+
+Run from the src directory:
+    python -m benchmarks.parser_scaling [--sizes 1000 10000 100000] [--parser descent]
+"""
+
+import argparse
+import time
+from compiler.compiler import PARSERS, PLY_PARSER
+from lexer.lexer import Lexer
+
+DEFAULT_SIZES = (1000, 10000, 100000)
+
+STATEMENTS = ("fd 10", "rt 90", 'make "a 1 + 2', "show :a")
+
+
+def generate_program(statement_count):
+    """Returns a program of statement_count statements, all in the top level list."""
+    return "\n".join(STATEMENTS[index % len(STATEMENTS)] for index in range(statement_count))
+
+
+def measure(parser, statement_count):
+    """Returns the seconds used to parse a program of statement_count statements."""
+    code = generate_program(statement_count)
+    start = time.perf_counter()
+    parser.parse(code)
+    return time.perf_counter() - start
+
+
+def run(sizes=DEFAULT_SIZES, parser_name=PLY_PARSER):
+    """Parses a program of each size with the parser backend and prints the timings.
+    Returns a list of (statement count, seconds) pairs."""
+    lexer = Lexer()
+    lexer.build()
+    parser = PARSERS[parser_name](lexer)
+    # Build the parser tables before timing.
+    parser.parse(generate_program(1))
+
+    results = []
+    print(f"{'statements':>12} {'seconds':>10} {'us/statement':>14}")
+    for size in sizes:
+        seconds = measure(parser, size)
+        results.append((size, seconds))
+        print(f"{size:>12} {seconds:>10.3f} {seconds / size * 1e6:>14.2f}")
+    return results
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument(
+        "--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="Statement counts."
+    )
+    arg_parser.add_argument(
+        "--parser", choices=sorted(PARSERS), default=PLY_PARSER, help="Parser backend."
+    )
+    args = arg_parser.parse_args()
+    run(args.sizes, args.parser)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,226 @@
+"""Synthetic Logo program generator. Generates valid programs that are much larger than the
+programs in logo/, for the benchmarks and the tests. Each dimension of a program can be
+scaled on its own: the number of procedures and their parameters, the nesting depth of
+repeat, for, if and ifelse blocks, the size of the expressions and the length of a chain
+of make commands, where each variable is computed from the previous one.
+
+The same settings generate the same program in English and Finnish, only the keywords
+differ. Print a program from the src directory:
+    python -m benchmarks.program_generator [--statements 20] [--depth 3] [--language fin]
+"""
+
+import argparse
+import random
+from utils.error_handler import ENG, FIN
+
+KEYWORDS = {
+    ENG: {
+        "to": "to",
+        "end": "end",
+        "output": "output",
+        "make": "make",
+        "fd": "fd",
+        "bk": "bk",
+        "rt": "rt",
+        "lt": "lt",
+        "show": "show",
+        "repeat": "repeat",
+        "for": "for",
+        "if": "if",
+        "ifelse": "ifelse",
+    },
+    FIN: {
+        "to": "miten",
+        "end": "valmis",
+        "output": "anna",
+        "make": "olkoon",
+        "fd": "eteen",
+        "bk": "taakse",
+        "rt": "oikealle",
+        "lt": "vasemmalle",
+        "show": "tulosta",
+        "repeat": "toista",
+        "for": "luvuille",
+        "if": "jos",
+        "ifelse": "riippuen",
+    },
+}
+
+MOVES = ("fd", "rt", "bk", "lt")
+BLOCKS = ("repeat", "for", "if", "ifelse")
+OPERATORS = ("+", "-", "*", "/")
+RELATIONS = ("<", ">", "<=", ">=", "=", "<>")
+INDENT = "    "
+
+
+class ProgramGenerator:
+    """Generates a program of the given size. The program declares procedures procedures
+    with parameters parameters each, then a chain of make_chain global variables, then
+    statements top-level statements. The bodies of the procedures and every third
+    top-level statement are blocks nested depth deep, and the expressions have
+    expression_size operands. The choices of operators and literals come from a random
+    generator seeded with seed, so the same settings always generate the same program.
+    Without indent, the lines of the nested blocks are not indented, and the length of the
+    program grows linearly with depth."""
+
+    def __init__(
+        self,
+        language=ENG,
+        procedures=10,
+        parameters=2,
+        depth=2,
+        expression_size=3,
+        make_chain=10,
+        statements=100,
+        seed=0,
+        indent=True,
+    ):
+        if language not in KEYWORDS:
+            raise ValueError(f"Unknown language {language}")
+        self.keywords = KEYWORDS[language]
+        self.procedures = procedures
+        self.parameters = parameters
+        self.depth = depth
+        self.expression_size = max(expression_size, 1)
+        self.make_chain = make_chain
+        self.statements = statements
+        self.seed = seed
+        self.indent = indent
+        self._random = None
+        self._lines = None
+
+    def generate(self):
+        """Returns the program as a string."""
+        self._random = random.Random(self.seed)
+        self._lines = []
+        for index in range(self.procedures):
+            self._procedure(index)
+        self._make_chain()
+        global_names = [f"v{self.make_chain - 1}"] if self.make_chain else []
+        for index in range(self.statements):
+            if index % 3 == 2:
+                self._block(self.depth, global_names, 0)
+            elif index % 3 == 1 and self.procedures:
+                call = self._call(index % self.procedures, global_names)
+                self._line(0, f"{self.keywords['show']} {call}")
+            else:
+                self._move(global_names, 0)
+        program = "\n".join(self._lines) + "\n"
+        self._lines = None
+        return program
+
+    def _line(self, level, text):
+        self._lines.append(INDENT * level + text if self.indent else text)
+
+    def _literal(self):
+        return str(self._random.randint(1, 9))
+
+    def _operand(self, names):
+        if names and self._random.random() < 0.5:
+            return ":" + self._random.choice(names)
+        return self._literal()
+
+    def _expression(self, names, size=None):
+        """Returns an expression of size operands, the names of the variables and literals
+        joined with arithmetic operators. Divisors are literals, so no division is by
+        zero."""
+        size = self.expression_size if size is None else size
+        parts = [self._operand(names)]
+        for _ in range(size - 1):
+            operator = self._random.choice(OPERATORS)
+            operand = self._literal() if operator == "/" else self._operand(names)
+            parts.append(f"{operator} {operand}")
+        return " ".join(parts)
+
+    def _condition(self, names):
+        relation = self._random.choice(RELATIONS)
+        return f"{self._expression(names)} {relation} {self._expression(names, 1)}"
+
+    def _call(self, index, names):
+        arguments = "".join(f" ({self._expression(names)})" for _ in range(self.parameters))
+        return f"p{index}{arguments}"
+
+    def _move(self, names, level):
+        move = self.keywords[self._random.choice(MOVES)]
+        self._line(level, f"{move} {self._expression(names)}")
+
+    def _block(self, depth, names, level):
+        """Adds a block of nested blocks depth deep, with a move in the innermost block.
+        The else branch of ifelse is a single move, so the size of the block grows
+        linearly with depth. The blocks are opened in a loop and closed in reverse, so
+        that programs nested deeper than the recursion limit can be generated."""
+        opened = []
+        for block_depth in range(depth, 0, -1):
+            block = BLOCKS[block_depth % len(BLOCKS)]
+            keyword = self.keywords[block]
+            if block == "repeat":
+                self._line(level, f"{keyword} {self._random.randint(1, 4)} {{")
+            elif block == "for":
+                iterator = f"i{block_depth}"
+                self._line(level, f'{keyword} ["{iterator} 1 {self._random.randint(1, 4)} 1] {{')
+                names = names + [iterator]
+            else:
+                self._line(level, f"{keyword} {self._condition(names)} {{")
+            opened.append((block, names, level))
+            level += 1
+
+        self._move(names, level)
+        for block, block_names, block_level in reversed(opened):
+            if block == "ifelse":
+                self._line(block_level, "} {")
+                self._move(block_names, block_level + 1)
+            self._line(block_level, "}")
+
+    def _procedure(self, index):
+        """Adds procedure p<index>, which calls the procedure declared before it and
+        outputs a value computed from its parameters. The local variable l is computed
+        from all the parameters, so that the type of each parameter is known."""
+        names = [f"a{parameter}" for parameter in range(self.parameters)]
+        parameters = "".join(f" :{name}" for name in names)
+        self._line(0, f"{self.keywords['to']} p{index}{parameters}")
+        local = "".join(f":{name} + " for name in names) + self._expression(names)
+        self._line(1, f'{self.keywords["make"]} "l {local}')
+        names = names + ["l"]
+        if index > 0:
+            self._line(1, f'{self.keywords["make"]} "r {self._call(index - 1, names)}')
+            names = names + ["r"]
+        self._block(self.depth, names, 1)
+        self._line(1, f"{self.keywords['output']} {self._expression(names)}")
+        self._line(0, self.keywords["end"])
+
+    def _make_chain(self):
+        """Adds the global variables v0, v1, ..., each computed from the previous one."""
+        for index in range(self.make_chain):
+            names = [f"v{index - 1}"] if index else []
+            self._line(0, f'{self.keywords["make"]} "v{index} {self._expression(names)}')
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument("--language", choices=sorted(KEYWORDS), default=ENG)
+    for setting, default in (
+        ("procedures", 10),
+        ("parameters", 2),
+        ("depth", 2),
+        ("expression-size", 3),
+        ("make-chain", 10),
+        ("statements", 100),
+        ("seed", 0),
+    ):
+        arg_parser.add_argument(f"--{setting}", type=int, default=default)
+    args = arg_parser.parse_args()
+    generator = ProgramGenerator(
+        args.language,
+        args.procedures,
+        args.parameters,
+        args.depth,
+        args.expression_size,
+        args.make_chain,
+        args.statements,
+        args.seed,
+    )
+    print(generator.generate(), end="")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+"""Compiler scaling benchmark. Compiles generated programs that grow in one dimension at a
+time, e.g. the nesting depth of the blocks, and prints the time of each phase per unit of
+the dimension. The time per unit stays flat when a phase is linear in the dimension, and
+grows with the size when it is quadratic. A phase whose time per unit grows more than
+SUPERLINEAR_GROWTH times while the size doubles is marked with "!", and programs that
+exceed the recursion limit are reported with the function that raised.
+
+Run from the src directory:
+    python -m benchmarks.program_scaling [--dimensions depth expression_size] [--steps 4]
+"""
+
+import argparse
+import sys
+import tempfile
+import traceback
+from benchmarks.compiler_phases import PHASES
+from benchmarks.program_generator import ProgramGenerator
+from compiler.artifact_cache import ArtifactCache
+from compiler.compiler import Compiler, PARSERS, PLY_PARSER
+
+# The other dimensions are kept small while one of them grows.
+BASE_SETTINGS = {
+    "procedures": 1,
+    "parameters": 2,
+    "depth": 1,
+    "expression_size": 3,
+    "make_chain": 1,
+    "statements": 10,
+}
+# The first size of each dimension, doubled at each step.
+START_SIZES = {
+    "statements": 500,
+    "procedures": 100,
+    "parameters": 4,
+    "depth": 100,
+    "expression_size": 200,
+    "make_chain": 500,
+}
+DEFAULT_STEPS = 4
+DEFAULT_REPEAT = 3
+SUPERLINEAR_GROWTH = 1.5
+
+
+def measure(compiler, code, repeat, output_dir):
+    """Returns a dict of phase name, minimum milliseconds of the phase in repeat
+    compilations of the code."""
+    best = {}
+    for _ in range(repeat):
+        result = compiler.compile(
+            code, java_path=output_dir, errors_path=output_dir, write_errors_to_console=False
+        )
+        if not result.success:
+            raise ValueError("Generated program has errors")
+        for phase in PHASES:
+            milliseconds = result.profile["phases"].get(phase, {"wall_ms": 0.0})["wall_ms"]
+            best[phase] = min(best.get(phase, milliseconds), milliseconds)
+    return best
+
+
+def run_dimension(dimension, steps=DEFAULT_STEPS, repeat=DEFAULT_REPEAT, parser_name=PLY_PARSER):
+    """Compiles programs of doubling size in the dimension and prints the microseconds of
+    each phase per unit. Returns a list of (size, dict of phase name, microseconds per
+    unit), and the description of the error if a program exceeded the recursion limit."""
+    compiler = Compiler(
+        parser_name=parser_name, artifact_cache=ArtifactCache(maxsize=0), profile=True
+    )
+    results = []
+    previous = None
+    with tempfile.TemporaryDirectory() as output_dir:
+        for step in range(steps):
+            size = START_SIZES[dimension] * 2**step
+            settings = dict(BASE_SETTINGS, indent=False, **{dimension: size})
+            code = ProgramGenerator(**settings).generate()
+            try:
+                # The first compilation builds the parser tables, and is not timed.
+                measure(compiler, code, 1, output_dir)
+                best = measure(compiler, code, repeat, output_dir)
+            except RecursionError as error:
+                frame = traceback.extract_tb(error.__traceback__)[-1]
+                failure = f"RecursionError in {frame.name} ({frame.filename}:{frame.lineno})"
+                print(f"{dimension:<16} {size:>8} {failure}")
+                return results, failure
+
+            per_unit = {phase: best[phase] / size * 1000 for phase in PHASES}
+            columns = []
+            for phase in PHASES:
+                growing = previous and per_unit[phase] > previous[phase] * SUPERLINEAR_GROWTH
+                columns.append(f" {per_unit[phase]:>13.2f}{'!' if growing else ' '}")
+            print(f"{dimension:<16} {size:>8} {''.join(columns)}")
+            results.append((size, per_unit))
+            previous = per_unit
+    return results, None
+
+
+def run(dimensions=tuple(START_SIZES), steps=DEFAULT_STEPS, parser_name=PLY_PARSER):
+    """Runs run_dimension for each dimension. Returns a dict of dimension, results, and a
+    list of the recursion limit failures."""
+    print(f"Microseconds per unit of the dimension, {parser_name} parser")
+    print(f"{'dimension':<16} {'size':>8} {''.join(f' {phase:>13} ' for phase in PHASES)}")
+    results = {}
+    failures = []
+    for dimension in dimensions:
+        results[dimension], failure = run_dimension(dimension, steps, parser_name=parser_name)
+        if failure:
+            failures.append((dimension, failure))
+    return results, failures
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument(
+        "--dimensions",
+        nargs="+",
+        choices=tuple(START_SIZES),
+        default=tuple(START_SIZES),
+        help="dimensions of the programs to grow",
+    )
+    arg_parser.add_argument(
+        "--steps", type=int, default=DEFAULT_STEPS, help="doublings of each dimension"
+    )
+    arg_parser.add_argument(
+        "--parser", choices=sorted(PARSERS), default=PLY_PARSER, help="Parser backend."
+    )
+    args = arg_parser.parse_args()
+    _, failures = run(args.dimensions, args.steps, args.parser)
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,9 @@
 """Code Generator module"""
 # pylint: disable=too-many-public-methods, too-many-instance-attributes
 import os
+from code_generator.code_sink import CodeSink
 from entities.logotypes import LogoType
+from utils.file_writer import write_chunks_if_changed, write_if_changed
 from utils.logger import Logger, default_logger
 from lexer.token_types import TokenType
 
@@ -32,6 +34,40 @@ DEFAULT_NAME = "Logo"
 PATH = os.path.join(
     os.path.dirname(os.path.relpath(__file__)), "../../logomotion_gradle/src/main/java/logo/"
 )
+CLASSES_PATH = os.path.join(PATH, "../classes/")
+# Robot parameters in .env, with the values used when they are not set
+ROBOT_CONFIG_DEFAULTS = {
+    "wheelDiameter": "5.6",
+    "wheelDistance": "11.7",
+    "leftMotor": "A",
+    "rightMotor": "B",
+    "motorSpeed": "500",
+    "motorRotationSpeed": "250",
+}
+ROBOT_CONFIG_TEMPLATE = """package classes;
+
+import ev3dev.actuators.lego.motors.EV3LargeRegulatedMotor;
+import lejos.hardware.port.MotorPort;
+
+// Generated by the compiler from the robot parameters in .env, changes will be overwritten.
+public final class RobotConfig {{
+    public static final double wheelDiameter = {wheelDiameter};
+    public static final double wheelDistance = {wheelDistance};
+    public static final int motorSpeed = {motorSpeed};
+    public static final int motorRotationSpeed = {motorRotationSpeed};
+
+    private RobotConfig() {{
+    }}
+
+    public static EV3LargeRegulatedMotor createLeftMotor() {{
+        return new EV3LargeRegulatedMotor(MotorPort.{leftMotor});
+    }}
+
+    public static EV3LargeRegulatedMotor createRightMotor() {{
+        return new EV3LargeRegulatedMotor(MotorPort.{rightMotor});
+    }}
+}}
+"""
 JAVA_TYPES = {
     LogoType.FLOAT: "DoubleVariable",
     LogoType.STRING: "StrVariable",
@@ -46,43 +82,105 @@ JAVA_TYPES_OBJECTS = {
     LogoType.BOOL : "Boolean"
 }
 
-class JavaCodeGenerator:
-    """A class for generating Java code"""
+class PrimitiveExpression(str):
+    """Java expression of a primitive double, boolean or String value. Used instead of
+    a temp variable in the unboxed mode. Knows its logo type, so that the value can be
+    boxed where a wrapper object is needed."""
+
+    def __new__(cls, code, logotype):
+        expression = super().__new__(cls, code)
+        expression.logotype = logotype
+        return expression
+
 
-    def __init__(self, name=DEFAULT_NAME, **dependencies):
-        self._main = []
-        self._method = []
+class JavaCodeGenerator:
+    """A class for generating Java code. In the unboxed mode (optimize=True) literals and
+    operations are generated as inline primitive expressions, and values are only wrapped
+    into Variable objects when they are stored into variables, passed to procedures or
+    returned."""
+
+    def __init__(self, name=DEFAULT_NAME, optimize=False, **dependencies):
+        # Generated lines are streamed to sinks instead of kept in lists. Procedure
+        # declarations go to their own sink, because they are written before run().
+        self._main = CodeSink()
+        self._method = CodeSink()
         self._proc_flag = False
         self._name = name
+        self._optimize = optimize
+        self._lambda_depth = 0
         self._temp_var_index = 0
         self._logger: Logger = dependencies.get("logger", default_logger)
         self._preconf_funcs_dict = dependencies.get("funcs_dict", {})
         self._java_variable_names = {}
         self._java_function_names = {}
+        self._preconf_function_names = {}
+        self._preconf_temp_var_index = 0
 
     def set_preconf_funcs_dict(self, pre_func_dict):
         # pylint: disable=W0201
         self._preconf_funcs_dict = pre_func_dict
+        # The preconfigured functions keep their mangled names when the generator is reset.
+        self._preconf_function_names = dict(self._java_function_names)
+        self._preconf_temp_var_index = self._temp_var_index
 
     def _increase_temp_var_index(self):
         """increase index for temp variables"""
         self._temp_var_index += 1
         return self._temp_var_index
 
+    def get_temp_var_count(self):
+        """Returns the number of temp variables, variables and functions named since the
+        last reset"""
+        return self._temp_var_index - self._preconf_temp_var_index
+
+    def close(self):
+        """Closes the code sinks. The generator can't be used after it is closed."""
+        self._main.close()
+        self._method.close()
+
     def reset(self):
-        """Resets code generator internals."""
-        self._main = []
+        """Resets code generator internals. Preconfigured functions keep their names."""
+        self._main.reset()
         self._java_variable_names = {}
-        self._temp_var_index = 0
-        self._method = []
+        self._java_function_names = dict(self._preconf_function_names)
+        self._temp_var_index = self._preconf_temp_var_index
+        self._method.reset()
         self._proc_flag = False
+        self._lambda_depth = 0
+
+    @staticmethod
+    def _unbox(value):
+        """Returns the Java expression for the primitive value of value."""
+        if isinstance(value, PrimitiveExpression):
+            return value
+        return f"{value}.value"
+
+    @staticmethod
+    def _box(value):
+        """Returns the Java expression for value as a Variable object."""
+        if isinstance(value, PrimitiveExpression):
+            return f"new {JAVA_TYPES[value.logotype]}({value})"
+        return value
+
+    @property
+    def direct_returns(self):
+        """True if output outside of lambdas is generated as a return statement instead
+        of a thrown ReturnException."""
+        return self._optimize
+
+    @property
+    def inline_loops(self):
+        """True if repeat and for with a literal block are generated as Java loops
+        instead of a lambda passed to the preconfigured function."""
+        return self._optimize
 
     def _append_code(self, code):
         if self._proc_flag:
             self._method.append(code)
         else:
             self._main.append(code)
-        self._logger.debug(code)
+        if self._logger.debug_enabled:
+            self._logger.debug(code)
 
     def start_function_declaration(self, logo_func_name, logo_func_type):
         if self._proc_flag:
@@ -136,26 +234,30 @@ class JavaCodeGenerator:
         self._append_code(code)
 
     def return_statement(self, arg_var):
-        code = f"throw new ReturnException({arg_var});"
+        if self.direct_returns and self._lambda_depth == 0:
+            code = f"return {self._box(arg_var)};"
+        else:
+            # A lambda cannot return from the procedure, the exception is caught there.
+            code = f"throw new ReturnException({self._box(arg_var)});"
         self._append_code(code)
 
     def function_call(self, logo_func_name, arg_vars):
         java_func_name = self._mangle_java_function_name(logo_func_name)
-        arguments = ", ".join(arg_vars)
+        arguments = ", ".join(self._box(arg_var) for arg_var in arg_vars)
         code = f"this.{java_func_name}({arguments});"
         self._append_code(code)
 
     def returning_function_call(self, logo_func_name, arg_vars):
         temp_var = self._generate_temp_var()
         java_func_name = self._mangle_java_function_name(logo_func_name)
-        arguments = ", ".join(arg_vars)
+        arguments = ", ".join(self._box(arg_var) for arg_var in arg_vars)
         code = f"var {temp_var} = this.{java_func_name}({arguments});"
         self._append_code(code)
         return temp_var
 
     def returning_function_call_outside_procedure(self, logo_func_name, arg_vars, temp_var):
         java_func_name = self._mangle_java_function_name(logo_func_name)
-        arguments = ", ".join(arg_vars)
+        arguments = ", ".join(self._box(arg_var) for arg_var in arg_vars)
         code = f"{temp_var} = this.{java_func_name}({arguments});"
         self._append_code(code)
         return temp_var
@@ -181,24 +283,30 @@ class JavaCodeGenerator:
         if logo_var_name in self._java_variable_names:
             del self._java_variable_names[logo_var_name]
         else:
-            print("Attempted to remove key that doesn't exist in code_generator,\
-                remove_java_variable_name.")
+            self._logger.debug(
+                "Attempted to remove key that doesn't exist in code_generator,"
+                " remove_java_variable_name."
+            )
 
     def create_new_variable(self, logo_var_name, value_name):
-        """Create a new Java variable and assign it a value."""
+        """Create a new Java variable and assign it a value. Returns the Java variable name."""
         java_var_name = self._mangle_logo_var_name(logo_var_name)
-        line = f"var {java_var_name} = {value_name};"
+        line = f"var {java_var_name} = {self._box(value_name)};"
         self._append_code(line)
+        return java_var_name
 
     def assign_value(self, logo_var_name, value_name):
         """Assign a new value to an already existing variable."""
         java_var_name = self._mangle_logo_var_name(logo_var_name)
-        line = f"{java_var_name}.value = {value_name}.value;"
+        line = f"{java_var_name}.value = {self._unbox(value_name)};"
         self._append_code(line)
 
     def variable_name(self, logo_var_name):
         """Returns the java variable name of the logo variable."""
         java_var_name = self._mangle_logo_var_name(logo_var_name)
+        if self._optimize:
+            # The variable is read directly, without copying the reference to a temp.
+            return java_var_name
         temp_var = self._generate_temp_var()
         code = f"var {temp_var} = {java_var_name};"
         self._append_code(code)
@@ -206,27 +314,27 @@ class JavaCodeGenerator:
 
     def move_forward(self, arg_var):
         """create Java code for moving forward"""
-        code = f"this.robot.travel({arg_var}.value);"
+        code = f"this.robot.travel({self._unbox(arg_var)});"
         self._append_code(code)
 
     def move_backwards(self, arg_var):
         """create Java code for moving backward"""
-        code = f"this.robot.travel(-{arg_var}.value);"
+        code = f"this.robot.travel(-{self._unbox(arg_var)});"
         self._append_code(code)
 
     def left_turn(self, arg_var):
         """create Java code for turning left"""
-        code = f"this.robot.rotate({arg_var}.value);"
+        code = f"this.robot.rotate({self._unbox(arg_var)});"
         self._append_code(code)
 
     def right_turn(self, arg_var):
         """create Java code for turning right"""
-        code = f"this.robot.rotate(-{arg_var}.value);"
+        code = f"this.robot.rotate(-{self._unbox(arg_var)});"
         self._append_code(code)
 
     def show(self, arg_var):
         """create Java code for show"""
-        code = f"System.out.println({arg_var}.value);"
+        code = f"System.out.println({self._unbox(arg_var)});"
         self._append_code(code)
 
     def bye(self):
@@ -237,6 +345,12 @@ class JavaCodeGenerator:
     def float(self, value):
         """create Java code for defining double variable with given value
         and return the variable name"""
+        if self._optimize:
+            literal = f"{value}"
+            if literal.startswith("-"):
+                # Parentheses keep e.g. "-(-1.0)" from becoming the decrement operator.
+                literal = f"({literal})"
+            return PrimitiveExpression(literal, LogoType.FLOAT)
         temp_var = self._generate_temp_var()
         code = f"DoubleVariable {temp_var} = new DoubleVariable({value});"
         self._append_code(code)
@@ -245,16 +359,20 @@ class JavaCodeGenerator:
     def boolean(self, value):
         """create Java code for defining boolean variable with given value
         and return the variable name"""
-        temp_var = self._generate_temp_var()
         if value == TokenType.TRUE:
             value = "true"
         else:
             value = "false"
+        if self._optimize:
+            return PrimitiveExpression(value, LogoType.BOOL)
+        temp_var = self._generate_temp_var()
         code = f"BoolVariable {temp_var} = new BoolVariable({value});"
         self._append_code(code)
         return temp_var
 
     def string(self, value):
+        if self._optimize:
+            return PrimitiveExpression(f'"{value}"', LogoType.STRING)
         temp_var = self._generate_temp_var()
         code = f'StrVariable {temp_var} = new StrVariable("{value}");'
         self._append_code(code)
@@ -268,9 +386,11 @@ class JavaCodeGenerator:
 
     def binop(self, value1, value2, operation):
         """create java code for binops and return variable name"""
+        expression = f"{self._unbox(value1)} {operation} {self._unbox(value2)}"
+        if self._optimize:
+            return PrimitiveExpression(f"({expression})", LogoType.FLOAT)
         temp_var = self._generate_temp_var()
-        #pylint: disable=c0301
-        code = f"DoubleVariable {temp_var} = new DoubleVariable({value1}.value {operation} {value2}.value);"
+        code = f"DoubleVariable {temp_var} = new DoubleVariable({expression});"
         self._append_code(code)
         return temp_var
 
@@ -280,22 +400,26 @@ class JavaCodeGenerator:
             operation = "!="
         elif operation == "=":
             operation = "=="
+        expression = f"{self._unbox(value1)} {operation} {self._unbox(value2)}"
+        if self._optimize:
+            return PrimitiveExpression(f"({expression})", LogoType.BOOL)
         temp_var = self._generate_temp_var()
-        # pylint: disable= C0301
-        code = f"BoolVariable {temp_var} = new BoolVariable({value1}.value {operation} {value2}.value);"
+        code = f"BoolVariable {temp_var} = new BoolVariable({expression});"
         self._append_code(code)
         return temp_var
 
     def unary_op(self, value):
         """Create Java code for unaryops and return variable name"""
+        if self._optimize:
+            return PrimitiveExpression(f"(-{self._unbox(value)})", LogoType.FLOAT)
         temp_var = self._generate_temp_var()
-        code = f"DoubleVariable {temp_var} = new DoubleVariable(-{value}.value);"
+        code = f"DoubleVariable {temp_var} = new DoubleVariable(-{self._unbox(value)});"
         self._append_code(code)
         return temp_var
 
     def if_statement(self, conditional):
         """Create Java code to start an if statement in Java."""
-        code = f"if ({conditional}.value) " + "{"
+        code = f"if ({self._unbox(conditional)}) " + "{"
         self._append_code(code)
 
     def else_statement(self):
@@ -303,6 +427,27 @@ class JavaCodeGenerator:
         code = "else {"
         self._append_code(code)
 
+    def repeat_loop_start(self, count):
+        """Generate the start of a Java loop that runs count times."""
+        counter = self._generate_temp_var()
+        code = f"for (int {counter} = 0; {counter} < {self._unbox(count)}; {counter}++) " + "{"
+        self._append_code(code)
+
+    def for_loop_start(self, iterator, start, limit, step):
+        """Generate the start of a Java loop that steps the iterator variable from start
+        to limit, like the preconfigured for function."""
+        value = self._unbox(iterator)
+        code = (
+            f"for ({value} = {self._unbox(start)}; {value} <= {self._unbox(limit)}; "
+            f"{value} += {self._unbox(step)}) " + "{"
+        )
+        self._append_code(code)
+
+    def opening_brace(self):
+        """Generate an opening curly bracket"""
+        code = "{"
+        self._append_code(code)
+
     def closing_brace(self):
         """Generate a closing curly bracket"""
         code = "}"
@@ -310,7 +455,7 @@ class JavaCodeGenerator:
 
     def if_statement_lambda(self, conditional, lambda_variable):
         """Create Java code for if statements utilising Java's lambda"""
-        code = f"if ({conditional}.value) {lambda_variable}.value.call();"
+        code = f"if ({self._unbox(conditional)}) {lambda_variable}.value.call();"
         self._append_code(code)
 
     def lambda_no_param_start(self):
@@ -318,6 +463,7 @@ class JavaCodeGenerator:
         temp_var = self._generate_temp_var()
         code = f"Callable<Void> {temp_var} = () -> " + "{"
         self._append_code(code)
+        self._lambda_depth += 1
         return temp_var
 
     def lambda_param_start(self, param_name):
@@ -326,111 +472,101 @@ class JavaCodeGenerator:
         java_param_name = self._mangle_logo_var_name(param_name)
         code = f"Consumer<DoubleVariable> {temp_var} = (DoubleVariable {java_param_name}) -> " + "{"
         self._append_code(code)
+        self._lambda_depth += 1
         return temp_var
 
     def lambda_end(self):
         """Generate the closing bracket for Java lambda"""
         code = "};"
         self._append_code(code)
+        self._lambda_depth -= 1
 
     def return_null(self):
         """Return null at lambda end if proc type is void"""
         code = "return null;"
         self._append_code(code)
 
+    def _java_code_chunks(self):
+        """Yields the content of the Java file of the generated code in pieces, so that
+        it can be written without holding all of it in memory."""
+        yield START_METHOD
+        for func in self._preconf_funcs_dict.values():
+            yield func + " "
+        for line in self._method.lines():
+            yield line + " "
+        yield START_RUN
+        for line in self._main.lines():
+            yield line + " "
+        yield END_RUN
+        yield START_MAIN
+        yield END
+
+    def get_java_code(self):
+        """Returns the content of the Java file of the generated code"""
+        return "".join(self._java_code_chunks())
+
+    def get_java_code_size(self):
+        """Returns the length of get_java_code() without building it"""
+        size = len(START_METHOD) + len(START_RUN) + len(END_RUN) + len(START_MAIN) + len(END)
+        size += sum(len(func) + 1 for func in self._preconf_funcs_dict.values())
+        return size + self._method.get_size() + self._main.get_size()
+
     def write(self, path=None):
-        """write a Java file"""
+        """write the generated code to the Java file. The code is streamed from the code
+        sinks, and the file is not rewritten if it already has the same code."""
         path = path if path is not None else PATH
         try:
-            with open(path + self._name + ".java", mode="w+", encoding="utf-8") as file:
-                file.write(START_METHOD)
-                for fname in self._preconf_funcs_dict.keys():
-                    file.write(self._preconf_funcs_dict[fname] + " ")
-                for method_line in self._method:
-                    file.write(method_line + " ")
-                file.write(START_RUN)
-                for line in self._main:
-                    file.write(line + " ")
-                file.write(END_RUN)
-                file.write(START_MAIN)
-                file.write(END)
-                file.close()
+            write_chunks_if_changed(
+                os.path.join(path, self._name + ".java"), self._java_code_chunks()
+            )
         except Exception as error:
-            print(f"An error occurred when writing {self._name}.java file:\n{error}")
+            self._logger.console.write(
+                f"An error occurred when writing {self._name}.java file:\n{error}"
+            )
+            raise
+
+    def write_java_code(self, java_code, path=None):
+        """write java_code, e.g. the code of an earlier compilation, to the Java file.
+        The file is not rewritten if it already has the same code."""
+        path = path if path is not None else PATH
+        try:
+            write_if_changed(os.path.join(path, self._name + ".java"), java_code)
+        except Exception as error:
+            self._logger.console.write(
+                f"An error occurred when writing {self._name}.java file:\n{error}"
+            )
             raise
 
     def get_generated_code(self):
         """Returns list of generated code for tests"""
-        return self._method + self._main
-
-    def _get_params_as_code_lines(self, path):
-        params = []
-        param_area = False
-        with open(path, mode="r", encoding="utf-8") as file:
-            for line in file.readlines():
-                if "// Start params" in line:
-                    param_area = True
-                    continue
-                if "// End params" in line:
-                    param_area = False
-                    continue
-                if param_area:
-                    params.append(line)
-        return params
-
-    def _create_params_as_code_lines(self, params, kwargs):
-        for key, value in kwargs.items():
-            search_key = f"this.{key} = "
-            matches = [line for line in params if search_key in line]
-            if len(matches) != 1:
-                raise Exception(f"Either could not find '{key}' or there were more than one")
-
-            line_to_modify = matches[0]
-
-            if key in ("leftMotor", "rightMotor"):
-                new_line = f"\t\t{search_key}new EV3LargeRegulatedMotor(MotorPort.{value});\n"
-            else:
-                new_line = f"\t\t{search_key}{value};\n"
-            params = list(
-                map(lambda x: x.replace(line_to_modify, new_line), params))  # pylint: disable=W0640
-        return params
-
-    def _write_new_params_to_file(self, path, param_lines):
-        lines = []
-        with open(path, mode="r", encoding="utf-8") as file:
-            lines = file.readlines()
-
-        param_area = False
-        params_added = False
-        with open(path, mode="w", encoding="utf-8") as file:
-            for line in lines:
-                if "// Start params" in line:
-                    param_area = True
-                    file.write(line)
-                    continue
-                if "// End params" in line:
-                    param_area = False
-                    file.write(line)
-                    continue
-
-                if param_area and not params_added:
-                    for param_line in param_lines:
-                        file.write(param_line)
-                    params_added = True
-
-                elif not param_area:
-                    file.write(line)
-
-    def add_env_variables(self, **kwargs):
-        path = os.path.join(PATH, "../classes/EV3MovePilot.java")
-
+        return list(self._method.lines()) + list(self._main.lines())
+
+    def get_robot_config_code(self, robot_config):
+        """Returns the content of RobotConfig.java for the robot parameters in
+        robot_config. Parameters that are not given, or are None, get their default
+        values."""
+        params = dict(ROBOT_CONFIG_DEFAULTS)
+        for key, value in robot_config.items():
+            if key not in params:
+                raise Exception(f"'{key}' is not a robot parameter")
+            if value is not None:
+                params[key] = value
+
+        return ROBOT_CONFIG_TEMPLATE.format(**params)
+
+    def write_robot_config(self, robot_config, path=None):
+        """Writes the robot parameters to RobotConfig.java. The file is only rewritten
+        when the parameters change, so Gradle doesn't rebuild the robot classes on every
+        compile."""
+        path = path if path is not None else CLASSES_PATH
         try:
-            params = self._get_params_as_code_lines(path)
-            param_lines = self._create_params_as_code_lines(params, kwargs)
-            self._write_new_params_to_file(path, param_lines)
-
+            write_if_changed(
+                os.path.join(path, "RobotConfig.java"), self.get_robot_config_code(robot_config)
+            )
         except Exception as error:
-            print("An error occurred when writing environment variables to EV3MovePilot.java")
+            self._logger.console.write(
+                "An error occurred when writing environment variables to RobotConfig.java"
+            )
             raise error
 
 
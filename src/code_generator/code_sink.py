@@ -0,0 +1,74 @@
+"""Code sink module. Stores generated code lines in a temporary file that is kept in
+memory until it grows past SPOOL_MAX_SIZE, so large programs do not keep all of their
+generated code in memory."""
+
+import tempfile
+
+# Characters kept in memory before the sink rolls over to a file on disk.
+SPOOL_MAX_SIZE = 1024 * 1024
+
+
+class CodeSink:
+    """Append-only store of generated code lines. Lines are stored one per row, so they
+    can be read back as a list or streamed to the output file. The temporary file is
+    replaced on reset and closed with close(), or when the sink is used as a context
+    manager."""
+
+    def __init__(self, max_size=SPOOL_MAX_SIZE):
+        self._max_size = max_size
+        self._file = self._open()
+        self._line_count = 0
+        self._size = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _open(self):
+        # The file lives as long as the sink, close() and reset() close it.
+        return tempfile.SpooledTemporaryFile(  # pylint: disable=consider-using-with
+            max_size=self._max_size, mode="w+", encoding="utf-8", newline="\n"
+        )
+
+    def __len__(self):
+        return self._line_count
+
+    def append(self, line):
+        """Adds a line of code to the end of the sink."""
+        self._file.write(line + "\n")
+        self._line_count += 1
+        self._size += len(line) + 1
+
+    def get_size(self):
+        """Returns the number of characters of the stored lines, each followed by a
+        separator."""
+        return self._size
+
+    def reset(self):
+        """Removes all lines from the sink. The file is closed and a new one is opened in
+        memory, so that a file that rolled over to disk is removed."""
+        self._file.close()
+        self._file = self._open()
+        self._line_count = 0
+        self._size = 0
+
+    def lines(self):
+        """Yields the stored lines in order. The sink must not be appended to while the
+        lines are being read."""
+        self._file.seek(0)
+        try:
+            for line in self._file:
+                yield line[:-1]
+        finally:
+            self._file.seek(0, 2)
+
+    def write_to(self, file, separator=" "):
+        """Writes the stored lines to file, each followed by separator."""
+        for line in self.lines():
+            file.write(line + separator)
+
+    def close(self):
+        """Closes the file of the sink, which removes it if it rolled over to disk."""
+        self._file.close()
@@ -0,0 +1,88 @@
+"""Cache for the outputs of compilations.
+
+Students often compile the same program many times in a row. The outputs of a compilation
+only depend on the source code and the compiler settings, so they are stored in memory,
+keyed by a hash of both. A cached compilation skips lexing, parsing, type checking and
+code generation, and only writes the stored outputs. The Java code of very large programs
+is not cached, because it would keep all of the code in memory; it is streamed from the
+code generator to the Java file instead."""
+
+import hashlib
+import json
+from collections import OrderedDict, namedtuple
+
+# Bump this when the stored artifacts or the outputs of the compiler change.
+ARTIFACT_FORMAT_VERSION = "1"
+DEFAULT_MAXSIZE = 128
+# Characters of Java code that one artifact may hold
+DEFAULT_MAX_CODE_SIZE = 1024 * 1024
+
+# The outputs of a compilation. java_code is the content of the Java file, or None if the
+# compilation failed. errors are the Error records of the error json files.
+CompileArtifacts = namedtuple("CompileArtifacts", ("java_code", "errors"))
+
+
+class ArtifactCache:
+    """Stores the artifacts of the last maxsize compilations. The least recently used
+    artifacts are evicted first. Artifacts with more than max_code_size characters of Java
+    code are not stored."""
+
+    def __init__(self, maxsize=DEFAULT_MAXSIZE, max_code_size=DEFAULT_MAX_CODE_SIZE):
+        self._maxsize = maxsize
+        self._max_code_size = max_code_size
+        self._artifacts = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def clear(self):
+        """Removes the artifacts and resets the statistics."""
+        self._artifacts = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def get_key(logo_code, **settings):
+        """Returns a hash of the logo code and the compiler settings that the outputs
+        depend on, e.g. the message language and the robot config."""
+        signature = json.dumps(
+            [ARTIFACT_FORMAT_VERSION, settings, logo_code], sort_keys=True, default=str
+        )
+        return hashlib.sha256(signature.encode("utf-8")).hexdigest()
+
+    def accepts(self, code_size):
+        """Returns True if artifacts with code_size characters of Java code are stored."""
+        return self._maxsize > 0 and code_size <= self._max_code_size
+
+    def get(self, key):
+        """Returns the artifacts stored with key, or None."""
+        artifacts = self._artifacts.get(key)
+        if artifacts is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._artifacts.move_to_end(key)
+        return artifacts
+
+    def put(self, key, artifacts):
+        """Stores artifacts with key, and evicts the least recently used artifacts if the
+        cache is full."""
+        if not self.accepts(len(artifacts.java_code or "")):
+            return
+        self._artifacts[key] = artifacts
+        self._artifacts.move_to_end(key)
+        while len(self._artifacts) > self._maxsize:
+            self._artifacts.popitem(last=False)
+            self.evictions += 1
+
+    def get_stats(self):
+        """Returns the hit and miss counts and the size of the cache."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "size": len(self._artifacts),
+            "maxsize": self._maxsize,
+            "max_code_size": self._max_code_size,
+        }
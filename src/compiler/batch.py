@@ -0,0 +1,148 @@
+"""Batch compilation. Compiles many Logo files in parallel worker processes. Each worker
+creates its Compiler once and reuses it for all the files it is given."""
+
+import glob
+import json
+import os
+from multiprocessing import Pool
+from multiprocessing.util import Finalize
+from compiler.compiler import Compiler, JAVA, PLY_PARSER
+from utils.error_handler import FIN
+
+REPORT_NAME = "report.json"
+
+# Compiler of the current worker process, created by _initialize_worker.
+_worker_compiler = None
+# Closes the compiler of a pool worker process when the process exits.
+_worker_finalizer = None
+
+
+def _initialize_worker(language, code_gen_lang, optimize, parser_name, profile=False):
+    global _worker_compiler  # pylint: disable=global-statement
+    _worker_compiler = Compiler(
+        language=language,
+        code_gen_lang=code_gen_lang,
+        optimize=optimize,
+        parser_name=parser_name,
+        profile=profile,
+    )
+
+
+def _initialize_pool_worker(*initargs):
+    """Creates the compiler of a pool worker process, and closes it when the process
+    exits. Pool processes don't run atexit handlers, but they run the finalizers of
+    multiprocessing when they exit normally."""
+    global _worker_finalizer  # pylint: disable=global-statement
+    _initialize_worker(*initargs)
+    _worker_finalizer = Finalize(_worker_compiler, _worker_compiler.close, exitpriority=0)
+
+
+def _compile_file(job):
+    filepath, output_dir = job
+    try:
+        with open(filepath, "r", encoding="utf8") as file:
+            logo_code = file.read()
+        os.makedirs(output_dir, exist_ok=True)
+        result = _worker_compiler.compile(
+            logo_code,
+            java_path=output_dir,
+            errors_path=output_dir,
+            write_errors_to_console=False,
+        )
+    except Exception as error:  # pylint: disable=broad-except
+        # One broken file must not stop the whole batch.
+        return filepath, {"success": False, "output_dir": output_dir, "error": str(error)}
+
+    language = _worker_compiler.error_handler.language
+    errors = [
+        {"message": error.get_message(language), "start": error.start, "end": error.end}
+        for error in result.errors
+    ]
+    file_report = {"success": result.success, "output_dir": output_dir, "errors": errors}
+    if result.profile is not None:
+        file_report["profile"] = result.profile
+    return filepath, file_report
+
+
+def find_logo_files(path):
+    """Returns the .logo files in the directory path, or the files matching the glob path."""
+    if os.path.isdir(path):
+        pattern = os.path.join(path, "**", "*.logo")
+    else:
+        pattern = path
+    return sorted(file for file in glob.glob(pattern, recursive=True) if os.path.isfile(file))
+
+
+class BatchCompiler:
+    """Compiles a set of Logo files with a pool of warm worker processes. The output of
+    each file is written to its own directory, and the results of all files to a single
+    json report. With profile, the report has the profile of each file."""
+
+    def __init__(
+        self,
+        output_path,
+        language=FIN,
+        code_gen_lang=JAVA,
+        jobs=None,
+        optimize=False,
+        parser_name=PLY_PARSER,
+        profile=False,
+    ):
+        self._output_path = output_path
+        self._language = language
+        self._code_gen_lang = code_gen_lang
+        self._optimize = optimize
+        self._parser_name = parser_name
+        self._profile = profile
+        self._jobs = jobs if jobs else os.cpu_count()
+
+    def _get_output_dirs(self, filepaths):
+        """Maps each file to an output directory that mirrors its path relative to the
+        common directory of all files."""
+        if not filepaths:
+            return {}
+        root = os.path.commonpath([os.path.dirname(os.path.abspath(file)) for file in filepaths])
+        output_dirs = {}
+        for file in filepaths:
+            relative_path = os.path.relpath(os.path.abspath(file), root)
+            output_dirs[file] = os.path.join(self._output_path, os.path.splitext(relative_path)[0])
+        return output_dirs
+
+    def compile_files(self, filepaths):
+        """Compiles the given files and returns the report as a dict."""
+        output_dirs = self._get_output_dirs(filepaths)
+        jobs = [(file, output_dirs[file]) for file in filepaths]
+        initargs = (
+            self._language,
+            self._code_gen_lang,
+            self._optimize,
+            self._parser_name,
+            self._profile,
+        )
+
+        if self._jobs == 1 or len(jobs) <= 1:
+            _initialize_worker(*initargs)
+            with _worker_compiler:
+                results = [_compile_file(job) for job in jobs]
+        else:
+            with Pool(self._jobs, initializer=_initialize_pool_worker, initargs=initargs) as pool:
+                results = list(pool.imap_unordered(_compile_file, jobs, chunksize=4))
+                # The workers exit normally and close their compilers, instead of being
+                # terminated when the pool is closed.
+                pool.close()
+                pool.join()
+
+        files = dict(sorted(results, key=lambda result: result[0]))
+        failed = sum(1 for result in files.values() if not result["success"])
+        return {"compiled": len(files) - failed, "failed": failed, "files": files}
+
+    def compile_path(self, path):
+        """Compiles the .logo files found with find_logo_files, and writes the report
+        to the output directory. Returns the report as a dict."""
+        report = self.compile_files(find_logo_files(path))
+
+        os.makedirs(self._output_path, exist_ok=True)
+        with open(os.path.join(self._output_path, REPORT_NAME), "w", encoding="utf-8") as file:
+            json.dump(report, file, ensure_ascii=False, indent=2)
+
+        return report
@@ -0,0 +1,285 @@
+"""Compiler module. Wraps the compiler phases, so that the same lexer, parser and code
+generator instances can be reused to compile many Logo programs back to back."""
+
+import os
+from parser.parser import Parser
+from parser.descent_parser import DescentParser
+from parser.incremental_parser import IncrementalParser, walk
+from compiler.artifact_cache import ArtifactCache, CompileArtifacts
+from entities.preconfigured_functions import initialize_logo_functions
+from entities.symbol_table import SymbolTable
+from entities.symbol_tables import SymbolTables
+from lexer.lexer import Lexer
+from code_generator.code_generator import JavaCodeGenerator
+from code_generator.preconf_code_generator import JavaPreconfFuncsGenerator
+from entities.ast.node import NodeFactory
+from optimizer.constant_folder import ConstantFolder
+from optimizer.pass_manager import PassManager
+from utils.console_io import default_console_io
+from utils.error_handler import ErrorHandler, FIN
+from utils.logger import Logger
+from utils.profiler import Profiler
+
+JAVA = "Java"
+# Same as in pyproject.toml
+COMPILER_VERSION = "0.1.0"
+
+PLY_PARSER = "ply"
+DESCENT_PARSER = "descent"
+PARSERS = {PLY_PARSER: Parser, DESCENT_PARSER: DescentParser}
+
+
+def get_robot_config():
+    """Returns the robot parameters defined in the environment, e.g. in the .env file."""
+    return {
+        "wheelDiameter": os.getenv("WHEEL_DIAM"),
+        "wheelDistance": os.getenv("AXLE_LEN"),
+        "leftMotor": os.getenv("LEFT_MOTOR_PORT"),
+        "rightMotor": os.getenv("RIGHT_MOTOR_PORT"),
+        "motorSpeed": os.getenv("MOVEMENT_SPD"),
+        "motorRotationSpeed": os.getenv("ROTATION_SPD"),
+    }
+
+
+def create_code_generator(code_gen_lang, logger, robot_config=None, optimize=False):
+    """Checks that the given programming language is valid and returns a new instance
+    of the CodeGenerator class, and creates the preconfigured functions generator.
+    Preconf generator needs to use the same generator so that the mangled namespace
+    is the same. Robot parameters in robot_config are written to RobotConfig.java.
+    With optimize, the code generator uses unboxed primitive values."""
+
+    if code_gen_lang == JAVA:
+        preconf_gen = JavaPreconfFuncsGenerator()
+        jcg = JavaCodeGenerator(optimize=optimize, logger=logger)
+        preconf_gen.set_code_generator(jcg)
+        funcs_dict = preconf_gen.get_funcs()
+        jcg.set_preconf_funcs_dict(funcs_dict)
+        if robot_config:
+            jcg.write_robot_config(robot_config)
+        return jcg
+
+    err_msg = f"{code_gen_lang} is not an implemented programming language for code generator"
+    raise Exception(err_msg)
+
+
+def create_parser(parser_name, lexer, logger, symbol_tables, code_generator):
+    """Checks that the given parser backend is valid and returns a new instance of it.
+    The PLY parser builds LALR tables for the procedure arities of each program, the
+    recursive descent parser parses without tables."""
+
+    if parser_name in PARSERS:
+        return PARSERS[parser_name](lexer, logger, symbol_tables, code_generator)
+
+    err_msg = f"{parser_name} is not an implemented parser, choose from {', '.join(PARSERS)}"
+    raise Exception(err_msg)
+
+
+class CompileResult:
+    """Outcome of a single compilation. With profiling on, profile is the report of the
+    profiler, see utils.profiler.Profiler.get_report()."""
+
+    def __init__(self, success, errors, profile=None):
+        self.success = success
+        self.errors = errors
+        self.profile = profile
+
+
+class Compiler:
+    """Holds warm instances of the compiler classes. The instances are reset before
+    each compilation, so one Compiler can compile any number of programs. Close the
+    Compiler, or use it as a context manager, to remove the temporary files of the code
+    generator."""
+
+    def __init__(
+        self,
+        language=FIN,
+        code_gen_lang=JAVA,
+        robot_config=None,
+        debug=False,
+        console_io=default_console_io,
+        optimize=False,
+        parser_name=PLY_PARSER,
+        artifact_cache=None,
+        profile=False,
+    ):
+        self.console_io = console_io
+        self.optimize = optimize
+        self.error_handler = ErrorHandler(console_io=console_io, language=language)
+        self.profiler = Profiler(enabled=profile)
+        self.logger = Logger(console_io, self.error_handler, debug, self.profiler)
+        self.lexer = Lexer(self.logger)
+        with self.profiler.phase("lexer build"):
+            self.lexer.build()
+        self.symbol_tables = SymbolTables(SymbolTable(), SymbolTable())
+        self.code_generator = create_code_generator(
+            code_gen_lang, self.logger, robot_config, optimize
+        )
+        self.parser = create_parser(
+            parser_name, self.lexer, self.logger, self.symbol_tables, self.code_generator
+        )
+        self.node_factory = NodeFactory(self.logger, self.symbol_tables, self.code_generator)
+        self.incremental_parser = IncrementalParser(self.parser, self.lexer, self.logger)
+        self.pass_manager = PassManager(self.logger)
+        if optimize:
+            self.pass_manager.add_pass(ConstantFolder(self.node_factory))
+        self.artifact_cache = artifact_cache if artifact_cache is not None else ArtifactCache()
+        # The settings that the outputs of a compilation depend on, besides the code
+        self._cache_settings = {
+            "version": COMPILER_VERSION,
+            "language": self.error_handler.language,
+            "code_gen_lang": code_gen_lang,
+            "robot_config": robot_config,
+            "optimize": optimize,
+            "parser": parser_name,
+        }
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """Closes the code generator."""
+        self.code_generator.close()
+
+    def reset(self):
+        """Resets the symbol tables, the code generator and the error handler."""
+        self.error_handler.reset()
+        self.symbol_tables.reset()
+        initialize_logo_functions(self.symbol_tables.functions)
+        self.code_generator.reset()
+
+    def compile(self, logo_code, java_path=None, errors_path=None, write_errors_to_console=True):
+        """Compiles the given logo code and generates code if there are no errors.
+        Otherwise the errors are written to json files. Prints lexer & parser results
+        if the debug flag is on. The outputs of code compiled earlier are taken from the
+        artifact cache, unless the debug flag is on. With profiling on, the result has the
+        timings and counters collected since the previous compilation.
+
+        Args:
+            logo_code (str): Logo source code.
+            java_path (str, optional): Directory for the generated code.
+            errors_path (str, optional): Directory for the error json files.
+            write_errors_to_console (bool, optional): Print errors in the selected language.
+
+        Returns:
+            CompileResult
+        """
+        self.reset()
+
+        cache_key = None
+        if not self.logger.debug_enabled:
+            with self.profiler.phase("cache lookup"):
+                cache_key = self.artifact_cache.get_key(logo_code, **self._cache_settings)
+                artifacts = self.artifact_cache.get(cache_key)
+            if artifacts is not None:
+                self.profiler.count("artifact cache hits")
+                self.incremental_parser.set_code(logo_code)
+                self.error_handler.extend(artifacts.errors)
+                return self._write_output(
+                    artifacts.java_code is not None,
+                    artifacts.java_code,
+                    java_path,
+                    errors_path,
+                    write_errors_to_console,
+                )
+
+        # The code is lexed once, the preparser and the parser read the same tokens.
+        start_node = self.incremental_parser.parse(logo_code)
+        if self.logger.debug_enabled:
+            self.logger.debug(logo_code + "\n")
+            self.logger.debug("Lexer tokens:")
+            tokens = self.incremental_parser.tokens
+            self.logger.debug("\n".join((str(token) for token in tokens)) + "\n")
+
+        return self._compile_ast(
+            start_node, java_path, errors_path, write_errors_to_console, cache_key
+        )
+
+    def compile_edit(
+        self, start, end, text, java_path=None, errors_path=None, write_errors_to_console=True
+    ):
+        """Replaces logo_code[start:end] of the previous compilation with text and compiles
+        the new code like compile(). If the previous code had no syntax errors, only the
+        top-level statements around the edit are parsed again.
+
+        Returns:
+            CompileResult
+        """
+        self.reset()
+
+        start_node = self.incremental_parser.reparse(start, end, text)
+        if self.logger.debug_enabled:
+            self.logger.debug(self.incremental_parser.code + "\n")
+
+        return self._compile_ast(start_node, java_path, errors_path, write_errors_to_console)
+
+    def _compile_ast(
+        self, start_node, java_path, errors_path, write_errors_to_console, cache_key=None
+    ):
+        """Type analyzation and code generation of a parsed program. The outputs are
+        stored in the artifact cache with cache_key, if it is given and the cache accepts
+        the size of the Java code. Otherwise the Java code is streamed to the file."""
+        profiler = self.profiler
+        if start_node:
+            if profiler.enabled:
+                profiler.count("ast nodes", sum(1 for _ in walk(start_node)))
+            with profiler.phase("check types"):
+                start_node.check_types()
+            if self.logger.debug_enabled:
+                self.logger.debug("Parser AST:")
+                self.logger.debug(self.console_io.get_formatted_ast(start_node))
+
+        # Code generation, if there are no errors
+        success = bool(start_node) and not self.error_handler.errors
+        java_code = None
+        if success:
+            with profiler.phase("optimize"):
+                optimized = self.pass_manager.run(start_node)
+            if optimized:
+                # The optimised AST no longer matches the code, so the next edit is parsed
+                # in full.
+                self.incremental_parser.invalidate()
+            self.logger.debug("Generated code:")
+            with profiler.phase("generate code"):
+                start_node.generate_code()
+                cacheable = cache_key is not None and self.artifact_cache.accepts(
+                    self.code_generator.get_java_code_size()
+                )
+                if cacheable:
+                    java_code = self.code_generator.get_java_code()
+            self.logger.debug(f"Symbol table lookups: {self.symbol_tables.get_lookup_count()}")
+            profiler.count("temporaries", self.code_generator.get_temp_var_count())
+            if not cacheable:
+                cache_key = None
+        profiler.count("symbol lookups", self.symbol_tables.get_lookup_count())
+        profiler.count("type unifications", self.symbol_tables.unification_count)
+
+        if cache_key is not None:
+            errors = tuple(self.error_handler.get_error_messages())
+            self.artifact_cache.put(cache_key, CompileArtifacts(java_code, errors))
+        return self._write_output(
+            success, java_code, java_path, errors_path, write_errors_to_console
+        )
+
+    def _write_output(self, success, java_code, java_path, errors_path, write_errors_to_console):
+        """Writes the Java file if the compilation succeeded, or else the errors. The Java
+        file is written from java_code, or streamed from the code generator if java_code
+        is None."""
+        with self.profiler.phase("write"):
+            if success:
+                if java_code is None:
+                    self.code_generator.write(java_path)
+                else:
+                    self.code_generator.write_java_code(java_code, java_path)
+                result = CompileResult(True, [])
+            else:
+                self.error_handler.create_json_file(errors_path)
+                if write_errors_to_console:
+                    self.error_handler.write_errors_to_console()
+                result = CompileResult(False, self.error_handler.get_error_messages())
+
+        if self.profiler.enabled:
+            result.profile = self.profiler.pop_report()
+        return result
@@ -0,0 +1,108 @@
+"""Compile server. Keeps a warm compiler and compiles requests read as JSON lines.
+
+Each request is a JSON object on its own line:
+    {"id": 1, "code": "fd 100", "language": "eng", "output_dir": "path/to/dir"}
+"file" can be given instead of "code". "language" and "output_dir" are optional.
+
+An editor can send the changes to the previous program instead of the whole code:
+    {"id": 2, "edit": {"start": 3, "end": 6, "text": "50"}}
+which replaces code[start:end] of the previous request with text. Only the top-level
+statements around the edit are parsed again.
+
+    {"id": 3, "stats": true}
+returns the hit and miss counts of the artifact cache, e.g. {"id": 3, "cache": {"hits": 2,
+"misses": 1, ...}}.
+
+Each response is written as a JSON object on its own line:
+    {"id": 1, "success": false, "errors": [{"message": "...", "start": 0, "end": 0}]}
+If the compiler profiles, the response also has the "profile" report of the compilation.
+"""
+
+import json
+import sys
+from utils.console_io import ConsoleIO
+from utils.error_handler import FIN, ENG
+
+
+class StderrConsoleIO(ConsoleIO):
+    """Console IO that writes to stderr, so that stdout only contains responses."""
+
+    @staticmethod
+    def write(message):
+        """Prints given message to stderr"""
+        print(message, file=sys.stderr)
+
+
+class CompileServer:
+    """Reads compile requests from an input stream and writes responses to an output
+    stream, using the same Compiler instance for every request."""
+
+    def __init__(self, compiler, input_stream=None, output_stream=None):
+        self._compiler = compiler
+        self._input_stream = input_stream if input_stream is not None else sys.stdin
+        self._output_stream = output_stream if output_stream is not None else sys.stdout
+
+    def serve(self):
+        """Handles requests until the input stream is closed."""
+        for line in self._input_stream:
+            if not line.strip():
+                continue
+            response = self.handle_request(line)
+            self._output_stream.write(json.dumps(response, ensure_ascii=False) + "\n")
+            self._output_stream.flush()
+
+    def handle_request(self, line):
+        """Compiles the program of a single JSON request and returns the response dict."""
+        try:
+            request = json.loads(line)
+        except json.JSONDecodeError as error:
+            return {"id": None, "success": False, "error": f"Invalid request: {error}"}
+
+        request_id = request.get("id")
+        if request.get("stats"):
+            return {"id": request_id, "cache": self._compiler.artifact_cache.get_stats()}
+
+        language = request.get("language", self._compiler.error_handler.language).lower()
+        if language not in (FIN, ENG):
+            return {"id": request_id, "success": False, "error": f"Unknown language {language}"}
+
+        try:
+            if "edit" in request:
+                edit = request["edit"]
+                result = self._compiler.compile_edit(
+                    edit["start"],
+                    edit["end"],
+                    edit["text"],
+                    java_path=request.get("output_dir"),
+                    errors_path=request.get("output_dir"),
+                    write_errors_to_console=False,
+                )
+            else:
+                code = self._get_code(request)
+                result = self._compiler.compile(
+                    code,
+                    java_path=request.get("output_dir"),
+                    errors_path=request.get("output_dir"),
+                    write_errors_to_console=False,
+                )
+        except Exception as error:  # pylint: disable=broad-except
+            # A failing request must not take down the server.
+            return {"id": request_id, "success": False, "error": str(error)}
+
+        errors = [
+            {"message": error.get_message(language), "start": error.start, "end": error.end}
+            for error in result.errors
+        ]
+        response = {"id": request_id, "success": result.success, "errors": errors}
+        if result.profile is not None:
+            response["profile"] = result.profile
+        return response
+
+    @staticmethod
+    def _get_code(request):
+        if "code" in request:
+            return request["code"]
+        if "file" in request:
+            with open(request["file"], "r", encoding="utf8") as file:
+                return file.read()
+        raise ValueError("Request has no 'code' or 'file'")
@@ -8,14 +8,16 @@ from utils.lowercase_converter import convert_to_lowercase as to_lowercase
 
 
 class Output(Node):
+    __slots__ = ()
+
     def __init__(self, children, **dependencies):
         super().__init__("Output", children, **dependencies)
 
     def get_logotype(self):
         return LogoType.VOID
 
-    def check_types(self):
-        self.children[0].check_types()
+    def _check_types(self):
+        yield self.children[0]
         output_value = self.children[0]
         procedure: Function = self._symbol_tables.variables.get_in_scope_function_symbol()
         # Check output command is in function
@@ -26,14 +28,14 @@ class Output(Node):
             return
         if procedure.get_logotype() == LogoType.UNKNOWN:
             if output_value.__class__ == Deref:
-                deref_symbol = self._symbol_tables.variables.lookup(output_value.leaf)
+                deref_symbol = output_value.get_symbol()
                 if deref_symbol:
                     self._symbol_tables.concatenate_typeclasses(deref_symbol, procedure)
             else:
                 procedure.typeclass.logotype = output_value.get_logotype()
         else:
             if output_value.get_logotype() == LogoType.UNKNOWN and output_value.__class__ == Deref:
-                deref_symbol = self._symbol_tables.variables.lookup(output_value.leaf)
+                deref_symbol = output_value.get_symbol()
                 self._symbol_tables.concatenate_typeclasses(deref_symbol, procedure)
                 return
             # Check output value's type is same as funtion's other output values' types
@@ -42,18 +44,25 @@ class Output(Node):
                     "wrong_type_of_output", lexspan=self.position.get_lexspan(), proc=procedure.name
                 )
 
-    def generate_code(self):
-        output_var = self.children[0].generate_code()
+    def _generate_code(self):
+        output_var = yield self.children[0]
         self._code_generator.return_statement(output_var)
 
 
 class ProcCall(Node):
+    __slots__ = ("procedure", "_in_procedure", "void_parent")
+
     def __init__(self, children, leaf, **dependencies):
         super().__init__("ProcCall", children, leaf, **dependencies)
         self.procedure: Function = None
         self._in_procedure = False
         self.void_parent = False
 
+    def reset_analysis(self):
+        self.procedure = None
+        self._in_procedure = False
+        self.void_parent = False
+
     def set_logotype(self, logotype):
         proc = self.get_procedure()
         if proc:
@@ -72,11 +81,12 @@ class ProcCall(Node):
         return None
 
     def get_procedure(self):
-        procedure = None
         if self.procedure:
-            procedure = self.procedure
-        else:
-            procedure = self._symbol_tables.functions.lookup(self.leaf)
+            return self.procedure
+        procedure = self._symbol_tables.functions.lookup(self.leaf)
+        # Bound like the symbol of a Deref, for use in the rest of the check and code gen.
+        if self._symbol_tables.resolving:
+            self.procedure = procedure
         return procedure
 
     def _handle_unknown_type_parameter_for_recursion_calls(self, parameter_symbol, argument_node):
@@ -89,7 +99,7 @@ class ProcCall(Node):
         else:
             if argument_node.__class__ is Deref:
                 # Argument is a deref node, with an unknown type.
-                argument_symbol = self._symbol_tables.variables.lookup(argument_node.leaf)
+                argument_symbol = argument_node.get_symbol()
                 if argument_symbol:
                     self._symbol_tables.concatenate_typeclasses(parameter_symbol, argument_symbol)
                 else:
@@ -100,7 +110,7 @@ class ProcCall(Node):
                 argument_node.leaf
             ):
                 # Argument is a recursive procedure call, with an unknown return type.
-                proc_symbol = self._symbol_tables.functions.lookup(argument_node.leaf)
+                proc_symbol = argument_node.get_procedure()
                 if proc_symbol:
                     self._symbol_tables.concatenate_typeclasses(parameter_symbol, proc_symbol)
                 else:
@@ -129,9 +139,9 @@ class ProcCall(Node):
             return True
         return False
 
-    def check_types(self):
+    def _check_types(self):
         # Check the procedure has been declarated
-        procedure = self._symbol_tables.functions.lookup(self.leaf)
+        procedure = self.get_procedure()
         if not procedure:
             self._logger.error_handler.add_error(
                 "procedure_is_not_defined", self.position.get_lexspan(), proc=self.leaf
@@ -149,7 +159,7 @@ class ProcCall(Node):
             )
         # Check procedure's arguments have right types
         for index, child in enumerate(self.children):
-            child.check_types()
+            yield child
             if index >= len(procedure.parameters):
                 break
             parameter_symbol = procedure.parameters[index]
@@ -175,15 +185,42 @@ class ProcCall(Node):
                         ptype=parameter_type.value,
                         row=self.position.get_pos()[0],
                     )
-        # Set the procedure as a parameter for use in code gen
-        self.procedure = procedure
         self._in_procedure = not self._symbol_tables.variables.is_scope_global()
 
-    def generate_code(self):
+    def is_inline_loop(self):
+        """Returns True if this is a repeat or for call with a literal block, that is
+        generated as a Java loop."""
+        return (
+            self._code_generator.inline_loops
+            and to_lowercase(self.leaf) in ["repeat", "for"]
+            and self.children[-1].node_type == "UnknownFunction"
+        )
+
+    def _generate_inline_loop(self):
+        body = self.children[-1]
+        arg_vars = []
+        for child in self.children[:-1]:
+            arg_vars.append((yield child))
+        if to_lowercase(self.leaf) == "repeat":
+            self._code_generator.repeat_loop_start(*arg_vars)
+        else:
+            self._code_generator.for_loop_start(*arg_vars)
+        for child in body.children:
+            yield child
+        self._code_generator.closing_brace()
+        # Same as in UnknownFunction, the next loop with this iterator gets a new variable.
+        if body.var_node:
+            self._code_generator.remove_java_variable_name(to_lowercase(body.var_node.leaf.leaf))
+
+    def _generate_code(self):
+        if self.is_inline_loop():
+            yield from self._generate_inline_loop()
+            return None
+
         temp_vars = []
         temp_var = None
         for child in self.children:
-            temp_vars.append(child.generate_code())
+            temp_vars.append((yield child))
 
         if to_lowercase(self.leaf) in ["repeat", "for"]:
             if self._in_procedure and not self.void_parent:
@@ -203,17 +240,22 @@ class ProcCall(Node):
 
 
 class ProcDecl(Node):
+    __slots__ = ("procedure",)
+
     def __init__(self, children, leaf, **dependencies):
         # Add this function as a defined function in the lexer.
         super().__init__("ProcDecl", children, leaf, **dependencies)
         self.procedure: Function = None
 
+    def reset_analysis(self):
+        self.procedure = None
+
     def get_logotype(self):
         if self.procedure:
             return self.procedure.typeclass.logotype
         return None
 
-    def check_types(self):
+    def _check_types(self):
         # Check the procedure hasn't already been declarated
         if self._symbol_tables.functions.lookup(self.leaf):
             self._logger.error_handler.add_error(
@@ -228,10 +270,10 @@ class ProcDecl(Node):
             return
 
         proc_args = self.children[0]
-        proc_args.check_types()
+        yield proc_args
 
         statement_list = self.children[1]
-        statement_list.check_types()
+        yield statement_list
 
         # Check the procedure doesn't have unknown type parameters
         for parameter in self.procedure.parameters:
@@ -269,36 +311,62 @@ class ProcDecl(Node):
     def _has_unknown_function(self, node):
         """Check if a void type procedure has an unknown function in it.
            Mark the unknown function's void_parent variable as True if yes"""
-        if to_lowercase(node.leaf) in ["repeat", "for"]:
-            node.void_parent = True
-        for child in node.children:
-            self._has_unknown_function(child)
+        stack = [node]
+        while stack:
+            node = stack.pop()
+            if to_lowercase(node.leaf) in ["repeat", "for"]:
+                node.void_parent = True
+            stack.extend(node.children)
+
+    def _may_throw_return(self, node):
+        """Check if a ReturnException can be thrown to the procedure, i.e. it calls repeat
+        or for, or has a lambda that can output."""
+        stack = [node]
+        while stack:
+            node = stack.pop()
+            if node.node_type == "ProcCall" and node.is_inline_loop():
+                # Only the loop body is generated, without the lambda.
+                stack.extend(node.children[:-1] + node.children[-1].children)
+                continue
+            if node.node_type == "UnknownFunction" or to_lowercase(node.leaf) in ["repeat", "for"]:
+                return True
+            stack.extend(node.children)
+        return False
 
-    def generate_code(self):
+    def _generate_code(self):
         self._code_generator.start_function_declaration(
             logo_func_name=to_lowercase(self.leaf), logo_func_type=self.get_logotype()
         )
-        self.children[0].generate_code()
+        yield self.children[0]
+        if (
+            self.get_logotype() != LogoType.VOID
+            and self._code_generator.direct_returns
+            and not self._may_throw_return(self.children[1])
+        ):
+            # Every output is a return statement, there is nothing to catch.
+            yield self.children[1]
         # To avoid unreachable code in void methods without unknown functions
-        if self.get_logotype() != LogoType.VOID:
+        elif self.get_logotype() != LogoType.VOID:
             self._code_generator.start_try_catch_block()
-            self.children[1].generate_code()
+            yield self.children[1]
             self._code_generator.end_try_catch_block_in_procedure(self.get_logotype())
         else:
             self._has_unknown_function(self)
-            self.children[1].generate_code()
+            yield self.children[1]
         self._code_generator.end_function_declaration()
 
 
 class ProcArgs(Node):
+    __slots__ = ()
+
     def __init__(self, children, **dependencies):
         super().__init__("ProcArgs", children, **dependencies)
 
-    def check_types(self):
+    def _check_types(self):
         for child in self.children:
-            child.check_types()
+            yield child
 
-    def generate_code(self):
+    def _generate_code(self):
         parameters = []
         for child in self.children:
             parameters.append(child.get_param_data())
@@ -306,10 +374,15 @@ class ProcArgs(Node):
 
 
 class ProcArg(Node):
+    __slots__ = ("symbol",)
+
     def __init__(self, children=None, **dependencies):
         super().__init__("ProgArg", children, **dependencies)
         self.symbol: Variable = None
 
+    def reset_analysis(self):
+        self.symbol = None
+
     def set_logotype(self, logotype):
         symbol = self.get_symbol()
         if symbol:
@@ -328,7 +401,7 @@ class ProcArg(Node):
             symbol = self._symbol_tables.variables.lookup(self.leaf)
         return symbol
 
-    def check_types(self):
+    def _check_types(self):
         procedure = self._symbol_tables.variables.get_in_scope_function_symbol()
 
         # Check the parameter hasn't already been declarated
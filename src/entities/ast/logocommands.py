@@ -7,10 +7,15 @@ from utils.lowercase_converter import convert_to_lowercase as to_lowercase
 
 
 class Make(Node):
+    __slots__ = ("_new_variable",)
+
     def __init__(self, children, leaf, **dependencies):
         super().__init__("Make", children, leaf, **dependencies)
         self._new_variable = False
 
+    def reset_analysis(self):
+        self._new_variable = False
+
     def get_logotype(self):
         return LogoType.VOID
 
@@ -24,7 +29,7 @@ class Make(Node):
             )
             return
 
-        variable_node.check_types()
+        yield variable_node
         variable_logotype = variable_node.get_logotype()
 
         if variable_logotype != LogoType.STRING:
@@ -39,7 +44,7 @@ class Make(Node):
 
     def _check_argument_node(self, argument_node):
         # Check type of argument
-        argument_node.check_types()
+        yield argument_node
         arg_logotype = argument_node.get_logotype()
 
         if arg_logotype == LogoType.VOID:
@@ -111,11 +116,9 @@ class Make(Node):
         # e.g. 'make "b :a', where the referenced value is 'a'
         arg_symbol = None
         if arg_node.node_type == "Deref":
-            arg_name = arg_node.leaf
-            arg_symbol = self._symbol_tables.variables.lookup(arg_name)
+            arg_symbol = arg_node.get_symbol()
         elif arg_node.node_type == "ProcCall":
-            arg_name = arg_node.leaf
-            arg_symbol = self._symbol_tables.functions.lookup(arg_name)
+            arg_symbol = arg_node.get_procedure()
 
         arg_logotype = arg_node.get_logotype()
 
@@ -140,7 +143,7 @@ class Make(Node):
             # e.g. 'make "b :a', where 'a' and 'b' have been defined earlier
             self._update_variable_type_with_referenced_value(var_name, arg_symbol, var_symbol)
 
-    def check_types(self):
+    def _check_types(self):
         # Check for right amount of arguments
         if len(self.children) != 1 or not self.leaf:
             self._logger.error_handler.add_error(
@@ -154,13 +157,13 @@ class Make(Node):
         variable_node = self.leaf
         argument_node = self.children[0]
 
-        self._check_variable_node(variable_node)
-        self._check_argument_node(argument_node)
+        yield from self._check_variable_node(variable_node)
+        yield from self._check_argument_node(argument_node)
         self._check_references(variable_node, argument_node)
 
-    def generate_code(self):
+    def _generate_code(self):
         """Generates MAKE command into target code."""
-        value_var_name = self.children[0].generate_code()
+        value_var_name = yield self.children[0]
 
         if self._new_variable:
             self._code_generator.create_new_variable(to_lowercase(self.leaf.leaf), value_var_name)
@@ -169,10 +172,12 @@ class Make(Node):
 
 
 class Show(Node):
+    __slots__ = ()
+
     def get_logotype(self):
         return LogoType.VOID
 
-    def check_types(self):
+    def _check_types(self):
         # Must have at least 1 argument
         if len(self.children) == 0:
             self._logger.error_handler.add_error(
@@ -189,32 +194,36 @@ class Show(Node):
                     command=self.node_type.value,
                     curr_type=LogoType.VOID.value,
                 )
-            child.check_types()
+            yield child
 
-    def generate_code(self):
+    def _generate_code(self):
         for child in self.children:
-            arg_var = child.generate_code()
+            arg_var = yield child
             self._code_generator.show(arg_var)
 
 
 class Bye(Node):
+    __slots__ = ()
+
     def get_logotype(self):
         return LogoType.VOID
 
-    def check_types(self):
+    def _check_types(self):
         return
 
-    def generate_code(self):
+    def _generate_code(self):
         self._code_generator.bye()
 
 
 class Move(Node):
     """FD, BK, LT, RT"""
 
+    __slots__ = ()
+
     def get_logotype(self):
         return LogoType.VOID
 
-    def check_types(self):
+    def _check_types(self):
         if len(self.children) != 1:
             self._logger.error_handler.add_error(
                 "wrong_amount_of_arguments",
@@ -225,7 +234,7 @@ class Move(Node):
             return
 
         child = self.children[0]
-        child.check_types()
+        yield child
 
         if child.node_type == "Deref" and child.get_logotype() == LogoType.UNKNOWN:
             child.set_logotype(LogoType.FLOAT)
@@ -243,9 +252,9 @@ class Move(Node):
                 expected_type=LogoType.FLOAT.value,
             )
 
-    def generate_code(self):
+    def _generate_code(self):
         """Generate movement commands in Java."""
-        arg_var = self.children[0].generate_code()
+        arg_var = yield self.children[0]
 
         if self.node_type == TokenType.FD:
             self._code_generator.move_forward(arg_var)
@@ -2,46 +2,117 @@
 """ Abstract Syntax Tree node definitions, returned by the parser. """
 from entities.logotypes import LogoType
 from entities.symbol_tables import SymbolTables, default_symbol_tables
+from entities.ast.visitor import MethodVisitor
 from code_generator.code_generator import default_code_generator
 from utils.logger import Logger, default_logger
-from lexer.lexer import Lexer
+
+
+class CompileContext:
+    """The logger, symbol tables and code generator of a compilation. The nodes of an AST
+    share one context instead of each holding the three references."""
+
+    __slots__ = ("logger", "symbol_tables", "code_generator")
+
+    def __init__(
+        self,
+        logger=default_logger,
+        symbol_tables=default_symbol_tables,
+        code_generator=default_code_generator,
+    ):
+        self.logger: Logger = logger
+        self.symbol_tables: SymbolTables = symbol_tables
+        self.code_generator = code_generator
+
+    @classmethod
+    def from_dependencies(cls, dependencies):
+        """Returns the context given as the context keyword argument, or a context of the
+        logger, symbol_tables and code_generator keyword arguments. Nodes created without
+        any of them share the default context."""
+        if "context" in dependencies:
+            return dependencies["context"]
+        if not any(name in dependencies for name in cls.__slots__):
+            return default_compile_context
+        return cls(**{name: dependencies[name] for name in cls.__slots__ if name in dependencies})
+
+
+default_compile_context = CompileContext()
 
 
 class Node:
     """Base AST Node class"""
 
+    __slots__ = ("node_type", "children", "leaf", "position", "_context")
+
     def __init__(self, node_type, children=None, leaf=None, **dependencies):
         self.node_type = node_type
         self.children = children if children else []
         self.leaf = leaf
-        self._logger: Logger = dependencies.get("logger", default_logger)
-        self._symbol_tables: SymbolTables = dependencies.get("symbol_tables", default_symbol_tables)
         self.position = dependencies.get("position", None)
-        self._code_generator = dependencies.get("code_generator", default_code_generator)
+        self._context: CompileContext = CompileContext.from_dependencies(dependencies)
+
+    @property
+    def _logger(self) -> Logger:
+        return self._context.logger
+
+    @property
+    def _symbol_tables(self) -> SymbolTables:
+        return self._context.symbol_tables
+
+    @property
+    def _code_generator(self):
+        return self._context.code_generator
 
     def get_logotype(self) -> LogoType:
         return None
 
     def check_types(self):
+        """Runs the type check on this node and its subtree. The nodes are checked by an
+        iterative visitor, so deep trees don't hit the recursion limit. Names are
+        resolved while they are checked, in the scope they are used in, and the nodes
+        keep the symbols they resolve to."""
+        symbol_tables = self._symbol_tables
+        resolving = symbol_tables.resolving
+        symbol_tables.resolving = True
+        try:
+            return _TYPE_CHECK.visit(self)
+        finally:
+            symbol_tables.resolving = resolving
+
+    def _check_types(self):
+        """Checks the types of this node. Subclasses with children to check make this a
+        generator, which yields the child nodes to check and gets back what their check
+        returned."""
+        return None
+
+    def reset_analysis(self):
+        """Clears what check_types and generate_code stored in this node, so that a reused
+        node can be checked again with new symbol tables. Children are not reset."""
         return
 
     def __str__(self):
-        result = f"({self.node_type}"
-
-        if self.leaf:
-            result += f", {self.leaf if self.leaf else 'None'}"
-
-        if self.get_logotype():
-            result += f", logo type: {self.get_logotype()}"
-
-        if self.children:
-            result += ", children: ["
-            result += ", ".join((child.__str__() for child in self.children))
-            result += "]"
-
-        result += ")"
-
-        return result
+        # Built from an explicit stack of nodes and strings instead of recursing.
+        parts = []
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            if not isinstance(node, Node):
+                parts.append(node)
+                continue
+
+            pending = [f"({node.node_type}"]
+            if node.leaf:
+                pending += [", ", node.leaf] if isinstance(node.leaf, Node) else [f", {node.leaf}"]
+            if node.get_logotype():
+                pending.append(f", logo type: {node.get_logotype()}")
+            if node.children:
+                pending.append(", children: [")
+                for index, child in enumerate(node.children):
+                    pending += [", ", child] if index else [child]
+                pending.append("]")
+            pending.append(")")
+            stack.extend(reversed(pending))
+
+        return "".join(parts)
 
     def undefined_variables(self):
         """Checks if the current scope has undefined variables
@@ -54,47 +125,49 @@ class Node:
         return undefined
 
     def generate_code(self):
-        """Calls generate_code recursively on all child nodes."""
+        """Generates the code of this node and its subtree with an iterative visitor.
+        Returns what the code generation of this node returned, e.g. a temp variable."""
+        return _CODE_GENERATION.visit(self)
+
+    def _generate_code(self):
+        """Generates the code of the child nodes. A generator like _check_types, which
+        yields the child nodes to generate."""
         for child in self.children:
-            child.generate_code()
+            yield child
 
 
 class Start(Node):
+    __slots__ = ()
+
     def __init__(self, children=None, **dependencies):
         super().__init__("Start", children, **dependencies)
 
     def get_logotype(self):
         return None
 
-    def check_types(self):
+    def _check_types(self):
         """Runs semantic analysis on the AST nodes to find type errors, undefined
         functions/variables and to figure out implied typing."""
         for child in self.children:
-            child.check_types()
+            yield child
+
+
+_TYPE_CHECK = MethodVisitor("_check_types")
+_CODE_GENERATION = MethodVisitor("_generate_code")
 
 
 class NodeFactory:
-    """Used to create new AST nodes, injects logger and symbol table as dependencies."""
+    """Used to create new AST nodes, injects the compile context of the logger, symbol
+    tables and code generator into them."""
 
     def __init__(
         self,
-        lexer: Lexer,
         logger=default_logger,
         symbol_tables=default_symbol_tables,
-        code_generator=default_code_generator
+        code_generator=default_code_generator,
     ):
-
-        self._logger = logger
-        self._symbol_tables = symbol_tables
-        self._code_generator = code_generator
-        self._lexer = lexer
+        self._context = CompileContext(logger, symbol_tables, code_generator)
 
     def create_node(self, node_class: Node, **kwargs):
         """Creates a new node of node_class, with the given keyword arguments."""
-        return node_class(
-            **kwargs,
-            logger=self._logger,
-            symbol_tables=self._symbol_tables,
-            code_generator=self._code_generator,
-            lexer=self._lexer
-        )
+        return node_class(**kwargs, context=self._context)
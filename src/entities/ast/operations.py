@@ -5,16 +5,18 @@ from entities.logotypes import LogoType
 
 
 class BinOp(Node):
+    __slots__ = ()
+
     def __init__(self, children, leaf, **dependencies):
         super().__init__("BinOp", children, leaf, **dependencies)
 
     def get_logotype(self):
         return LogoType.FLOAT
 
-    def check_types(self):
+    def _check_types(self):
         """Checks that the types of both operands is LogoFloat"""
         for child in self.children:
-            child.check_types()
+            yield child
 
             if child.__class__ == Deref and child.get_logotype() == LogoType.UNKNOWN:
                 child.set_logotype(LogoType.FLOAT)
@@ -27,21 +29,23 @@ class BinOp(Node):
                     "binop_error_when_operand_is_not_float",
                     self.position.get_lexspan())
 
-    def generate_code(self):
+    def _generate_code(self):
         """Generate binop to java"""
-        arg_var1 = self.children[0].generate_code()
-        arg_var2 = self.children[1].generate_code()
+        arg_var1 = yield self.children[0]
+        arg_var2 = yield self.children[1]
         return self._code_generator.binop(arg_var1, arg_var2, self.leaf)
 
 
 class UnaryOp(Node):
+    __slots__ = ()
+
     def __init__(self, children, leaf, **dependencies):
         super().__init__("UnaryOp", children, leaf, **dependencies)
 
     def get_logotype(self):
         return LogoType.FLOAT
 
-    def check_types(self):
+    def _check_types(self):
         # Check the type of the child of UnaryOp
         for child in self.children:
             child_type = child.get_logotype()
@@ -51,24 +55,26 @@ class UnaryOp(Node):
                     self.position.get_lexspan(),
                 )
 
-    def generate_code(self):
-        arg_var = self.children[0].generate_code()
+    def _generate_code(self):
+        arg_var = yield self.children[0]
         return self._code_generator.unary_op(arg_var)
 
 
 class RelOp(Node):
+    __slots__ = ()
+
     def __init__(self, children, leaf, **dependencies):
         super().__init__("RelOp", children, leaf, **dependencies)
 
     def get_logotype(self):
         return LogoType.BOOL
 
-    def check_types(self):
+    def _check_types(self):
         child1 = self.children[0]
         child2 = self.children[1]
 
-        child1.check_types()
-        child2.check_types()
+        yield child1
+        yield child2
 
         row = child1.position.get_pos()[0]
 
@@ -137,9 +143,9 @@ class RelOp(Node):
                     type2=child2.get_logotype().value,
                 )
 
-    def generate_code(self):
+    def _generate_code(self):
         """Generate relop to java"""
-        arg_var1 = self.children[0].generate_code()
-        arg_var2 = self.children[1].generate_code()
+        arg_var1 = yield self.children[0]
+        arg_var2 = yield self.children[1]
 
         return self._code_generator.relop(arg_var1, arg_var2, self.leaf)
@@ -2,11 +2,35 @@ from entities.ast.node import Node
 
 
 class StatementList(Node):
+    __slots__ = ()
+
     def __init__(self, children=None, **dependencies):
         super().__init__("StatementList", children, None, **dependencies)
 
-    def check_types(self):
+    def _check_types(self):
         """Runs the check in given order."""
         for child in self.children:
             child.get_logotype()
-            child.check_types()
+            yield child
+
+
+class Block(Node):
+    """Statements of a conditional branch that is always taken. Generated inside braces,
+    so that the variables declared in it stay in their own scope."""
+
+    __slots__ = ()
+
+    def __init__(self, children=None, **dependencies):
+        super().__init__("Block", children, None, **dependencies)
+
+    def _check_types(self):
+        self._symbol_tables.variables.initialize_scope()
+        for child in self.children:
+            yield child
+        self._symbol_tables.variables.finalize_scope()
+
+    def _generate_code(self):
+        self._code_generator.opening_brace()
+        for child in self.children:
+            yield child
+        self._code_generator.closing_brace()
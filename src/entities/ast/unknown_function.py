@@ -6,6 +6,9 @@ class UnknownFunction(Node):
     Args:
         var_node: This is the iterator for 'for' command structure
     """
+
+    __slots__ = ("var_node",)
+
     def __init__(self, children=None, **dependencies):
         super().__init__("UnknownFunction", children, None, **dependencies)
         self.var_node = None
@@ -13,26 +16,27 @@ class UnknownFunction(Node):
     def get_logotype(self) -> LogoType:
         return LogoType.NAMELESS_FUNCTION
 
-    def check_types(self):
+    def _check_types(self):
         self._symbol_tables.variables.initialize_scope()
         if self.var_node:
             self.var_node.scoped_type_check()
         for child in self.children:
-            child.check_types()
+            yield child
         self._symbol_tables.variables.finalize_scope()
 
     def _has_output(self, node):
-        if node.node_type == "Output":
-            return True
-        for child in node.children:
-            return self._has_output(child)
-        return False
+        # Follows the first children down from node.
+        while node.node_type != "Output":
+            if not node.children:
+                return False
+            node = node.children[0]
+        return True
 
-    def generate_code(self):
+    def _generate_code(self):
         """Generate unknown_function into a lambda-statement"""
         tmpvar = self._code_generator.lambda_no_param_start()
         for child in self.children:
-            child.generate_code()
+            yield child
         if not self._has_output(self):
             self._code_generator.return_null()
         self._code_generator.lambda_end()
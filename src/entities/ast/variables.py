@@ -6,32 +6,41 @@ from utils.lowercase_converter import convert_to_lowercase as to_lowercase
 
 
 class Float(Node):
+    __slots__ = ()
+
     def __init__(self, leaf, **dependencies):
         super().__init__("Float", children=None, leaf=leaf, **dependencies)
 
     def get_logotype(self):
         return LogoType.FLOAT
 
-    def generate_code(self):
+    def _generate_code(self):
         return self._code_generator.float(self.leaf)
 
 
 class Bool(Node):
+    __slots__ = ()
+
     def __init__(self, leaf, **dependencies):
         super().__init__("Bool", children=None, leaf=leaf, **dependencies)
 
     def get_logotype(self):
         return LogoType.BOOL
 
-    def generate_code(self):
+    def _generate_code(self):
         return self._code_generator.boolean(self.leaf)
 
 
 class Deref(Node):
+    __slots__ = ("_symbol",)
+
     def __init__(self, leaf, **dependencies):
         super().__init__("Deref", children=None, leaf=leaf, **dependencies)
         self._symbol: Variable = None
 
+    def reset_analysis(self):
+        self._symbol = None
+
     def set_symbol(self, symbol: Variable):
         if symbol != self.get_symbol():
             raise Exception(
@@ -62,44 +71,48 @@ class Deref(Node):
     def get_symbol(self) -> Variable:
         if self._symbol:
             return self._symbol
-        return self._symbol_tables.variables.lookup(self.leaf)
-
-    def check_types(self):
-        symbol = self.get_symbol()
-        if not symbol:
+        symbol = self._symbol_tables.variables.lookup(self.leaf)
+        # The symbol is bound during type checking, when the scope of the node is the
+        # current scope. The symbol table is not fully accessible after type checking.
+        if self._symbol_tables.resolving:
+            self._symbol = symbol
+        return symbol
+
+    def _check_types(self):
+        if not self.get_symbol():
             self._logger.error_handler.add_error(
                 "undefined_variable", self.position.get_lexspan(), var=self.leaf
             )
-        else:
-            # We need to set the symbol ref here,
-            # since the symbol table is not fully accessible after type checking.
-            self.set_symbol(symbol)
 
-    def generate_code(self):
+    def _generate_code(self):
         return self._code_generator.variable_name(to_lowercase(self.leaf))
 
 
 class StringLiteral(Node):
+    __slots__ = ()
+
     def __init__(self, leaf, **dependencies):
         super().__init__("StringLiteral", children=None, leaf=leaf, **dependencies)
 
     def get_logotype(self):
         return LogoType.STRING
 
-    def generate_code(self):
+    def _generate_code(self):
         return self._code_generator.string(self.leaf)
 
 
 class VariableNode(Node):
     """Used as the first argument in for argument list"""
 
+    __slots__ = ()
+
     def __init__(self, leaf, **dependencies):
         super().__init__("VariableNode", children=None, leaf=leaf, **dependencies)
 
     def get_logotype(self):
         return LogoType.STRING
 
-    def check_types(self):
+    def _check_types(self):
         """Type check is passed as scoped_type_check
         will be called from unknown_function node"""
         # pylint: disable=W0107
@@ -110,7 +123,7 @@ class VariableNode(Node):
         symbol = Variable(self.leaf, Type(LogoType.FLOAT, variables={self.leaf}))
         self._symbol_tables.variables.insert(self.leaf.leaf, symbol)
 
-    def generate_code(self):
+    def _generate_code(self):
         tmpvar = self._code_generator.float(0)
-        self._code_generator.create_new_variable(to_lowercase(self.leaf.leaf), tmpvar)
-        return tmpvar
+        # The for function updates the iterator through the variable object.
+        return self._code_generator.create_new_variable(to_lowercase(self.leaf.leaf), tmpvar)
@@ -0,0 +1,56 @@
+"""Iterative visitors over the AST. A visitor handles a node with a generator, which
+yields the nodes it visits in turn, e.g. its children, and gets back the value their
+handlers return. The generators of the nodes being visited are kept on an explicit stack
+instead of the Python call stack, so deeply nested programs don't hit the recursion limit.
+"""
+
+from types import GeneratorType
+
+
+class Visitor:
+    """Base class of AST passes. Subclasses define handlers named visit_<node class>,
+    e.g. visit_BinOp, and nodes without a handler are handled by generic_visit, which
+    visits the children. A handler that is not a generator function just returns its
+    value."""
+
+    def visit(self, node):
+        """Visits node and returns the value of its handler."""
+        dispatch = self.dispatch
+        stack = []
+        value = dispatch(node)
+        while True:
+            if value.__class__ is GeneratorType:
+                stack.append(value)
+                value = None
+            if not stack:
+                return value
+            try:
+                node = stack[-1].send(value)
+            except StopIteration as stop:
+                stack.pop()
+                value = stop.value
+                continue
+            value = dispatch(node)
+
+    def dispatch(self, node):
+        """Returns the value of the handler of node, which is a generator if the handler
+        visits other nodes."""
+        handler = getattr(self, "visit_" + node.__class__.__name__, self.generic_visit)
+        return handler(node)
+
+    def generic_visit(self, node):
+        """Visits the children of node."""
+        for child in node.children:
+            yield child
+
+
+class MethodVisitor(Visitor):
+    """Runs a generator method of the nodes, which yields the nodes that it checks or
+    generates before it goes on. Used for the passes that live in the node classes, like
+    check_types and generate_code."""
+
+    def __init__(self, method_name):
+        self._method_name = method_name
+
+    def dispatch(self, node):
+        return getattr(node, self._method_name)()
@@ -14,8 +14,8 @@ class Symbol:
 
     @property
     def typeclass(self):
-        """get symbols type"""
-        return self._typeclass
+        """get symbols type, the root of the types unified with it"""
+        return self._typeclass.find()
 
     @typeclass.setter
     def typeclass(self, typeclass: Type):
@@ -1,73 +1,117 @@
 """Symbol table module"""
-from collections import deque
 from utils.lowercase_converter import convert_to_lowercase as to_lowercase
 
 
 class SymbolTable:
-    """A class for storing symbols and their values"""
+    """A class for storing symbols and their values.
+
+    Each name has a stack of its bindings, one per scope that defines it, so a lookup
+    reads the innermost binding without searching the scopes. The names defined in the
+    scopes are kept in one undo log, and a scope is finalized by popping the bindings of
+    the names logged after the scope was initialized."""
 
     def __init__(self):
         """Initializes a new symbol table object"""
-        self._stack = deque()
-        self._stack.appendleft({})
-        self._in_function = None
+        self.reset()
 
     def reset(self):
-        self._stack = deque()
-        self._stack.appendleft({})
+        # Name -> list of (scope depth, value), innermost binding last.
+        self._bindings = {}
+        # Names in the order they were bound, and the log length at the start of each
+        # scope. The global scope has depth 0 and no mark.
+        self._log = []
+        self._marks = []
+        # Key -> lowercase key, names are looked up far more often than they are new.
+        self._keys = {}
         self._in_function = None
+        self.lookup_count = 0
+
+    def _fold(self, key):
+        folded = self._keys.get(key)
+        if folded is None:
+            folded = self._keys[key] = to_lowercase(key)
+        return folded
 
     def insert(self, key, value):
         """Inserts a new entry to the symbol table"""
-        key = to_lowercase(key)
-        self._stack[0][key] = value
+        key = self._fold(key)
+        depth = len(self._marks)
+        bindings = self._bindings.get(key)
+        if bindings is None:
+            self._bindings[key] = [(depth, value)]
+        elif bindings[-1][0] == depth:
+            bindings[-1] = (depth, value)
+            return
+        else:
+            bindings.append((depth, value))
+        self._log.append(key)
 
     def lookup(self, key):
         """Searches for a symbol and returns its value.
         Global scope can't be reached in function scope"""
-        key = to_lowercase(key)
-        if self._in_function:
-            for i in range(len(self._stack) - 1):
-                if key in self._stack[i]:
-                    return self._stack[i][key]
-        else:
-            for table in self._stack:
-                if key in table:
-                    return table[key]
-        return None
+        self.lookup_count += 1
+        folded = self._keys.get(key)
+        if folded is None:
+            folded = self._fold(key)
+        bindings = self._bindings.get(folded)
+        if bindings is None:
+            return None
+        depth, value = bindings[-1]
+        if depth == 0 and self._in_function:
+            return None
+        return value
+
+    def _unbind(self, mark):
+        """Removes the bindings logged after mark."""
+        log = self._log
+        bindings = self._bindings
+        while len(log) > mark:
+            key = log.pop()
+            stack = bindings[key]
+            stack.pop()
+            if not stack:
+                del bindings[key]
 
     def free(self):
         """Removes entries from the current symbol table scope"""
-        self._stack[0] = {}
+        self._unbind(self._marks[-1] if self._marks else 0)
 
     def initialize_scope(self, in_function=None):
-        """Saves current symbol table entries to a stack when entering to a new scope"""
-        self._stack.appendleft({})
+        """Starts a new scope, whose bindings hide the bindings of the outer scopes"""
+        self._marks.append(len(self._log))
         if not self._in_function and in_function:
             self._in_function = to_lowercase(in_function)
 
     def finalize_scope(self):
         """Restores the previous symbol table scope and discards the current scope"""
-        if len(self._stack) > 1:
-            self._stack.popleft()
-            if len(self._stack) == 1:
+        if self._marks:
+            self._unbind(self._marks.pop())
+            if not self._marks:
                 self._in_function = None
             return True
         return False
 
     def insert_global(self, symbol, value):
         """Inserts a global scope entry to the symbol table"""
-        self._stack[len(self._stack) - 1][symbol] = value
+        key = self._fold(symbol)
+        bindings = self._bindings.setdefault(key, [])
+        if bindings and bindings[0][0] == 0:
+            bindings[0] = (0, value)
+            return
+        bindings.insert(0, (0, value))
+        # The global names come first in the log, so the marks of the scopes move.
+        global_end = self._marks[0] if self._marks else len(self._log)
+        self._log.insert(global_end, key)
+        self._marks = [mark + 1 for mark in self._marks]
 
     def is_scope_global(self):
         """returns True if scope is global"""
-        if len(self._stack) == 1:
-            return True
-        return False
+        return not self._marks
 
     def get_current_scope(self):
         """return current scope as dict"""
-        return self._stack[0]
+        mark = self._marks[-1] if self._marks else 0
+        return {key: self._bindings[key][-1][1] for key in self._log[mark:]}
 
     def get_in_scope_function_symbol(self):
         """Return the current in-scope function's symbol,
@@ -10,20 +10,27 @@ class SymbolTables:
     def __init__(self, variables=default_variable_table, functions=default_function_table) -> None:
         self.variables = variables
         self.functions = functions
+        # True while the AST is type checked. The nodes then bind the symbols that
+        # their names resolve to, and read them later without a lookup.
+        self.resolving = False
+        self.unification_count = 0
+
+    def reset(self):
+        """Resets both symbol tables."""
+        self.variables.reset()
+        self.functions.reset()
+        self.unification_count = 0
+
+    def get_lookup_count(self):
+        """Returns the number of lookups in both tables since they were created or reset."""
+        return self.variables.lookup_count + self.functions.lookup_count
 
     def concatenate_typeclasses(self, symbol1, symbol2):
-        """Takes two symbols (variable or function) as parameters,
-        concatenates their typeclasses and updates their symbols typeclasses
-        """
-        new_typeclass = Type.concatenate(symbol1.typeclass, symbol2.typeclass)
-
-        for var_name in new_typeclass.variables:
-            variable = self.variables.lookup(var_name)
-            variable.typeclass = new_typeclass
-
-        for func_name in new_typeclass.functions:
-            func = self.functions.lookup(func_name)
-            func.typeclass = new_typeclass
+        """Takes two symbols (variable or function) as parameters and unifies their
+        typeclasses. The symbols of both typeclasses share the result, whether they are
+        in the current scope or not."""
+        self.unification_count += 1
+        Type.union(symbol1.typeclass, symbol2.typeclass)
 
 
 default_symbol_tables = SymbolTables()
@@ -5,7 +5,12 @@ from entities.logotypes import LogoType
 
 class Type:
     """Type class stores the LogoType of a variable. The instance of this class
-    can be then referenced to other variables which have the same LogoType"""
+    can be then referenced to other variables which have the same LogoType.
+
+    Types are unified in a union-find structure. A unified type links to a root type,
+    which holds the LogoType and the variables and functions of all the types linked to
+    it. Every Type object reads and writes its root, so symbols keep their type objects
+    and see the unions made after they were created."""
 
     def __init__(
         self, logotype: LogoType = LogoType.UNKNOWN, variables=None, functions=None
@@ -13,52 +18,84 @@ class Type:
         self._logotype = logotype
         self._variables = variables if variables is not None else set()
         self._functions = functions if functions is not None else set()
+        self._parent = self
+        self._rank = 0
+
+    def find(self) -> "Type":
+        """Returns the root of the types unified with this type. The types on the way are
+        linked straight to the root, so that finding it again is near O(1)."""
+        root = self
+        while root._parent is not root:
+            root = root._parent
+        node = self
+        while node._parent is not root:
+            node._parent, node = root, node._parent
+        return root
 
     @property
     def logotype(self):
         """Returns the LogoType enum of the Type class"""
-        return self._logotype
+        return self.find()._logotype
 
     @property
     def variables(self):
         """Returns the variables of the type class"""
-        return self._variables
+        return self.find()._variables
 
     @property
     def functions(self):
         """Returns the variables of the type class"""
-        return self._functions
+        return self.find()._functions
 
     @logotype.setter
     def logotype(self, logotype: LogoType):
-        if self._logotype == LogoType.UNKNOWN:
-            self._logotype = logotype
+        root = self.find()
+        if root._logotype == LogoType.UNKNOWN:
+            root._logotype = logotype
 
     def add_variable(self, var_name):
-        self._variables.add(var_name)
+        self.find()._variables.add(var_name)
 
     def add_function(self, func_name):
-        self._functions.add(func_name)
+        self.find()._functions.add(func_name)
 
     @staticmethod
-    def concatenate(typeclass1: "Type", typeclass2: "Type") -> "Type":
-        logotype1 = typeclass1.logotype
-        logotype2 = typeclass2.logotype
+    def union(typeclass1: "Type", typeclass2: "Type") -> "Type":
+        """Unifies two types and returns the root of the result. The root of the lower
+        rank is linked to the other. The result has the LogoType of typeclass1, or the one
+        of typeclass2 if the first one is unknown."""
+        root1 = typeclass1.find()
+        root2 = typeclass2.find()
+        if root1 is root2:
+            return root1
 
-        def get_new_logotype():
-            if logotype1 != LogoType.UNKNOWN:
-                return logotype1
-            if logotype2 != LogoType.UNKNOWN:
-                return logotype2
-            return LogoType.UNKNOWN
+        logotype = root1._logotype
+        if logotype == LogoType.UNKNOWN:
+            logotype = root2._logotype
+        if root1._rank < root2._rank:
+            root1, root2 = root2, root1
+        elif root1._rank == root2._rank:
+            root1._rank += 1
 
-        variables = typeclass1.variables.union(typeclass2.variables)
-        functions = typeclass1.functions.union(typeclass2.functions)
-        return Type(logotype=get_new_logotype(), variables=variables, functions=functions)
+        root2._parent = root1
+        root1._logotype = logotype
+        root1._variables = _merge(root1._variables, root2._variables)
+        root1._functions = _merge(root1._functions, root2._functions)
+        root2._variables = root2._functions = None
+        return root1
 
     def __str__(self) -> str:
+        root = self.find()
         string = (
-            f"LogoType: {self._logotype}, Variables: "
-            f"{self._variables}, Functions: {self._functions}"
+            f"LogoType: {root._logotype}, Variables: "
+            f"{root._variables}, Functions: {root._functions}"
         )
         return string
+
+
+def _merge(set1, set2):
+    """Adds the smaller set to the larger one and returns it."""
+    if len(set1) < len(set2):
+        set1, set2 = set2, set1
+    set1.update(set2)
+    return set1
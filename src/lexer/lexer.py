@@ -4,7 +4,8 @@ Lexer module used by PLY's lexer-generator.
 # pylint: disable=missing-function-docstring, invalid-name
 
 from ply.lex import lex, TOKEN
-from lexer.token_types import TokenType
+from lexer.token_buffer import TokenBuffer
+from lexer.token_types import TokenType, MAX_BASE_PROCEDURE_ARITY, procedure_token
 from utils.logger import default_logger
 from utils.lowercase_converter import convert_to_lowercase as to_lowercase
 
@@ -107,6 +108,9 @@ class Lexer:
         "Resets the tokens list to initial values."
         self.tokens.clear()
         self.tokens.extend([token_type.value for token_type in TokenType])
+        self.tokens.extend(
+            [procedure_token(arity) for arity in range(MAX_BASE_PROCEDURE_ARITY + 1)]
+        )
 
     # Token methods. Name as t_<TOKEN_NAME>, where TOKEN_NAME is in the tokens-list.
     # Declaration order matters for matching, i.e. longest similar regex first.
@@ -189,7 +193,8 @@ class Lexer:
     def add_procedure_token(self, procedure_name, token_name):
         "Adds a new procedure token to the lexer."
         self._procedure_tokens[procedure_name] = token_name
-        self.tokens.append(token_name)
+        if token_name not in self.tokens:
+            self.tokens.append(token_name)
 
     def get_tokens(self):
         "Returns a list of lexer tokens for the parser."
@@ -208,14 +213,48 @@ class Lexer:
         self._procedure_tokens.clear()
         self._expect_procedure_name_as_ident = False
 
-    def tokenize_input(self, code):
-        """Turns input code into a list of tokens."""
+    def tokenize(self, code, start=0, end=None, lineno=1, linestartpos=0):
+        """Turns input code into a TokenBuffer. Each token also records the lexer state
+        after it was read as lexer_state, so that the buffer can be replayed to the parser.
+        The state is not stored as endlexpos, which PLY would use for the lexspans.
+
+        Only code[start:end] is tokenized if start or end are given. The tokens have the
+        positions of the whole code, lineno and linestartpos are the line number and the
+        start of the line at start."""
         if not self._ply_lexer:
             self.build()
         self.reset()
 
-        self._ply_lexer.input(code)
-        tokens = list(self._ply_lexer)
+        ply_lexer = self._ply_lexer
+        ply_lexer.input(code)
+        ply_lexer.lexpos = start
+        ply_lexer.lexlen = len(code) if end is None else end
+        ply_lexer.lineno = lineno
+        ply_lexer.linestartpos = linestartpos
+        tokens = []
+        for token in ply_lexer:
+            token.lexer_state = (ply_lexer.lineno, ply_lexer.lexpos, ply_lexer.linestartpos)
+            tokens.append(token)
+        end_state = (ply_lexer.lineno, ply_lexer.lexpos, ply_lexer.linestartpos)
 
         self.reset()
-        return tokens
+        return TokenBuffer(tokens, end_state)
+
+    @staticmethod
+    def get_linestartpos(code, lexpos):
+        """Returns the linestartpos the lexer has at lexpos of code. A run of newlines is
+        ignored as one token, which sets linestartpos after the first character of the run.
+        lexpos must not be inside a run of newlines."""
+        index = code.rfind("\n", 0, lexpos)
+        if index < 0:
+            return 0
+        while index > 0 and code[index - 1] in "\r\n":
+            index -= 1
+        # A carriage return that ends a comment is a part of the comment.
+        if code[index] == "\r" and ";" in code[code.rfind("\n", 0, index) + 1 : index]:
+            index += 1
+        return index + 1
+
+    def tokenize_input(self, code):
+        """Turns input code into a list of tokens."""
+        return self.tokenize(code).tokens
@@ -0,0 +1,40 @@
+"""Token buffer module. The program is lexed once into a TokenBuffer, which the preparser
+scans and the PLY parser reads as its lexer."""
+
+
+class TokenBuffer:
+    """Tokens of a program, lexed once. Replays the tokens to PLY's parser through the
+    token() method, and keeps the lineno, lexpos and linestartpos attributes in the
+    state the PLY lexer had when it returned the current token."""
+
+    def __init__(self, tokens, end_state):
+        self.tokens = tokens
+        self.end_state = end_state
+        self._index = 0
+        self.lineno = 1
+        self.lexpos = 0
+        self.linestartpos = 0
+
+    def __iter__(self):
+        return iter(self.tokens)
+
+    def __len__(self):
+        return len(self.tokens)
+
+    def rewind(self):
+        """Starts replaying the tokens from the beginning."""
+        self._index = 0
+        self.lineno = 1
+        self.lexpos = 0
+        self.linestartpos = 0
+
+    def token(self):
+        """Returns the next token, or None at the end of the program."""
+        if self._index >= len(self.tokens):
+            self.lineno, self.lexpos, self.linestartpos = self.end_state
+            return None
+
+        token = self.tokens[self._index]
+        self._index += 1
+        self.lineno, self.lexpos, self.linestartpos = token.lexer_state
+        return token
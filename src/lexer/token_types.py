@@ -45,3 +45,15 @@ class TokenType(Enum):
     TRUE = "TRUE"
     FALSE = "FALSE"
     BYE = "BYE"
+
+
+# User defined procedures are tokenized as PROC_ARITY_<n>, where n is the procedure's
+# parameter count. Call rules for arities up to MAX_BASE_PROCEDURE_ARITY are always part of
+# the grammar, so the LALR tables do not depend on the procedures a program declares.
+PROCEDURE_TOKEN_PREFIX = "PROC_ARITY_"
+MAX_BASE_PROCEDURE_ARITY = 8
+
+
+def procedure_token(arity):
+    """Returns the token name for a user defined procedure with the given arity."""
+    return f"{PROCEDURE_TOKEN_PREFIX}{arity}"
@@ -1,97 +1,126 @@
 """Main module for the compiler.
 """
 import argparse
+import json
 import os
-from parser.parser import Parser
+import sys
 import dotenv
-from entities.symbol_tables import SymbolTables
-from entities.preconfigured_functions import initialize_logo_functions
-from lexer.lexer import Lexer
-from code_generator.code_generator import JavaCodeGenerator
-from code_generator.preconf_code_generator import JavaPreconfFuncsGenerator
+from compiler.batch import BatchCompiler
+from compiler.compiler import (
+    Compiler,
+    create_code_generator,
+    get_robot_config,
+    PARSERS,
+    PLY_PARSER,
+)
+from compiler.server import CompileServer, StderrConsoleIO
 from utils.console_io import ConsoleIO
-from utils.error_handler import ErrorHandler
 from utils.logger import Logger
 
 
 def main():
-    def get_code_generator():
-        """Checks that given programming language is valid in
-        .env file and returns a new instance of CodeGenerator class,
-        and creates the preconfigured functions generator.
-        Preconf generator needs to use the same generator so that
-        the mangled namespace is  the same"""
-
-        if CODE_GEN_LANG == "Java":
-            preconf_gen = JavaPreconfFuncsGenerator()
-            jcg = JavaCodeGenerator(logger=logger)
-            preconf_gen.set_code_generator(jcg)
-            funcs_dict = preconf_gen.get_funcs()
-            jcg.set_preconf_funcs_dict(funcs_dict)
-            jcg.add_env_variables(
-                wheelDiameter=os.getenv("WHEEL_DIAM"),
-                wheelDistance=os.getenv("AXLE_LEN"),
-                leftMotor=os.getenv("LEFT_MOTOR_PORT"),
-                rightMotor=os.getenv("RIGHT_MOTOR_PORT"),
-                motorSpeed=os.getenv("MOVEMENT_SPD"),
-                motorRotationSpeed = os.getenv("ROTATION_SPD"),
-            )
-            return jcg
-
-        err_msg = f"{CODE_GEN_LANG} is not an implemented" "programming language for code generator"
-        raise Exception(err_msg)
-
-    def compile_logo():
-        """Compiles a user given logo file and generates code if there are no errors.
-        Prints lexer & parser results if debug flag (-d, --debug) is on."""
-
-        logger.debug(LOGO_CODE + "\n")
-        # Tokenize
-        tokens = lexer.tokenize_input(LOGO_CODE)
-        logger.debug("Lexer tokens:")
-        logger.debug("\n".join((str(token) for token in tokens)) + "\n")
-
-        # Parse and type analyzation
-        start_node = parser.parse(LOGO_CODE)
-        if start_node:
-            start_node.check_types()
-            logger.debug("Parser AST:")
-            logger.debug(console_io.get_formatted_ast(start_node))
-
-        # Code generation, if there are no errors
-        if start_node and not error_handler.errors:
-            logger.debug("Generated code:")
-            start_node.generate_code()
-            code_generator.write()
+    if args.command == "batch":
+        # Robot parameters are written once, the workers only generate Logo.java files.
+        create_code_generator(CODE_GEN_LANG, Logger(), get_robot_config()).close()
+        batch_compiler = BatchCompiler(
+            args.output,
+            language=MESSAGE_LANG,
+            code_gen_lang=CODE_GEN_LANG,
+            jobs=args.jobs,
+            optimize=args.optimize,
+            parser_name=args.parser,
+            profile=args.profile,
+        )
+        report = batch_compiler.compile_path(args.path)
+        print(json.dumps({key: report[key] for key in ("compiled", "failed")}))
+        return
+
+    # Create required classes for the compiler. In server mode, stdout is reserved
+    # for the responses.
+    console_io = StderrConsoleIO() if args.serve else ConsoleIO()
+    with Compiler(
+        language=MESSAGE_LANG,
+        code_gen_lang=CODE_GEN_LANG,
+        robot_config=get_robot_config(),
+        debug=args.debug,
+        console_io=console_io,
+        optimize=args.optimize,
+        parser_name=args.parser,
+        profile=args.profile,
+    ) as compiler:
+        if args.serve:
+            # Compile requests from stdin until it is closed
+            CompileServer(compiler).serve()
         else:
-            error_handler.create_json_file()
-            error_handler.write_errors_to_console()
+            # Compile from logo to language defined with CODE_GEN .env variable
+            result = compiler.compile(LOGO_CODE)
+            if result.profile is not None:
+                print(json.dumps(result.profile, indent=2), file=sys.stderr)
 
-    # Create required classes for the compiler
-    console_io = ConsoleIO()
-    error_handler = ErrorHandler(console_io=console_io, language=MESSAGE_LANG)
-    logger = Logger(console_io, error_handler, args.debug)
-    lexer = Lexer(logger)
-    lexer.build()
-    symbol_tables = SymbolTables()
-    code_generator = get_code_generator()
-    parser = Parser(lexer, logger, symbol_tables, code_generator)
 
-    symbol_tables.functions = initialize_logo_functions(symbol_tables.functions)
+if __name__ == "__main__":
 
-    # Compile from logo to language defined with CODE_GEN .env variable
-    compile_logo()
+    def add_optimize_arg(arg_parser):
+        arg_parser.add_argument(
+            "-O",
+            "--optimize",
+            action="store_true",
+            help="generate unboxed primitive values instead of Variable objects",
+        )
 
+    def add_parser_arg(arg_parser):
+        arg_parser.add_argument(
+            "--parser",
+            choices=sorted(PARSERS),
+            default=PLY_PARSER,
+            help="parser backend, 'descent' parses without generating LALR tables",
+        )
 
-if __name__ == "__main__":
+    def add_profile_arg(arg_parser):
+        arg_parser.add_argument(
+            "--profile",
+            action="store_true",
+            help="report the time of each compiler phase and counters as JSON",
+        )
+
+    def get_batch_cmd_line_args():
+        arg_parser = argparse.ArgumentParser(
+            prog="Logomotion batch", description="Compile many logo files in parallel"
+        )
+        arg_parser.add_argument("path", help="directory of .logo files or a glob pattern")
+        arg_parser.add_argument(
+            "-o", "--output", default="batch_output", help="directory for the results"
+        )
+        arg_parser.add_argument("-j", "--jobs", type=int, help="number of worker processes")
+        add_optimize_arg(arg_parser)
+        add_parser_arg(arg_parser)
+        add_profile_arg(arg_parser)
+        parsed_args = arg_parser.parse_args(sys.argv[2:])
+        parsed_args.command = "batch"
+        return parsed_args
 
     def get_cmd_line_args():
+        if sys.argv[1:2] == ["batch"]:
+            return get_batch_cmd_line_args()
+
         arg_parser = argparse.ArgumentParser(
             prog="Logomotion", description="Compile logo to java via python"
         )
-        arg_parser.add_argument("filepath")
+        arg_parser.add_argument("filepath", nargs="?")
         arg_parser.add_argument("-d", "--debug", action="store_true")
-        return arg_parser.parse_args()
+        add_optimize_arg(arg_parser)
+        add_parser_arg(arg_parser)
+        add_profile_arg(arg_parser)
+        arg_parser.add_argument(
+            "--serve",
+            action="store_true",
+            help="compile JSON line requests from stdin with a warm compiler",
+        )
+        parsed_args = arg_parser.parse_args()
+        if not parsed_args.serve and not parsed_args.filepath:
+            arg_parser.error("filepath is required unless --serve is given")
+        parsed_args.command = "compile"
+        return parsed_args
 
     def load_file(filename):
         """Loads a file and returns contents as a string."""
@@ -109,6 +138,6 @@ if __name__ == "__main__":
     args = get_cmd_line_args()
 
     # Get logo code from file. Filepath is given as a command line argument
-    LOGO_CODE = load_file(args.filepath)
+    LOGO_CODE = load_file(args.filepath) if getattr(args, "filepath", None) else None
 
     main()
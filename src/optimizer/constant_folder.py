@@ -0,0 +1,182 @@
+"""Constant folding pass. Run on a type checked AST before code generation, it replaces
+operations on literals with their result, conditionals with a constant condition with
+the branch that is taken, and drops statements that follow an output."""
+
+import math
+import operator
+from entities.ast.conditionals import If, IfElse
+from entities.ast.functions import Output
+from entities.ast.node import Node, NodeFactory
+from entities.ast.operations import BinOp, RelOp, UnaryOp
+from entities.ast.statementlist import Block, StatementList
+from entities.ast.variables import Bool, Float, StringLiteral
+from entities.ast.visitor import Visitor
+from lexer.token_types import TokenType
+
+BINARY_OPERATIONS = {
+    "+": operator.add,
+    "-": operator.sub,
+    "*": operator.mul,
+    "/": operator.truediv,
+}
+
+RELATIONAL_OPERATIONS = {
+    "=": operator.eq,
+    "<>": operator.ne,
+    "<": operator.lt,
+    ">": operator.gt,
+    "<=": operator.le,
+    ">=": operator.ge,
+}
+
+
+def count_nodes(node):
+    """Returns the number of nodes in the subtree of node, conditions included."""
+    count = 0
+    stack = [node]
+    while stack:
+        node = stack.pop()
+        count += 1
+        if isinstance(node, (If, IfElse)):
+            stack.append(node.leaf)
+        stack.extend(node.children)
+    return count
+
+
+class ConstantFolder(Visitor):
+    """Folds constant subtrees of an AST in place. New nodes are created with the given
+    node factory, so that they share the dependencies of the rest of the tree. Visiting a
+    node returns the node that replaces it, or None if it is removed."""
+
+    name = "Constant folding"
+
+    def __init__(self, node_factory: NodeFactory):
+        self._node_factory = node_factory
+        self._removed_nodes = 0
+
+    def run(self, start_node: Node):
+        """Folds the AST as a pass of the PassManager. Returns a summary for the log."""
+        return f"removed {self.fold(start_node)} AST nodes"
+
+    def fold(self, node: Node):
+        """Folds the AST rooted at node. Returns the number of removed nodes."""
+        self._removed_nodes = 0
+        self.visit(node)
+        return self._removed_nodes
+
+    def generic_visit(self, node):
+        """Folds the condition and the children of node, then node itself."""
+        if isinstance(node, (If, IfElse)):
+            node.leaf = yield node.leaf
+
+        children = []
+        for child in node.children:
+            folded = yield child
+            if folded is not None:
+                children.append(folded)
+        if isinstance(node, StatementList):
+            children = self._remove_unreachable(children)
+        node.children = children
+
+        return self._fold_node(node)
+
+    def _replace(self, node, replacement):
+        """Returns replacement and records the nodes it removes. Replacement None
+        removes the node."""
+        removed = count_nodes(node)
+        if replacement is not None:
+            removed -= count_nodes(replacement)
+        self._removed_nodes += removed
+        return replacement
+
+    def _fold_node(self, node):
+        """Returns the node that replaces node, whose subtree has been folded, or None if
+        the node is removed."""
+        if isinstance(node, BinOp):
+            return self._fold_binop(node)
+        if isinstance(node, UnaryOp):
+            return self._fold_unary_op(node)
+        if isinstance(node, RelOp):
+            return self._fold_relop(node)
+        if isinstance(node, If):
+            return self._fold_if(node)
+        if isinstance(node, IfElse):
+            return self._fold_ifelse(node)
+        return node
+
+    def _create_float(self, node, value):
+        if not math.isfinite(value):
+            # Infinity and NaN have no Java literal, leave them to run time.
+            return node
+        return self._replace(
+            node, self._node_factory.create_node(Float, leaf=value, position=node.position)
+        )
+
+    def _fold_binop(self, node):
+        operand1, operand2 = node.children
+        if not (isinstance(operand1, Float) and isinstance(operand2, Float)):
+            return node
+        try:
+            value = BINARY_OPERATIONS[node.leaf](operand1.leaf, operand2.leaf)
+        except ZeroDivisionError:
+            return node
+        return self._create_float(node, value)
+
+    def _fold_unary_op(self, node):
+        operand = node.children[0]
+        if not isinstance(operand, Float):
+            return node
+        return self._create_float(node, -operand.leaf)
+
+    def _fold_relop(self, node):
+        operand1, operand2 = node.children
+        floats = isinstance(operand1, Float) and isinstance(operand2, Float)
+        strings = (
+            isinstance(operand1, StringLiteral)
+            and isinstance(operand2, StringLiteral)
+            and node.leaf in ("=", "<>")
+        )
+        if not (floats or strings):
+            return node
+
+        value = RELATIONAL_OPERATIONS[node.leaf](operand1.leaf, operand2.leaf)
+        leaf = TokenType.TRUE if value else TokenType.FALSE
+        return self._replace(
+            node, self._node_factory.create_node(Bool, leaf=leaf, position=node.position)
+        )
+
+    def _create_block(self, node, children):
+        return self._replace(
+            node,
+            self._node_factory.create_node(Block, children=children, position=node.position),
+        )
+
+    def _fold_if(self, node):
+        if not isinstance(node.leaf, Bool):
+            return node
+        if node.leaf.leaf == TokenType.TRUE:
+            return self._create_block(node, node.children)
+        return self._replace(node, None)
+
+    def _fold_ifelse(self, node):
+        if not isinstance(node.leaf, Bool):
+            return node
+        branch = node.children[0] if node.leaf.leaf == TokenType.TRUE else node.children[1]
+        return self._create_block(node, [branch])
+
+    def _remove_unreachable(self, statements):
+        """Drops the statements after a statement that always outputs. Java does not
+        compile unreachable statements."""
+        for index, statement in enumerate(statements):
+            if self._always_outputs(statement):
+                for unreachable in statements[index + 1 :]:
+                    self._replace(unreachable, None)
+                return statements[: index + 1]
+        return statements
+
+    def _always_outputs(self, node):
+        if isinstance(node, Output):
+            return True
+        if isinstance(node, (Block, StatementList)):
+            return any(self._always_outputs(child) for child in node.children)
+        return False
@@ -0,0 +1,31 @@
+"""Runs the optimisation passes of the compiler over a type checked AST."""
+
+from utils.logger import default_logger
+
+
+class PassManager:
+    """Runs passes over the AST in the order they were added. A pass is an object with a
+    name and a run(start_node) method, which can change the AST in place and returns a
+    summary for the debug log, or None. Passes that visit the nodes subclass Visitor, so
+    new passes need no changes in the node classes."""
+
+    def __init__(self, logger=default_logger):
+        self._logger = logger
+        self._passes = []
+
+    def add_pass(self, ast_pass):
+        """Adds ast_pass to run after the passes added before it."""
+        self._passes.append(ast_pass)
+
+    def get_pass_names(self):
+        """Returns the names of the passes in the order they run."""
+        return [ast_pass.name for ast_pass in self._passes]
+
+    def run(self, start_node):
+        """Runs the passes on the AST. Returns True if any pass ran, since the AST may
+        then no longer match the code it was parsed from."""
+        for ast_pass in self._passes:
+            summary = ast_pass.run(start_node)
+            if summary:
+                self._logger.debug(f"{ast_pass.name}: {summary}")
+        return bool(self._passes)
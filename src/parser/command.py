@@ -9,287 +9,285 @@ from entities.ast.operations import *
 from entities.ast.statementlist import *
 from entities.ast.variables import *
 from entities.ast.unknown_function import *
-from lexer.token_types import TokenType
-
-
-def p_statement(prod):
-    """statement : fd
-    | bk
-    | lt
-    | rt
-    | show
-    | make
-    | bye
-    | if
-    | ifelse
-    | proc_decl
-    | output
-    | proc_call"""
-    prod[0] = prod[1]
-
-
-def p_fd(prod):
-    "fd : FD expression"
-    prod[0] = shared.node_factory.create_node(
-        Move,
-        node_type=shared.reserved_words[prod[1]],
-        children=[prod[2]],
-        position=Position(prod),
+from lexer.token_types import TokenType, MAX_BASE_PROCEDURE_ARITY
+from parser.preparser import procedure_call_rule, procedure_call_paren_rule
+
+
+class CommandRules:
+    """Grammar rules for commands. Mixed into the parser's Grammar class, which provides
+    the node factory and the reserved words used by the rules."""
+
+    def p_statement(self, prod):
+        """statement : fd
+        | bk
+        | lt
+        | rt
+        | show
+        | make
+        | bye
+        | if
+        | ifelse
+        | proc_decl
+        | output
+        | proc_call"""
+        prod[0] = prod[1]
+
+    def p_fd(self, prod):
+        "fd : FD expression"
+        prod[0] = self.node_factory.create_node(
+            Move,
+            node_type=self.reserved_words[prod[1]],
+            children=[prod[2]],
+            position=Position(prod),
+        )
+
+    def p_fd_paren(self, prod):
+        "fd : LPAREN FD expression RPAREN"
+        prod[0] = self.node_factory.create_node(
+            Move,
+            node_type=self.reserved_words[prod[2]],
+            children=[prod[3]],
+            position=Position(prod),
+        )
+
+    def p_bk(self, prod):
+        "bk : BK expression"
+        prod[0] = self.node_factory.create_node(
+            Move,
+            node_type=self.reserved_words[prod[1]],
+            children=[prod[2]],
+            position=Position(prod),
+        )
+
+    def p_bk_paren(self, prod):
+        "bk : LPAREN BK expression RPAREN"
+        prod[0] = self.node_factory.create_node(
+            Move,
+            node_type=self.reserved_words[prod[2]],
+            children=[prod[3]],
+            position=Position(prod),
+        )
+
+    def p_lt(self, prod):
+        "lt : LT expression"
+        prod[0] = self.node_factory.create_node(
+            Move,
+            node_type=self.reserved_words[prod[1]],
+            children=[prod[2]],
+            position=Position(prod),
+        )
+
+    def p_lt_paren(self, prod):
+        "lt : LPAREN LT expression RPAREN"
+        prod[0] = self.node_factory.create_node(
+            Move,
+            node_type=self.reserved_words[prod[2]],
+            children=[prod[3]],
+            position=Position(prod),
+        )
+
+    def p_rt(self, prod):
+        "rt : RT expression"
+        prod[0] = self.node_factory.create_node(
+            Move,
+            node_type=self.reserved_words[prod[1]],
+            children=[prod[2]],
+            position=Position(prod),
+        )
+
+    def p_rt_paren(self, prod):
+        "rt : LPAREN RT expression RPAREN"
+        prod[0] = self.node_factory.create_node(
+            Move,
+            node_type=self.reserved_words[prod[2]],
+            children=[prod[3]],
+            position=Position(prod),
+        )
+
+    def p_show(self, prod):
+        "show : SHOW expression"
+        prod[0] = self.node_factory.create_node(
+            Show,
+            node_type=self.reserved_words[prod[1]],
+            children=[prod[2]],
+            position=Position(prod),
+        )
+
+    def p_show_paren(self, prod):
+        "show : LPAREN SHOW expression expressions RPAREN"
+        prod[0] = self.node_factory.create_node(
+            Show,
+            node_type=self.reserved_words[prod[2]],
+            children=[prod[3]] + prod[4],
+            position=Position(prod),
+        )
+
+    def p_make(self, prod):
+        """make : MAKE expression expression"""
+        prod[0] = self.node_factory.create_node(
+            Make,
+            children=[prod[3]],
+            leaf=prod[2],
+            position=Position(prod),
+        )
+
+    def p_make_paren(self, prod):
+        "make : LPAREN MAKE expression expression RPAREN"
+        prod[0] = self.node_factory.create_node(
+            Make,
+            children=[prod[4]],
+            leaf=prod[3],
+            position=Position(prod),
+        )
+
+    def p_proc_decl(self, prod):
+        "proc_decl : TO IDENT proc_args statement_list END"
+        prod[0] = self.node_factory.create_node(
+            ProcDecl, children=[prod[3], prod[4]], leaf=prod[2], position=Position(prod)
+        )
+
+    def p_proc_args(self, prod):
+        "proc_args : proc_args DEREF"
+        argument = self.node_factory.create_node(ProcArg, leaf=prod[2][1:], position=Position(prod))
+        prod[1].children.append(argument)
+        prod[0] = prod[1]
+
+    def p_output(self, prod):
+        "output : OUTPUT expression"
+        prod[0] = self.node_factory.create_node(
+            Output,
+            children=[prod[2]],
+            position=Position(prod),
+        )
+
+    def p_proc_args_empty(self, prod):
+        "proc_args : empty"
+        prod[0] = self.node_factory.create_node(ProcArgs, children=[], position=Position(prod))
+
+    def p_proc_call(self, prod):
+        "proc_call : LPAREN IDENT expressions RPAREN"
+        prod[0] = self.node_factory.create_node(
+            ProcCall,
+            children=prod[3],
+            leaf=prod[2],
+            position=Position(prod),
+        )
+
+    def p_proc_call_arity(self, prod):
+        prod[0] = self.node_factory.create_node(
+            ProcCall,
+            children=list(prod[2:]),
+            leaf=prod[1],
+            position=Position(prod),
+        )
+
+    def p_proc_call_arity_paren(self, prod):
+        prod[0] = self.node_factory.create_node(
+            ProcCall,
+            children=prod[3],
+            leaf=prod[2],
+            position=Position(prod),
+        )
+
+    # Call rules for user defined procedures, e.g. "proc_call : PROC_ARITY_1 expression".
+    p_proc_call_arity.__doc__ = procedure_call_rule(range(MAX_BASE_PROCEDURE_ARITY + 1))
+    p_proc_call_arity_paren.__doc__ = procedure_call_paren_rule(
+        range(MAX_BASE_PROCEDURE_ARITY + 1)
     )
 
-
-def p_fd_paren(prod):
-    "fd : LPAREN FD expression RPAREN"
-    prod[0] = shared.node_factory.create_node(
-        Move,
-        node_type=shared.reserved_words[prod[2]],
-        children=[prod[3]],
-        position=Position(prod),
-    )
-
-
-def p_bk(prod):
-    "bk : BK expression"
-    prod[0] = shared.node_factory.create_node(
-        Move,
-        node_type=shared.reserved_words[prod[1]],
-        children=[prod[2]],
-        position=Position(prod),
-    )
-
-
-def p_bk_paren(prod):
-    "bk : LPAREN BK expression RPAREN"
-    prod[0] = shared.node_factory.create_node(
-        Move,
-        node_type=shared.reserved_words[prod[2]],
-        children=[prod[3]],
-        position=Position(prod),
-    )
-
-
-def p_lt(prod):
-    "lt : LT expression"
-    prod[0] = shared.node_factory.create_node(
-        Move,
-        node_type=shared.reserved_words[prod[1]],
-        children=[prod[2]],
-        position=Position(prod),
-    )
-
-
-def p_lt_paren(prod):
-    "lt : LPAREN LT expression RPAREN"
-    prod[0] = shared.node_factory.create_node(
-        Move,
-        node_type=shared.reserved_words[prod[2]],
-        children=[prod[3]],
-        position=Position(prod),
-    )
-
-
-def p_rt(prod):
-    "rt : RT expression"
-    prod[0] = shared.node_factory.create_node(
-        Move,
-        node_type=shared.reserved_words[prod[1]],
-        children=[prod[2]],
-        position=Position(prod),
-    )
-
-
-def p_rt_paren(prod):
-    "rt : LPAREN RT expression RPAREN"
-    prod[0] = shared.node_factory.create_node(
-        Move,
-        node_type=shared.reserved_words[prod[2]],
-        children=[prod[3]],
-        position=Position(prod),
-    )
-
-
-def p_show(prod):
-    "show : SHOW expression"
-    prod[0] = shared.node_factory.create_node(
-        Show,
-        node_type=shared.reserved_words[prod[1]],
-        children=[prod[2]],
-        position=Position(prod),
-    )
-
-
-def p_show_paren(prod):
-    "show : LPAREN SHOW expression expressions RPAREN"
-    prod[0] = shared.node_factory.create_node(
-        Show,
-        node_type=shared.reserved_words[prod[2]],
-        children=[prod[3]] + prod[4],
-        position=Position(prod),
-    )
-
-
-def p_make(prod):
-    """make : MAKE expression expression"""
-    prod[0] = shared.node_factory.create_node(
-        Make,
-        children=[prod[3]],
-        leaf=prod[2],
-        position=Position(prod),
-    )
-
-
-def p_make_paren(prod):
-    "make : LPAREN MAKE expression expression RPAREN"
-    prod[0] = shared.node_factory.create_node(
-        Make,
-        children=[prod[4]],
-        leaf=prod[3],
-        position=Position(prod),
-    )
-
-
-def p_proc_decl(prod):
-    "proc_decl : TO IDENT proc_args statement_list END"
-    prod[0] = shared.node_factory.create_node(
-        ProcDecl, children=[prod[3], prod[4]], leaf=prod[2], position=Position(prod)
-    )
-
-
-def p_proc_args(prod):
-    "proc_args : proc_args DEREF"
-    argument = shared.node_factory.create_node(ProcArg, leaf=prod[2][1:], position=Position(prod))
-    prod[0] = shared.node_factory.create_node(
-        ProcArgs, children=prod[1].children + [argument], position=Position(prod)
-    )
-
-
-def p_output(prod):
-    "output : OUTPUT expression"
-    prod[0] = shared.node_factory.create_node(
-        Output,
-        children=[prod[2]],
-        position=Position(prod),
-    )
-
-
-def p_proc_args_empty(prod):
-    "proc_args : empty"
-    prod[0] = shared.node_factory.create_node(ProcArgs, children=[], position=Position(prod))
-
-
-def p_proc_call(prod):
-    "proc_call : LPAREN IDENT expressions RPAREN"
-    prod[0] = shared.node_factory.create_node(
-        ProcCall,
-        children=prod[3],
-        leaf=prod[2],
-        position=Position(prod),
-    )
-
-def p_for_call(prod): #for ["i 1 2 3] {}
-    "proc_call : FOR LBRACKET expressions RBRACKET unknown_function"
-    vnode = shared.node_factory.create_node(
-            VariableNode,
-            leaf=prod[3][0],
+    def p_for_call(self, prod): #for ["i 1 2 3] {}
+        "proc_call : FOR LBRACKET expressions RBRACKET unknown_function"
+        vnode = self.node_factory.create_node(
+                VariableNode,
+                leaf=prod[3][0],
+                position=Position(prod)
+                )
+        unf = prod[5]
+        unf.var_node = vnode
+        prod[0] = self.node_factory.create_node(
+            ProcCall,
+            children=[vnode] + prod[3][1:] + [unf],
+            leaf="for",
             position=Position(prod)
-            )
-    unf = prod[5]
-    unf.var_node = vnode
-    prod[0] = shared.node_factory.create_node(
-        ProcCall,
-        children=[vnode] + prod[3][1:] + [unf],
-        leaf="for",
-        position=Position(prod)
-    )
-
-def p_repeat_call(prod):
-    "proc_call : REPEAT expression expression"
-    unf = prod[3]
-    unf.arg_type = LogoType.VOID
-    prod[0] = shared.node_factory.create_node(
-        ProcCall,
-        children=[prod[2]] + [unf],
-        leaf = "repeat",
-        position=Position(prod)
-    )
-
-def p_bye(prod):
-    "bye : BYE"
-    prod[0] = shared.node_factory.create_node(
-        Bye, node_type=shared.reserved_words[prod[1]], position=Position(prod)
-    )
-
-
-def p_bye_paren(prod):
-    "bye : LPAREN BYE RPAREN"
-    prod[0] = shared.node_factory.create_node(
-        Bye, node_type=shared.reserved_words[prod[2]], position=Position(prod)
-    )
-
-
-def p_if(prod):
-    "if : IF LBRACE expression RBRACE unknown_function"
-    prod[0] = shared.node_factory.create_node(
-        If, children=prod[5].children, leaf=prod[3], position=Position(prod)
-    )
-
-
-def p_if_paren(prod):
-    "if : LPAREN IF LBRACE expression RBRACE unknown_function RPAREN"
-    prod[0] = shared.node_factory.create_node(
-        If, children=prod[6].children, leaf=prod[4], position=Position(prod)
-    )
-
-
-def p_if_without_braces(prod):
-    "if : IF expression unknown_function"
-    prod[0] = shared.node_factory.create_node(
-        If, children=prod[3].children, leaf=prod[2], position=Position(prod)
-    )
-
-
-def p_if_without_braces_paren(prod):
-    "if : LPAREN IF expression unknown_function RPAREN"
-    prod[0] = shared.node_factory.create_node(
-        If, children=prod[4].children, leaf=prod[3], position=Position(prod)
-    )
-
-
-def p_ifelse(prod):
-    "ifelse : IFELSE LBRACE expression RBRACE unknown_function unknown_function"
-    prod[0] = shared.node_factory.create_node(
-        IfElse,
-        children=[prod[5].children[0], prod[6].children[0]],
-        leaf=prod[3],
-        position=Position(prod),
-    )
-
-
-def p_ifelse_paren(prod):
-    "ifelse : LPAREN IFELSE LBRACE expression RBRACE unknown_function unknown_function RPAREN"
-    prod[0] = shared.node_factory.create_node(
-        IfElse,
-        children=[prod[6].children[0], prod[7].children[0]],
-        leaf=prod[4],
-        position=Position(prod),
-    )
-
-
-def p_ifelse_without_braces(prod):
-    "ifelse : IFELSE expression unknown_function unknown_function"
-    prod[0] = shared.node_factory.create_node(
-        IfElse,
-        children=[prod[3].children[0], prod[4].children[0]],
-        leaf=prod[2],
-        position=Position(prod),
-    )
-
-
-def p_ifelse_without_braces_paren(prod):
-    "ifelse : LPAREN IFELSE expression unknown_function unknown_function RPAREN"
-    prod[0] = shared.node_factory.create_node(
-        IfElse,
-        children=[prod[4].children[0], prod[5].children[0]],
-        leaf=prod[3],
-        position=Position(prod),
-    )
+        )
+
+    def p_repeat_call(self, prod):
+        "proc_call : REPEAT expression expression"
+        prod[0] = self.node_factory.create_node(
+            ProcCall,
+            children=[prod[2], prod[3]],
+            leaf = "repeat",
+            position=Position(prod)
+        )
+
+    def p_bye(self, prod):
+        "bye : BYE"
+        prod[0] = self.node_factory.create_node(
+            Bye, node_type=self.reserved_words[prod[1]], position=Position(prod)
+        )
+
+    def p_bye_paren(self, prod):
+        "bye : LPAREN BYE RPAREN"
+        prod[0] = self.node_factory.create_node(
+            Bye, node_type=self.reserved_words[prod[2]], position=Position(prod)
+        )
+
+    def p_if(self, prod):
+        "if : IF LBRACE expression RBRACE unknown_function"
+        prod[0] = self.node_factory.create_node(
+            If, children=prod[5].children, leaf=prod[3], position=Position(prod)
+        )
+
+    def p_if_paren(self, prod):
+        "if : LPAREN IF LBRACE expression RBRACE unknown_function RPAREN"
+        prod[0] = self.node_factory.create_node(
+            If, children=prod[6].children, leaf=prod[4], position=Position(prod)
+        )
+
+    def p_if_without_braces(self, prod):
+        "if : IF expression unknown_function"
+        prod[0] = self.node_factory.create_node(
+            If, children=prod[3].children, leaf=prod[2], position=Position(prod)
+        )
+
+    def p_if_without_braces_paren(self, prod):
+        "if : LPAREN IF expression unknown_function RPAREN"
+        prod[0] = self.node_factory.create_node(
+            If, children=prod[4].children, leaf=prod[3], position=Position(prod)
+        )
+
+    def p_ifelse(self, prod):
+        "ifelse : IFELSE LBRACE expression RBRACE unknown_function unknown_function"
+        prod[0] = self.node_factory.create_node(
+            IfElse,
+            children=[prod[5].children[0], prod[6].children[0]],
+            leaf=prod[3],
+            position=Position(prod),
+        )
+
+    def p_ifelse_paren(self, prod):
+        "ifelse : LPAREN IFELSE LBRACE expression RBRACE unknown_function unknown_function RPAREN"
+        prod[0] = self.node_factory.create_node(
+            IfElse,
+            children=[prod[6].children[0], prod[7].children[0]],
+            leaf=prod[4],
+            position=Position(prod),
+        )
+
+    def p_ifelse_without_braces(self, prod):
+        "ifelse : IFELSE expression unknown_function unknown_function"
+        prod[0] = self.node_factory.create_node(
+            IfElse,
+            children=[prod[3].children[0], prod[4].children[0]],
+            leaf=prod[2],
+            position=Position(prod),
+        )
+
+    def p_ifelse_without_braces_paren(self, prod):
+        "ifelse : LPAREN IFELSE expression unknown_function unknown_function RPAREN"
+        prod[0] = self.node_factory.create_node(
+            IfElse,
+            children=[prod[4].children[0], prod[5].children[0]],
+            leaf=prod[3],
+            position=Position(prod),
+        )
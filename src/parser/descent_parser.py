@@ -0,0 +1,575 @@
+"""Recursive descent parser. An alternative to the PLY parser, which builds the same AST
+without generating LALR tables. Statements are parsed by recursive descent and expressions
+by precedence climbing with the precedence table in parser/globals.py. Calls to user
+defined procedures take as many arguments as the preparser found parameters, so the
+preparser does not need to create grammar rules for them.
+
+The parse methods of the nested parts of a program are generators, which yield the
+parsers of their parts and get back the parsed nodes, like the handlers of
+entities.ast.visitor. DescentParser._run keeps the generators on an explicit stack, so
+blocks and parentheses can be nested as deep as in the PLY parser without hitting the
+recursion limit."""
+
+from types import GeneratorType
+from parser.globals import Position, precedence
+from parser.preparser import Preparser
+from entities.ast.conditionals import If, IfElse
+from entities.ast.functions import Output, ProcArg, ProcArgs, ProcCall, ProcDecl
+from entities.ast.logocommands import Bye, Make, Move, Show
+from entities.ast.node import NodeFactory, Start
+from entities.ast.operations import BinOp, RelOp, UnaryOp
+from entities.ast.statementlist import StatementList
+from entities.ast.unknown_function import UnknownFunction
+from entities.ast.variables import Bool, Deref, Float, StringLiteral, VariableNode
+from entities.symbol_tables import default_symbol_tables
+from code_generator.code_generator import default_code_generator
+from lexer.lexer import Lexer
+from lexer.token_types import TokenType, PROCEDURE_TOKEN_PREFIX
+from utils.logger import default_logger
+
+# Operator precedences as (associativity, level), like PLY computes them from the table.
+PRECEDENCE = {
+    token: (associativity, level)
+    for level, (associativity, *tokens) in enumerate(precedence, start=1)
+    for token in tokens
+}
+# PLY's precedence for the rules and tokens that are not in the table.
+DEFAULT_PRECEDENCE = ("right", 0)
+
+BINARY_OPERATIONS = {
+    TokenType.PLUS.value: BinOp,
+    TokenType.MINUS.value: BinOp,
+    TokenType.MUL.value: BinOp,
+    TokenType.DIV.value: BinOp,
+    TokenType.EQUALS.value: RelOp,
+    TokenType.LESSTHAN.value: RelOp,
+    TokenType.GREATERTHAN.value: RelOp,
+    TokenType.LTEQUALS.value: RelOp,
+    TokenType.GTEQUALS.value: RelOp,
+    TokenType.NOTEQUALS.value: RelOp,
+}
+
+# Tokens that are an expression by themselves.
+ATOMS = {
+    TokenType.NUMBER.value,
+    TokenType.FLOAT.value,
+    TokenType.TRUE.value,
+    TokenType.FALSE.value,
+    TokenType.DEREF.value,
+    TokenType.STRINGLITERAL.value,
+}
+
+# Tokens that can start an expression, in addition to the procedure tokens.
+EXPRESSION_START = {
+    TokenType.NUMBER.value,
+    TokenType.FLOAT.value,
+    TokenType.TRUE.value,
+    TokenType.FALSE.value,
+    TokenType.DEREF.value,
+    TokenType.STRINGLITERAL.value,
+    TokenType.MINUS.value,
+    TokenType.LPAREN.value,
+    TokenType.LBRACE.value,
+    TokenType.FOR.value,
+    TokenType.REPEAT.value,
+}
+
+
+class ParseError(Exception):
+    """Raised at the first syntax error, after it has been reported."""
+
+
+class DescentParser:
+    """Hand-written parser with the same interface as parser.parser.Parser. Stops at the
+    first syntax error, which is reported with the same error messages as the PLY parser
+    uses."""
+
+    def __init__(
+        self,
+        current_lexer: Lexer,
+        logger=default_logger,
+        symbol_tables=default_symbol_tables,
+        code_generator=default_code_generator,
+    ):
+        self._current_lexer = current_lexer
+        self._logger = logger
+        self.reserved_words = current_lexer.reserved_words
+        self.node_factory = NodeFactory(logger, symbol_tables, code_generator)
+        self._preparser = Preparser(current_lexer, self.node_factory, logger)
+        self._tokens = []
+        self._index = 0
+        self._end_state = (1, 0, 0)
+        self._procedure_arities = {}
+        self._pending_operand = None
+        self._statement_parsers = {
+            TokenType.FD.value: self._parse_move,
+            TokenType.BK.value: self._parse_move,
+            TokenType.LT.value: self._parse_move,
+            TokenType.RT.value: self._parse_move,
+            TokenType.SHOW.value: self._parse_show,
+            TokenType.MAKE.value: self._parse_make,
+            TokenType.BYE.value: self._parse_bye,
+            TokenType.IF.value: self._parse_if,
+            TokenType.IFELSE.value: self._parse_ifelse,
+            TokenType.TO.value: self._parse_proc_decl,
+            TokenType.OUTPUT.value: self._parse_output,
+            TokenType.FOR.value: self._parse_for,
+            TokenType.REPEAT.value: self._parse_repeat,
+        }
+
+    def reset(self):
+        "Resets the parser internals."
+        self._preparser.reset()
+        self._tokens = []
+        self._index = 0
+        self._procedure_arities = {}
+        self._pending_operand = None
+
+    def parse(self, code, tokens=None, procedure_arities=None):
+        """Parses the given code. Returns the AST, or None if the code has a syntax error.
+
+        Args:
+            code (str): Logo source code.
+            tokens (lexer.token_buffer.TokenBuffer): The code already tokenized with
+                Lexer.tokenize(). The code is tokenized here if not given.
+            procedure_arities (dict): Parameter counts of the procedures by name, when the
+                tokens are only a part of the program. Found from the tokens if not given.
+
+        Returns:
+            start_node (parser.ast.Start): AST
+        """
+
+        token_buffer = tokens if tokens is not None else self._current_lexer.tokenize(code)
+
+        self.reset()
+        self._current_lexer.reset()
+        profiler = self._logger.profiler
+        with profiler.phase("preparse"):
+            self._procedure_arities = self._preparser.register_procedures(
+                token_buffer.tokens, procedure_arities
+            )
+        self._tokens = token_buffer.tokens
+        self._end_state = token_buffer.end_state
+
+        with profiler.phase("parse"):
+            try:
+                statement_list = self._run(self._parse_statement_list())
+                if self._peek():
+                    self._error()
+                return self.node_factory.create_node(
+                    Start, children=[statement_list], position=statement_list.position
+                )
+            except ParseError:
+                return None
+
+    def get_procedure_arities(self):
+        """Returns the parameter counts of the procedures of the last parse by name."""
+        return dict(self._procedure_arities)
+
+    @staticmethod
+    def _run(parser):
+        """Runs the parser generator and the parsers that it yields. Each parser gets back
+        the node of the parser it yielded, and returns its own node. A parse method that
+        is not a generator function, like _parse_bye, returns the node at once."""
+        stack = [parser]
+        node = None
+        while stack:
+            try:
+                node = stack[-1].send(node)
+            except StopIteration as stop:
+                stack.pop()
+                node = stop.value
+                continue
+            if node.__class__ is GeneratorType:
+                stack.append(node)
+                node = None
+        return node
+
+    # Token helpers.
+
+    def _peek(self, offset=0):
+        """Returns the token offset tokens ahead without consuming it, or None at the end."""
+        index = self._index + offset
+        return self._tokens[index] if index < len(self._tokens) else None
+
+    def _next(self):
+        """Consumes and returns the next token."""
+        token = self._peek()
+        if token is None:
+            self._error()
+        self._index += 1
+        return token
+
+    def _expect(self, token_type):
+        """Consumes the next token, which must be of the given type."""
+        token = self._peek()
+        if token is None or token.type != token_type.value:
+            self._error()
+        self._index += 1
+        return token
+
+    def _is_procedure(self, token):
+        return token.type.startswith(PROCEDURE_TOKEN_PREFIX)
+
+    def _starts_expression(self, token):
+        return token is not None and (token.type in EXPRESSION_START or self._is_procedure(token))
+
+    def _continues_expression(self, token):
+        return self._starts_expression(token) or (
+            token is not None and token.type in BINARY_OPERATIONS
+        )
+
+    def _error(self):
+        """Reports a syntax error at the next token and stops parsing."""
+        token = self._peek()
+        if token:
+            lexspan = (token.lexpos, token.lexpos)
+            self._logger.error_handler.add_error("parser_error", lexspan, prodval=token.value)
+        else:
+            lineno, lexpos, linestartpos = self._end_state
+            self._logger.error_handler.add_error(
+                "parser_error_with_no_lexspan", (-1, -1), row=lineno, column=lexpos - linestartpos
+            )
+        raise ParseError()
+
+    def _position(self, first):
+        """Returns the position of the tokens from first to the last consumed token."""
+        last = self._tokens[self._index - 1]
+        return Position.from_span(
+            (first.lineno, last.lineno), (first.lexpos, last.lexpos), first.lexer_state[2]
+        )
+
+    def _empty_position(self):
+        """Returns the position of an empty production. Like PLY, it is the lexer position
+        after the next token has been read."""
+        token = self._peek()
+        lineno, lexpos, linestartpos = token.lexer_state if token else self._end_state
+        return Position.from_span((lineno, lineno), (lexpos, lexpos), linestartpos)
+
+    # Statements.
+
+    def _parse_statement_list(self, terminator=None):
+        """Parses statements until the terminator token, or the end of the program."""
+        position = self._empty_position()
+        statements = []
+        token = self._peek()
+        while token is not None and token.type != terminator:
+            statements.append((yield self._parse_statement()))
+            token = self._peek()
+        return self.node_factory.create_node(
+            StatementList, children=statements, position=position
+        )
+
+    def _parse_statement(self):
+        """Returns the parser of the next statement."""
+        token = self._peek()
+        if token.type == TokenType.LPAREN.value:
+            return self._parse_paren_statement()
+        if self._is_procedure(token):
+            return self._parse_proc_call_arity(self._next())
+
+        parse_statement = self._statement_parsers.get(token.type)
+        if parse_statement is None:
+            self._error()
+        return parse_statement(self._next())
+
+    def _parse_paren_statement(self):
+        """Parses a command or procedure call in parantheses, e.g. (fd 10) or (f 1 2). A
+        procedure called in parantheses takes any number of arguments."""
+        first = self._next()
+        keyword = self._peek()
+        if keyword is None:
+            self._error()
+
+        if keyword.type == TokenType.SHOW.value:
+            self._next()
+            children = [(yield self._parse_expression())] + (yield self._parse_expressions())
+            node = self.node_factory.create_node(
+                Show, node_type=self.reserved_words[keyword.value], children=children
+            )
+        elif keyword.type == TokenType.IDENT.value or self._is_procedure(keyword):
+            self._next()
+            node = self.node_factory.create_node(
+                ProcCall, children=(yield self._parse_expressions()), leaf=keyword.value
+            )
+        elif keyword.type in (
+            TokenType.FD.value,
+            TokenType.BK.value,
+            TokenType.LT.value,
+            TokenType.RT.value,
+            TokenType.MAKE.value,
+            TokenType.BYE.value,
+            TokenType.IF.value,
+            TokenType.IFELSE.value,
+        ):
+            node = yield self._statement_parsers[keyword.type](self._next())
+        else:
+            self._error()
+
+        self._expect(TokenType.RPAREN)
+        node.position = self._position(first)
+        return node
+
+    def _parse_move(self, keyword):
+        "fd, bk, lt and rt"
+        argument = yield self._parse_expression()
+        return self.node_factory.create_node(
+            Move,
+            node_type=self.reserved_words[keyword.value],
+            children=[argument],
+            position=self._position(keyword),
+        )
+
+    def _parse_show(self, keyword):
+        argument = yield self._parse_expression()
+        return self.node_factory.create_node(
+            Show,
+            node_type=self.reserved_words[keyword.value],
+            children=[argument],
+            position=self._position(keyword),
+        )
+
+    def _parse_make(self, keyword):
+        name = yield self._parse_expression(argument_follows=True)
+        value = yield self._parse_expression()
+        return self.node_factory.create_node(
+            Make, children=[value], leaf=name, position=self._position(keyword)
+        )
+
+    def _parse_bye(self, keyword):
+        return self.node_factory.create_node(
+            Bye, node_type=self.reserved_words[keyword.value], position=self._position(keyword)
+        )
+
+    def _parse_output(self, keyword):
+        value = yield self._parse_expression()
+        return self.node_factory.create_node(
+            Output, children=[value], position=self._position(keyword)
+        )
+
+    def _parse_condition(self):
+        """Parses the condition of if and ifelse. Like in the PLY parser, braces followed
+        by a token that can start an expression enclose the condition, other braces are
+        a function used as the condition."""
+        token = self._peek()
+        if token is None:
+            self._error()
+        if token.type == TokenType.LBRACE.value and self._starts_expression(self._peek(1)):
+            self._next()
+            condition = yield self._parse_expression()
+            self._expect(TokenType.RBRACE)
+            return condition
+        return (yield self._parse_expression())
+
+    def _parse_if(self, keyword):
+        condition = yield self._parse_condition()
+        body = yield self._parse_unknown_function()
+        return self.node_factory.create_node(
+            If, children=body.children, leaf=condition, position=self._position(keyword)
+        )
+
+    def _parse_ifelse(self, keyword):
+        condition = yield self._parse_condition()
+        if_body = yield self._parse_unknown_function()
+        else_body = yield self._parse_unknown_function()
+        return self.node_factory.create_node(
+            IfElse,
+            children=[if_body.children[0], else_body.children[0]],
+            leaf=condition,
+            position=self._position(keyword),
+        )
+
+    def _parse_proc_decl(self, keyword):
+        name = self._expect(TokenType.IDENT)
+        proc_args = self.node_factory.create_node(
+            ProcArgs, children=[], position=self._empty_position()
+        )
+        line, _ = proc_args.position.get_pos()
+        start, _ = proc_args.position.get_lexspan()
+        while self._peek() is not None and self._peek().type == TokenType.DEREF.value:
+            argument = self._next()
+            # The arguments span from the start of the argument list, as in the PLY parser.
+            position = Position.from_span(
+                (line, argument.lineno), (start, argument.lexpos), argument.lexer_state[2]
+            )
+            proc_args.children.append(
+                self.node_factory.create_node(ProcArg, leaf=argument.value[1:], position=position)
+            )
+        body = yield self._parse_statement_list(TokenType.END.value)
+        self._expect(TokenType.END)
+        return self.node_factory.create_node(
+            ProcDecl,
+            children=[proc_args, body],
+            leaf=name.value,
+            position=self._position(keyword),
+        )
+
+    def _parse_unknown_function(self):
+        first = self._expect(TokenType.LBRACE)
+        statement_list = yield self._parse_statement_list(TokenType.RBRACE.value)
+        self._expect(TokenType.RBRACE)
+        return self.node_factory.create_node(
+            UnknownFunction,
+            children=[statement_list],
+            position=self._position(first),
+        )
+
+    # Procedure calls, also used as expressions.
+
+    def _parse_proc_call_arity(self, name):
+        """Parses a call without parantheses, which takes as many arguments as the
+        procedure has parameters."""
+        arity = self._procedure_arities[name.value]
+        arguments = []
+        for index in range(arity):
+            arguments.append((yield self._parse_expression(argument_follows=index < arity - 1)))
+        return self.node_factory.create_node(
+            ProcCall, children=arguments, leaf=name.value, position=self._position(name)
+        )
+
+    def _parse_for(self, keyword):
+        "for [iterator start limit step] {...}"
+        self._expect(TokenType.LBRACKET)
+        arguments = yield self._parse_expressions()
+        if not arguments:
+            self._error()
+        self._expect(TokenType.RBRACKET)
+        unknown_function = yield self._parse_unknown_function()
+        position = self._position(keyword)
+        variable_node = self.node_factory.create_node(
+            VariableNode, leaf=arguments[0], position=position
+        )
+        unknown_function.var_node = variable_node
+        return self.node_factory.create_node(
+            ProcCall,
+            children=[variable_node] + arguments[1:] + [unknown_function],
+            leaf="for",
+            position=position,
+        )
+
+    def _parse_repeat(self, keyword):
+        count = yield self._parse_expression(argument_follows=True)
+        body = yield self._parse_expression()
+        return self.node_factory.create_node(
+            ProcCall, children=[count, body], leaf="repeat", position=self._position(keyword)
+        )
+
+    # Expressions.
+
+    def _parse_expressions(self):
+        """Parses expressions as long as the next token can start one."""
+        expressions = []
+        while self._starts_expression(self._peek()):
+            expressions.append((yield self._parse_expression()))
+        return expressions
+
+    def _parse_expression(self, rule_precedence=DEFAULT_PRECEDENCE, argument_follows=False):
+        """Parses an expression. rule_precedence is the precedence of the operation whose
+        right operand the expression is. Like PLY, an operator is shifted into the operand
+        if it binds tighter than the operation, and otherwise left to the operation.
+
+        argument_follows tells that the expression is an argument followed by another one,
+        e.g. the name in make "a -1. A minus is then a subtraction, unless the token after
+        its operand can neither continue nor start an expression. In that case the minus
+        and its operand are the next argument, which is kept as the pending operand."""
+        if self._pending_operand is not None:
+            first, left = self._pending_operand
+            self._pending_operand = None
+        else:
+            first = self._peek()
+            if first is not None and first.type in ATOMS:
+                left = self._parse_atom(self._next())
+            else:
+                left = yield self._parse_primary()
+
+        while True:
+            operator = self._peek()
+            if operator is None or operator.type not in BINARY_OPERATIONS:
+                return left
+
+            operator_precedence = PRECEDENCE.get(operator.type, DEFAULT_PRECEDENCE)
+            rule_associativity, rule_level = rule_precedence
+            level = operator_precedence[1]
+            if level < rule_level or (level == rule_level and rule_associativity == "left"):
+                return left
+            if level == rule_level and rule_associativity == "nonassoc":
+                self._error()
+
+            self._next()
+            right = yield self._parse_expression(operator_precedence)
+            if (
+                argument_follows
+                and operator.type == TokenType.MINUS.value
+                and not self._continues_expression(self._peek())
+            ):
+                self._pending_operand = (
+                    operator,
+                    self.node_factory.create_node(
+                        UnaryOp, children=[right], leaf="-", position=self._position(operator)
+                    ),
+                )
+                return left
+            left = self.node_factory.create_node(
+                BINARY_OPERATIONS[operator.type],
+                children=[left, right],
+                leaf=operator.value,
+                position=self._position(first),
+            )
+
+    def _parse_primary(self):
+        """Parses an expression that is not an atom: a procedure call, a block, an
+        expression in parantheses, a for or repeat loop, or a negation."""
+        token = self._peek()
+        if token is None:
+            self._error()
+        token_type = token.type
+
+        if self._is_procedure(token):
+            return (yield self._parse_proc_call_arity(self._next()))
+        if token_type == TokenType.LBRACE.value:
+            return (yield self._parse_unknown_function())
+        if token_type == TokenType.LPAREN.value:
+            return (yield self._parse_paren_expression())
+        if token_type == TokenType.FOR.value:
+            return (yield self._parse_for(self._next()))
+        if token_type == TokenType.REPEAT.value:
+            return (yield self._parse_repeat(self._next()))
+        if token_type != TokenType.MINUS.value:
+            self._error()
+
+        self._next()
+        operand = yield self._parse_expression(PRECEDENCE["UMINUS"])
+        return self.node_factory.create_node(
+            UnaryOp, children=[operand], leaf="-", position=self._position(token)
+        )
+
+    def _parse_atom(self, token):
+        """Returns the node of a number, boolean, variable or string token."""
+        token_type = token.type
+        if token_type in (TokenType.NUMBER.value, TokenType.FLOAT.value):
+            node_class, leaf = Float, token.value
+        elif token_type in (TokenType.TRUE.value, TokenType.FALSE.value):
+            node_class, leaf = Bool, self.reserved_words[token.value]
+        elif token_type == TokenType.DEREF.value:
+            node_class, leaf = Deref, token.value[1:]
+        else:
+            node_class, leaf = StringLiteral, token.value[1:]
+        return self.node_factory.create_node(
+            node_class, leaf=leaf, position=self._position(token)
+        )
+
+    def _parse_paren_expression(self):
+        """Parses an expression in parantheses, or a call (name arguments...) to a
+        procedure that is not declared in the program."""
+        first = self._next()
+        if self._peek() is not None and self._peek().type == TokenType.IDENT.value:
+            name = self._next()
+            arguments = yield self._parse_expressions()
+            self._expect(TokenType.RPAREN)
+            return self.node_factory.create_node(
+                ProcCall, children=arguments, leaf=name.value, position=self._position(first)
+            )
+
+        expression = yield self._parse_expression()
+        self._expect(TokenType.RPAREN)
+        return expression
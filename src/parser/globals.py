@@ -1,12 +1,6 @@
 # pylint: disable=invalid-name, too-few-public-methods
 """Parsing rules and globals used by the parser"""
 
-from lexer.lexer import Lexer
-from code_generator.code_generator import JavaCodeGenerator
-from utils.logger import Logger
-from entities.symbol_tables import SymbolTables
-from entities.ast.node import NodeFactory
-
 precedence = (
     ("nonassoc", "EQUALS", "LESSTHAN", "GREATERTHAN", "LTEQUALS", "GTEQUALS"),
     ("left", "PLUS", "MINUS"),
@@ -15,60 +9,52 @@ precedence = (
 )
 
 
-names = {}
-
 start = "start"
 
 
 class Position:
-    "Stores position data for a production symbol."
-
-    def __init__(self, prod):
-        self._linespan = prod.linespan(0)
-        self._lexspan = prod.lexspan(0)
-        self._linestartpos = shared.ply_lexer.linestartpos
+    """Stores position data for a production symbol. The line span, the lexer span and the
+    start of the line are packed into one tuple, since every AST node holds a position."""
+
+    __slots__ = ("_span",)
+
+    def __init__(self, prod=None):
+        # (first line, last line, first lexpos, last lexpos, linestartpos)
+        self._span = (0, 0, 0, 0, 0)
+        if prod is not None:
+            self._span = prod.linespan(0) + prod.lexspan(0) + (prod.lexer.linestartpos,)
+
+    @classmethod
+    def from_span(cls, linespan, lexspan, linestartpos):
+        "Creates a position from spans computed without a PLY production."
+        position = cls()
+        position._span = linespan + lexspan + (linestartpos,)
+        return position
+
+    def shift(self, chars, lines, move_line_start):
+        """Moves the position by chars characters and lines lines, after an edit before it.
+        move_line_start is a function that returns the new start of a line from the old."""
+        first_line, last_line, first_pos, last_pos, linestartpos = self._span
+        self._span = (
+            first_line + lines,
+            last_line + lines,
+            first_pos + chars,
+            last_pos + chars,
+            move_line_start(linestartpos),
+        )
 
     def get_pos(self):
         "Returns a tuple (linepos, colpos)."
-        line = self._linespan[0]
-        col = self._lexspan[0] - self._linestartpos
+        line = self._span[0]
+        col = self._span[2] - self._span[4]
 
         return (line, col)
 
     def get_lexspan(self):
-        return self._lexspan
-
-
-class Shared:
-    """Wrapper class for exposing the lexer, console_io,
-    symbol tables, error_handler to parser functions."""
-
-    def __init__(self) -> None:
-        self.reserved_words = {}
-        self.ply_lexer = None
-        self.current_lexer = None
-        self.logger = None
-        self.symbol_tables = None
-        self.node_factory = None
-        self.code_generator = None
-
-    def update(
-        self,
-        current_lexer: Lexer,
-        logger: Logger,
-        symbol_tables: SymbolTables,
-        code_generator: JavaCodeGenerator,
-    ):
-        """Update parser-wide shared fields"""
-        self.current_lexer = current_lexer
-        self.ply_lexer = current_lexer.get_ply_lexer()
-        self.reserved_words = current_lexer.reserved_words
-        self.logger = logger
-        self.symbol_tables = symbol_tables
-        self.code_generator = code_generator
-        self.node_factory = NodeFactory(
-            current_lexer, self.logger, self.symbol_tables, self.code_generator
-        )
+        return self._span[2:4]
 
+    def get_linespan(self):
+        return self._span[0:2]
 
-shared = Shared()
+    def get_linestartpos(self):
+        return self._span[4]
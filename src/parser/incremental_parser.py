@@ -0,0 +1,208 @@
+"""Incremental parsing for editor sessions. After an edit, only the top-level statements
+around the edit are lexed and parsed again, and spliced into the previous AST. The other
+statements are reused, with their positions moved by the length of the edit."""
+
+from bisect import bisect_right
+from parser.globals import Position
+from entities.ast.functions import ProcDecl
+from entities.ast.node import Node
+from lexer.lexer import Lexer
+from utils.logger import default_logger
+
+
+def walk(node):
+    """Yields the nodes of the subtree of node, including the nodes held as leaves like
+    the conditions of If and IfElse."""
+    stack = [node]
+    while stack:
+        node = stack.pop()
+        yield node
+        stack.extend(reversed(node.children))
+        if isinstance(node.leaf, Node):
+            stack.append(node.leaf)
+
+
+def procedure_declarations(statements):
+    """Returns the name and parameter count of each procedure declared in statements."""
+    return [
+        (node.leaf, len(node.children[0].children))
+        for statement in statements
+        for node in walk(statement)
+        if isinstance(node, ProcDecl)
+    ]
+
+
+class IncrementalParser:
+    """Keeps the code and the AST of the last parse, so that an edit of the code can be
+    parsed by parsing only the top-level statements it touches. The statements next to
+    them are parsed again too, and must keep their spans, which shows that the edit did not
+    change where the untouched statements begin and end. Edits that change the procedure
+    declarations, and code with lexer or syntax errors, are parsed in full."""
+
+    def __init__(self, parser, current_lexer: Lexer, logger=default_logger):
+        self._parser = parser
+        self._current_lexer = current_lexer
+        self._logger = logger
+        self.code = ""
+        self.start_node = None
+        self.tokens = None
+        # Procedures of the last parse, None if its AST can't be reused.
+        self._procedure_arities = None
+
+    def invalidate(self):
+        """Parses the next edit in full, e.g. after the AST has been changed in place."""
+        self._procedure_arities = None
+
+    def set_code(self, code):
+        """Sets the code without parsing it, e.g. when it was compiled earlier. The next
+        edit is parsed in full."""
+        self.code = code
+        self.start_node = None
+        self.tokens = None
+        self._procedure_arities = None
+
+    def parse(self, code):
+        """Parses the whole code. Returns the AST like Parser.parse()."""
+        error_count = self._logger.error_handler.get_error_count()
+        self.tokens = self._tokenize(code)
+        start_node = self._parser.parse(code, tokens=self.tokens)
+
+        self.code = code
+        self.start_node = start_node
+        self._procedure_arities = None
+        if start_node and self._logger.error_handler.get_error_count() == error_count:
+            self._procedure_arities = self._parser.get_procedure_arities()
+        return start_node
+
+    def _tokenize(self, code, *region):
+        """Tokenizes the code, or the region of it, in the lex phase of the profiler."""
+        profiler = self._logger.profiler
+        with profiler.phase("lex"):
+            tokens = self._current_lexer.tokenize(code, *region)
+        profiler.count("tokens", len(tokens))
+        return tokens
+
+    def reparse(self, start, end, text):
+        """Replaces code[start:end] of the last parsed code with text, and returns the AST
+        of the new code. The nodes of the statements that are not parsed again are reused,
+        with their positions moved and their type analysis reset."""
+        code = self.code[:start] + text + self.code[end:]
+        if self._procedure_arities is not None and self._splice(code, start, end, text):
+            self.code = code
+            self.tokens = None
+            return self.start_node
+        return self.parse(code)
+
+    def _splice(self, code, start, end, text):
+        """Parses the top-level statements around the edit and splices them into the last
+        AST. Returns False if the edit must be parsed in full."""
+        statement_list = self.start_node.children[0]
+        statements = statement_list.children
+        starts = [statement.position.get_lexspan()[0] for statement in statements]
+
+        # The statements that the edit can touch, and an untouched one on both sides.
+        first = max(bisect_right(starts, start) - 2, 0)
+        last = min(bisect_right(starts, end), len(statements) - 1)
+        if first == 0 and last == len(statements) - 1:
+            return False
+
+        chars = len(text) - (end - start)
+        lines = text.count("\n") - self.code.count("\n", start, end)
+        region_start = starts[first] if first > 0 else 0
+        region_end = starts[last + 1] + chars if last + 1 < len(statements) else len(code)
+        lineno = statements[first].position.get_linespan()[0] if first > 0 else 1
+        linestartpos = Lexer.get_linestartpos(code, region_start)
+
+        error_handler = self._logger.error_handler
+        error_count = error_handler.get_error_count()
+        tokens = self._tokenize(code, region_start, region_end, lineno, linestartpos)
+        arities = self._procedure_arities
+        region_node = self._parser.parse(code, tokens=tokens, procedure_arities=arities)
+        if not region_node or error_handler.get_error_count() != error_count:
+            error_handler.discard_errors(error_count)
+            return False
+
+        region_list = region_node.children[0]
+        new_statements = region_list.children
+        old_statements = statements[first : last + 1]
+        if (
+            not new_statements
+            or (first > 0 and not self._same_span(new_statements[0], old_statements[0], 0))
+            or (
+                last + 1 < len(statements)
+                and not self._same_span(new_statements[-1], old_statements[-1], chars)
+            )
+            or procedure_declarations(new_statements) != procedure_declarations(old_statements)
+        ):
+            return False
+
+        for statement in statements[:first]:
+            for node in walk(statement):
+                node.reset_analysis()
+        move_line_start = self._line_start_mover(code, end, chars)
+        # Nodes can share a position object, which is moved only once.
+        shifted = set()
+        for statement in statements[last + 1 :]:
+            for node in walk(statement):
+                node.reset_analysis()
+                if node.position and id(node.position) not in shifted:
+                    shifted.add(id(node.position))
+                    node.position.shift(chars, lines, move_line_start)
+
+        # The position of the list is the one its first, empty, production got.
+        shared_position = self.start_node.position is statement_list.position
+        if first == 0:
+            statement_list.position = region_list.position
+        if shared_position:
+            self.start_node.position = statement_list.position
+        else:
+            start_position = region_node.position if first == 0 else self.start_node.position
+            end_position = region_node.position
+            if last + 1 < len(statements):
+                end_position = self._copy_position(self.start_node.position)
+                end_position.shift(chars, lines, move_line_start)
+            self.start_node.position = Position.from_span(
+                (start_position.get_linespan()[0], end_position.get_linespan()[1]),
+                (start_position.get_lexspan()[0], end_position.get_lexspan()[1]),
+                end_position.get_linestartpos(),
+            )
+        statements[first : last + 1] = new_statements
+        return True
+
+    @staticmethod
+    def _same_span(new_statement, old_statement, chars):
+        old_start, old_end = old_statement.position.get_lexspan()
+        return new_statement.position.get_lexspan() == (old_start + chars, old_end + chars)
+
+    def _line_start_mover(self, code, end, chars):
+        """Returns a function that moves a line start of the last code to the new code,
+        after an edit that ended at end. The starts of the line where the edit ends and of
+        the next line are found from the new code, since a comment typed in the edit may
+        now include the carriage return before the next line."""
+        next_newline = self.code.find("\n", end)
+        if next_newline < 0:
+            next_newline = len(self.code)
+        edit_line_start = self._find_line_start(code, end + chars)
+        next_line_start = self._find_line_start(code, next_newline + chars)
+
+        def move_line_start(line_start):
+            if line_start - 1 > next_newline:
+                return line_start + chars
+            if line_start - 1 > end:
+                return next_line_start
+            return edit_line_start
+
+        return move_line_start
+
+    @staticmethod
+    def _find_line_start(code, lexpos):
+        """Returns the linestartpos of the lexer after the newlines at lexpos."""
+        while lexpos < len(code) and code[lexpos] in "\r\n":
+            lexpos += 1
+        return Lexer.get_linestartpos(code, lexpos)
+
+    @staticmethod
+    def _copy_position(position):
+        return Position.from_span(
+            position.get_linespan(), position.get_lexspan(), position.get_linestartpos()
+        )
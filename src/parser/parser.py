@@ -9,7 +9,7 @@ start
     : statement_list
 
 statement_list
-    : statement statement_list
+    : statement_list statement
     | empty
 
 statement
@@ -32,7 +32,7 @@ command
     | ifelse
 
 expressions
-    : expression expressions
+    : expressions expression
     | empty
 
 expression
@@ -57,7 +57,9 @@ expression
     | MINUS expression %prec UMINUS
 
 proc_call
-    : IDENT expressions
+    : LPAREN IDENT expressions RPAREN
+    | PROC_ARITY_n expression * n
+    | LPAREN PROC_ARITY_n expressions RPAREN
     | FOR LBRACKET expressions RBRACKET unknown_function
     | REPEAT expression unknown_function
 
@@ -78,70 +80,105 @@ list
 
 
 from parser.globals import *
-from parser.command import *
-from parser.expression import *
+from parser.command import CommandRules
+from parser.expression import ExpressionRules
 from parser.preparser import Preparser
-from ply import yacc
+from parser.table_cache import default_table_cache
 from lexer.lexer import Lexer
 from code_generator.code_generator import default_code_generator
 from utils.logger import default_logger
 from entities.symbol_tables import default_symbol_tables
 
 from entities.ast.node import *
-from entities.ast.conditionals import *
-from entities.ast.functions import *
-from entities.ast.logocommands import *
-from entities.ast.operations import *
 from entities.ast.statementlist import *
-from entities.ast.variables import *
 from entities.ast.unknown_function import *
 
 
-def p_start(prod):
-    "start : statement_list"
-    prod[0] = shared.node_factory.create_node(Start, children=[prod[1]], position=Position(prod))
+class Grammar(CommandRules, ExpressionRules):
+    """PLY grammar owned by a single Parser. The grammar rules are methods, so they reach
+    the lexer, logger and node factory of their own Parser instead of module globals.
+    Procedure call rules created by the preparser are kept per instance as well."""
 
+    precedence = precedence
+    start = start
 
-def p_statement_list(prod):
-    "statement_list : statement statement_list"
-    prod[0] = shared.node_factory.create_node(
-        StatementList, children=[prod[1]] + prod[2].children, position=Position(prod)
-    )
-
-
-def p_statement_list_empty(prod):
-    "statement_list : empty"
-    prod[0] = shared.node_factory.create_node(StatementList, position=Position(prod))
-
-
-def p_unknown_function_statement_list(prod):
-    "unknown_function : LBRACE statement_list RBRACE"
-    prod[0] = shared.node_factory.create_node(
-        UnknownFunction, children=[prod[2]], arg_type=LogoType.VOID, position=Position(prod)
-    )
+    def __init__(
+        self,
+        current_lexer: Lexer,
+        logger=default_logger,
+        symbol_tables=default_symbol_tables,
+        code_generator=default_code_generator,
+    ):
+        self.current_lexer = current_lexer
+        self.tokens = current_lexer.get_tokens()
+        self.reserved_words = current_lexer.reserved_words
+        self.logger = logger
+        self.node_factory = NodeFactory(logger, symbol_tables, code_generator)
+        self._preparser_rules = {}
+        self.token_buffer = None
+
+    def set_preparser_rules(self, rules):
+        """Replaces the procedure call rules created by the preparser."""
+        self._preparser_rules = dict(rules)
+
+    def get_pdict(self):
+        """Returns the grammar as a dict for PLY, with the rules bound to this instance."""
+        pdict = {
+            name: getattr(self, name)
+            for name in dir(self)
+            if name.startswith("p_") or name in ("tokens", "precedence", "start", "__module__")
+        }
+        pdict.update(self._preparser_rules)
+        return pdict
+
+    def p_start(self, prod):
+        "start : statement_list"
+        prod[0] = self.node_factory.create_node(
+            Start, children=[prod[1]], position=Position(prod)
+        )
 
+    def p_statement_list(self, prod):
+        "statement_list : statement_list statement"
+        # Left recursive, so the list is built with appends and the parser stack stays
+        # shallow however many statements there are.
+        prod[1].children.append(prod[2])
+        prod[0] = prod[1]
+
+    def p_statement_list_empty(self, prod):
+        "statement_list : empty"
+        prod[0] = self.node_factory.create_node(
+            StatementList, children=[], position=Position(prod)
+        )
 
-def p_empty(prod):
-    "empty :"
+    def p_unknown_function_statement_list(self, prod):
+        "unknown_function : LBRACE statement_list RBRACE"
+        prod[0] = self.node_factory.create_node(
+            UnknownFunction, children=[prod[2]], position=Position(prod)
+        )
 
+    def p_empty(self, prod):
+        "empty :"
 
-# pylint: disable-next=missing-function-docstring
-def p_error(prod):
-    if prod:
-        lexspan = (prod.lexpos, prod.lexpos)
-        shared.logger.error_handler.add_error("parser_error", lexspan, prodval=prod.value)
-    else:
-        lineno = shared.ply_lexer.lineno
-        colpos = shared.ply_lexer.lexpos - shared.ply_lexer.linestartpos
+    # pylint: disable-next=missing-function-docstring
+    def p_error(self, prod):
+        if prod:
+            lexspan = (prod.lexpos, prod.lexpos)
+            self.logger.error_handler.add_error("parser_error", lexspan, prodval=prod.value)
+        else:
+            token_buffer = self.token_buffer
+            lineno = token_buffer.lineno
+            colpos = token_buffer.lexpos - token_buffer.linestartpos
 
-        lexspan = (-1, -1)
-        shared.logger.error_handler.add_error(
-            "parser_error_with_no_lexspan", lexspan, row=lineno, column=colpos
-        )
+            lexspan = (-1, -1)
+            self.logger.error_handler.add_error(
+                "parser_error_with_no_lexspan", lexspan, row=lineno, column=colpos
+            )
 
 
 class Parser:
-    """Wrapper class for parser functionality. Used to transform source code into AST."""
+    """Wrapper class for parser functionality. Used to transform source code into AST.
+    Each Parser owns its grammar and PLY parser, so separate instances can be used
+    side by side, e.g. from different threads."""
 
     def __init__(
         self,
@@ -149,63 +186,79 @@ class Parser:
         logger=default_logger,
         symbol_tables=default_symbol_tables,
         code_generator=default_code_generator,
+        table_cache=default_table_cache,
     ):
         self._current_lexer = current_lexer
-        shared.update(current_lexer, logger, symbol_tables, code_generator)
-        self._preparser = Preparser(current_lexer, shared.node_factory, logger)
-        globals()["tokens"] = current_lexer.get_tokens()
+        self._grammar = Grammar(current_lexer, logger, symbol_tables, code_generator)
+        self._preparser = Preparser(current_lexer, self._grammar.node_factory, logger)
         self._parser = None
+        self._grammar_rule_names = frozenset()
         self._logger = logger
+        self._table_cache = table_cache
 
     def reset(self):
         "Resets the parser internals."
 
         # Initialize grammar to only contain non-preparser rules.
-        preparser_rules = []
+        self._grammar.set_preparser_rules({})
 
-        for item in globals():
-            if "p_preparser_" in item:
-                preparser_rules.append(item)
-
-        for rule in preparser_rules:
-            globals().pop(rule)
-
-        globals()["tokens"] = self._current_lexer.get_tokens()
-
-    def _build(self, code, **kwargs):
+    def _build(self, tokens, procedure_arities=None, **kwargs):
         """Preparses the logo program for function declarations and builds the PLY parser.
-        Clears previously added rules. Passes arguments to PLY's yacc.yacc()."""
+        Clears previously added rules. Programs that only call procedures with base grammar
+        arities reuse the previously built parser. Otherwise the LALR tables are taken from
+        the table cache, when a program with the same grammar has been parsed before.
+        Passes arguments to PLY's yacc.yacc()."""
 
         self.reset()
         self._current_lexer.reset()
         self._preparser.reset()
 
-        for function_name, function in self._preparser.export_grammar_rules(code).items():
+        profiler = self._logger.profiler
+        with profiler.phase("preparse"):
+            grammar_rules = self._preparser.export_grammar_rules(tokens.tokens, procedure_arities)
+        profiler.count("grammar rules added", len(grammar_rules))
+        for function_name in grammar_rules:
             self._logger.debug(f"Preparser procedure call grammar rule added: {function_name}")
-            globals()[function_name] = function
+        self._grammar.set_preparser_rules(grammar_rules)
 
-        self._parser = yacc.yacc(**kwargs)
+        grammar_rule_names = frozenset(grammar_rules)
+        if self._parser is None or kwargs or grammar_rule_names != self._grammar_rule_names:
+            with profiler.phase("table build"):
+                self._parser = self._table_cache.build_parser(self._grammar.get_pdict(), **kwargs)
+            self._grammar_rule_names = grammar_rule_names
 
-    def parse(self, code, **kwargs):
+    def parse(self, code, tokens=None, procedure_arities=None, **kwargs):
         """Builds the PLY parser and runs it on given code and parser arguments.
 
         Args:
             code (str): Logo source code.
+            tokens (lexer.token_buffer.TokenBuffer): The code already tokenized with
+                Lexer.tokenize(). The code is tokenized here if not given.
+            procedure_arities (dict): Parameter counts of the procedures by name, when the
+                tokens are only a part of the program. Found from the tokens if not given.
 
         Returns:
             start_node (parser.ast.Start): AST
         """
 
+        token_buffer = tokens if tokens is not None else self._current_lexer.tokenize(code)
+
         # Build the PLY parser with the added function tokens.
-        self._build(code, **kwargs)
+        self._build(token_buffer, procedure_arities, **kwargs)
 
         ply_parser = self.get_ply_parser()
-        ply_lexer = self._current_lexer.get_ply_lexer()
+        token_buffer.rewind()
+        self._grammar.token_buffer = token_buffer
 
-        start_node = ply_parser.parse(code, lexer=ply_lexer, tracking=True, **kwargs)
+        with self._logger.profiler.phase("parse"):
+            start_node = ply_parser.parse(lexer=token_buffer, tracking=True, **kwargs)
 
         return start_node
 
+    def get_procedure_arities(self):
+        """Returns the parameter counts of the procedures of the last parse by name."""
+        return self._preparser.get_procedure_arities()
+
     def get_ply_parser(self, **kwargs):
         """Returns the built PLY parser."""
         return self._parser
@@ -1,16 +1,33 @@
 """Module for handling pre-parsing of the logo code. During pre-parsing we go through
-the program code and find TO-function declarations and create grammar rule functions
-from them. These are later added to the parser grammar, so that the user can call
-procedures without parantheses."""
+the program code and find TO-function declarations. Each procedure is tokenized as
+PROC_ARITY_<n>, where n is its parameter count, so that the user can call procedures
+without parantheses. Call rules for the common arities are part of the base grammar,
+grammar rule functions are only created for procedures with more parameters."""
 
 from parser.globals import Position
 from lexer.lexer import Lexer
-from lexer.token_types import TokenType
+from lexer.token_types import TokenType, MAX_BASE_PROCEDURE_ARITY, procedure_token
 from entities.ast.functions import ProcCall
 from entities.ast.node import NodeFactory
 from utils.logger import default_logger
 
 
+def procedure_call_rule(arities):
+    """Returns the grammar rule for calling procedures of the given arities without
+    parantheses, e.g. 'proc_call : PROC_ARITY_1 expression'."""
+    alternatives = [
+        " ".join([procedure_token(arity)] + ["expression"] * arity) for arity in arities
+    ]
+    return "proc_call : " + "\n    | ".join(alternatives)
+
+
+def procedure_call_paren_rule(arities):
+    """Returns the grammar rule for calling procedures of the given arities with
+    parantheses, e.g. 'proc_call : LPAREN PROC_ARITY_1 expressions RPAREN'."""
+    alternatives = [f"LPAREN {procedure_token(arity)} expressions RPAREN" for arity in arities]
+    return "proc_call : " + "\n    | ".join(alternatives)
+
+
 class Preparser:
     """Preparser is used to create new grammar rules from the program code, to allow
     the user to call procedures without parantheses."""
@@ -20,57 +37,112 @@ class Preparser:
         self._logger = logger
         self._node_factory = node_factory
         self._grammar_rules = {}
+        self._procedure_arities = {}
 
     def reset(self):
         self._grammar_rules = {}
+        self._procedure_arities = {}
 
-    def export_grammar_rules(self, code):
-        """Create and export procedure call grammar rules as a dict with the parse function
-        name as key, and the parse function as value. Function names are added to the lexer
-        tokens list."""
+    def get_procedure_arities(self):
+        """Returns a dict of procedure name, parameter count pairs of the registered
+        procedures."""
+        return dict(self._procedure_arities)
 
-        tokens = self._lexer.tokenize_input(code)
-        to_indices = [
-            index for index, token in enumerate(tokens) if token.type == TokenType.TO.value
-        ]
+    def register_procedures(self, tokens, procedure_arities=None):
+        """Find the TO-declarations in tokens and add the procedure names to the lexer as
+        procedure tokens. The calls in the tokens are retagged with the procedure tokens.
+        Returns a dict of procedure name, parameter count pairs.
 
-        for index in to_indices:
-            self._create_procedure_rules(index, tokens)
+        If the tokens are only a part of the program, the procedures of the whole program
+        can be given as procedure_arities, which are then registered instead."""
+
+        if procedure_arities is not None:
+            for procedure_name, procedure_param_count in procedure_arities.items():
+                self._add_procedure(procedure_name, procedure_param_count)
+        else:
+            to_indices = [
+                index for index, token in enumerate(tokens) if token.type == TokenType.TO.value
+            ]
+            for index in to_indices:
+                self._register_procedure(index, tokens)
+
+        self._retag_procedure_calls(tokens)
+
+        return self._procedure_arities
+
+    def export_grammar_rules(self, tokens, procedure_arities=None):
+        """Create and export procedure call grammar rules as a dict with the parse function
+        name as key, and the parse function as value. The procedures are registered with
+        register_procedures(). Rules are only created for arities that are not part of the
+        base grammar."""
+
+        procedure_arities = self.register_procedures(tokens, procedure_arities)
+        for procedure_param_count in procedure_arities.values():
+            if (
+                procedure_param_count > MAX_BASE_PROCEDURE_ARITY
+                and f"p_preparser_arity{procedure_param_count}_call" not in self._grammar_rules
+            ):
+                self._create_procedure_rules(procedure_param_count)
 
         return self._grammar_rules
 
-    def _create_procedure_rules(self, index, tokens):
-        """Create the two rules for calling the procedure declared at index of the tokens list."""
+    def _retag_procedure_calls(self, tokens):
+        """Changes the type of the identifiers that name a user defined procedure to the
+        procedure's token, like the lexer does for the procedures it knows of. The name
+        following TO is left an identifier."""
+        procedure_tokens = self._lexer.get_procedure_tokens()
+        if not procedure_tokens:
+            return
+
+        word_types = {token_type.value for token_type in self._lexer.reserved_words.values()}
+        word_types.add(TokenType.IDENT.value)
+        expect_procedure_name = False
+
+        for token in tokens:
+            if token.type not in word_types:
+                continue
+            if (
+                token.type == TokenType.IDENT.value
+                and token.value in procedure_tokens
+                and not expect_procedure_name
+            ):
+                token.type = procedure_tokens[token.value]
+            expect_procedure_name = token.type == TokenType.TO.value
+
+    def _register_procedure(self, index, tokens):
+        """Map the procedure declared at index of the tokens list to its arity token."""
         procedure_name = self._get_procedure_name(index + 1, tokens)
         procedure_param_count = self._get_procedure_param_count(index + 2, tokens)
 
         if not procedure_name or procedure_name in self._lexer.get_procedure_tokens():
             return
 
-        procedure_count = len(self._grammar_rules)
-
-        mangled_name = self._get_new_procedure_name(procedure_count)
+        self._add_procedure(procedure_name, procedure_param_count)
 
-        p_proc_call = self._create_call_rule(mangled_name, procedure_param_count)
-        p_proc_call_paren = self._create_call_with_parantheses_rule(mangled_name)
-
-        # Add the 2 rules to the rules dict.
-        self._grammar_rules[f"p_preparser_proc{procedure_count}_call"] = p_proc_call
-        self._grammar_rules[f"p_preparser_proc{procedure_count}_call_paren"] = p_proc_call_paren
+    def _add_procedure(self, procedure_name, procedure_param_count):
+        """Map the procedure name to the token of its arity."""
+        token_name = procedure_token(procedure_param_count)
+        self._procedure_arities[procedure_name] = procedure_param_count
 
         # Add token to Lexer tokens list.
-        self._lexer.add_procedure_token(procedure_name, mangled_name)
+        self._lexer.add_procedure_token(procedure_name, token_name)
 
         self._logger.debug(
-            f"User defined procedure '{procedure_name}' found, internal token '{mangled_name}'"
+            f"User defined procedure '{procedure_name}' found, internal token '{token_name}'"
         )
 
-    def _get_new_procedure_name(self, procedure_count):
-        """Returns a new procedure token name to be used by the lexer/parser."""
-        mangled_name = f"PROC{procedure_count}"
-        return mangled_name
+    def _create_procedure_rules(self, procedure_param_count):
+        """Create the two call rules for procedures of the given arity."""
+        p_proc_call = self._create_call_rule(procedure_param_count)
+        p_proc_call_paren = self._create_call_with_parantheses_rule(procedure_param_count)
 
-    def _create_call_rule(self, procedure_name, procedure_param_count):
+        # Add the 2 rules to the rules dict.
+        self._grammar_rules[f"p_preparser_arity{procedure_param_count}_call"] = p_proc_call
+        self._grammar_rules[
+            f"p_preparser_arity{procedure_param_count}_call_paren"
+        ] = p_proc_call_paren
+
+    def _create_call_rule(self, procedure_param_count):
         "Create grammar rule for procedure call without parantheses. Returns a function."
 
         def p_proc_call(prod):
@@ -82,16 +154,14 @@ class Preparser:
             )
 
         # Define the grammar rule as a docstring.
-        p_proc_call.__doc__ = f"proc_call : {procedure_name} "
-        p_proc_call.__doc__ += " ".join(["expression"] * procedure_param_count)
+        p_proc_call.__doc__ = procedure_call_rule([procedure_param_count])
 
         return p_proc_call
 
-    def _create_call_with_parantheses_rule(self, procedure_name):
+    def _create_call_with_parantheses_rule(self, procedure_param_count):
         "Create grammar rule for procedure call with paratheses. Returns a function."
 
         def p_proc_call_paren(prod):
-            "proc_call : LPAREN IDENT expressions RPAREN"
             prod[0] = self._node_factory.create_node(
                 ProcCall,
                 children=prod[3],
@@ -99,7 +169,7 @@ class Preparser:
                 position=Position(prod),
             )
 
-        p_proc_call_paren.__doc__ = f"proc_call : LPAREN {procedure_name} expressions RPAREN"
+        p_proc_call_paren.__doc__ = procedure_call_paren_rule([procedure_param_count])
 
         return p_proc_call_paren
 
@@ -117,14 +187,10 @@ class Preparser:
 
     def _get_procedure_param_count(self, index, tokens):
         """Get the procedure param count with the param tokens starting at the given index."""
-        if index >= len(tokens):
-            return 0
-
-        param_count = 0
-
-        for token in tokens[index:]:
-            if token.type != TokenType.DEREF.value:
-                break
-            param_count += 1
+        end = index
+        # Walks the tokens in place, since a slice copies the rest of the program for
+        # each procedure.
+        while end < len(tokens) and tokens[end].type == TokenType.DEREF.value:
+            end += 1
 
-        return param_count
+        return end - index
@@ -0,0 +1,142 @@
+"""Cache for the LALR tables generated by PLY's yacc.
+
+Building the LALR automaton is the most expensive part of a compile. The tables only
+depend on the grammar (start symbol, precedence, tokens and productions), so they are
+stored in memory and on disk, keyed by a hash of the grammar signature. The preparser
+tokenizes user procedures by arity, so two programs with the same procedure arities
+share the same grammar and the same tables. The tables are shared, but each parser
+binds the rule callables of its own grammar."""
+
+import hashlib
+import os
+import pickle
+import threading
+from types import SimpleNamespace
+from ply import yacc
+
+# Bump this when the layout of the stored tables changes.
+TABLE_FORMAT_VERSION = "1"
+TABLE_CACHE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "tables")
+
+
+class CachedProduction:
+    """Minimal production used by PLY's LRParser, when the tables come from the cache."""
+
+    def __init__(self, name, length, func, string):
+        self.name = name
+        self.len = length
+        self.func = func
+        self.str = string
+        self.callable = None
+
+    def __str__(self):
+        return self.str
+
+    def bind(self, pdict):
+        """Bind the production function name to a callable."""
+        if self.func:
+            self.callable = pdict[self.func]
+
+
+class TableCache:
+    """Stores LALR tables in memory and in a directory, keyed by the grammar signature."""
+
+    def __init__(self, path=TABLE_CACHE_PATH, use_disk=True):
+        self._path = path
+        self._use_disk = use_disk
+        self._tables = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def clear(self):
+        """Clears the in-memory tables. Tables stored on disk are kept."""
+        with self._lock:
+            self._tables = {}
+            self.hits = 0
+            self.misses = 0
+
+    def build_parser(self, pdict, **kwargs):
+        """Returns a PLY LRParser for the grammar rules in pdict. The LALR tables are
+        generated with yacc.yacc() only if they are not found in the cache.
+        Passes kwargs to yacc.yacc()."""
+
+        key = self.get_grammar_key(pdict)
+
+        with self._lock:
+            tables = self._tables.get(key)
+            if tables is None:
+                tables = self._load(key)
+            if tables is None:
+                self.misses += 1
+                tables = self._generate(pdict, **kwargs)
+                self._store(key, tables)
+            else:
+                self.hits += 1
+            self._tables[key] = tables
+
+        return self._create_parser(pdict, tables)
+
+    @staticmethod
+    def get_grammar_key(pdict):
+        """Returns a hash of the grammar signature defined by the p_-functions, tokens,
+        precedence and start symbol in pdict."""
+        pinfo = yacc.ParserReflect(pdict, log=yacc.NullLogger())
+        pinfo.get_all()
+        if pinfo.error:
+            raise yacc.YaccError("Unable to build parser")
+
+        signature = TABLE_FORMAT_VERSION + pinfo.signature()
+        return hashlib.sha256(signature.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def _generate(pdict, **kwargs):
+        """Runs the LALR table generation and returns the tables in a picklable form."""
+        ply_parser = yacc.yacc(module=SimpleNamespace(**pdict), **kwargs)
+        productions = [
+            (production.name, production.len, production.func, production.str)
+            for production in ply_parser.productions
+        ]
+        return (productions, ply_parser.action, ply_parser.goto)
+
+    @staticmethod
+    def _create_parser(pdict, tables):
+        productions, action, goto = tables
+        lr_productions = [CachedProduction(*production) for production in productions]
+        for production in lr_productions:
+            production.bind(pdict)
+
+        lrtab = SimpleNamespace(lr_productions=lr_productions, lr_action=action, lr_goto=goto)
+        return yacc.LRParser(lrtab, pdict.get("p_error"))
+
+    def _get_table_path(self, key):
+        return os.path.join(self._path, key + ".pickle")
+
+    def _load(self, key):
+        if not self._use_disk:
+            return None
+
+        try:
+            with open(self._get_table_path(key), "rb") as file:
+                return pickle.load(file)
+        except (OSError, pickle.PickleError, EOFError):
+            return None
+
+    def _store(self, key, tables):
+        if not self._use_disk:
+            return
+
+        path = self._get_table_path(key)
+        temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            os.makedirs(self._path, exist_ok=True)
+            with open(temp_path, "wb") as file:
+                pickle.dump(tables, file, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temp_path, path)
+        except OSError:
+            # The disk cache is only an optimization, the in-memory tables still work.
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+
+
+default_table_cache = TableCache()
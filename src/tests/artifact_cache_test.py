@@ -0,0 +1,47 @@
+import unittest
+from compiler.artifact_cache import ArtifactCache, CompileArtifacts
+
+
+class TestArtifactCache(unittest.TestCase):
+    """Test class for the cache of compilation outputs"""
+
+    def setUp(self):
+        self.cache = ArtifactCache(maxsize=2)
+        self.artifacts = CompileArtifacts("class Logo {}", ())
+
+    def test_stored_artifacts_are_found(self):
+        self.assertIsNone(self.cache.get("a"))
+        self.cache.put("a", self.artifacts)
+        self.assertIs(self.cache.get("a"), self.artifacts)
+        self.assertEqual((self.cache.hits, self.cache.misses), (1, 1))
+
+    def test_least_recently_used_artifacts_are_evicted(self):
+        self.cache.put("a", self.artifacts)
+        self.cache.put("b", self.artifacts)
+        self.cache.get("a")
+        self.cache.put("c", self.artifacts)
+
+        self.assertIsNone(self.cache.get("b"))
+        self.assertIsNotNone(self.cache.get("a"))
+        self.assertIsNotNone(self.cache.get("c"))
+        self.assertEqual(self.cache.get_stats()["evictions"], 1)
+        self.assertEqual(self.cache.get_stats()["size"], 2)
+
+    def test_artifacts_with_large_code_are_not_stored(self):
+        cache = ArtifactCache(maxsize=2, max_code_size=len("class Logo {}") - 1)
+        cache.put("a", self.artifacts)
+        cache.put("b", CompileArtifacts(None, ()))
+        self.assertIsNone(cache.get("a"))
+        self.assertIsNotNone(cache.get("b"))
+
+    def test_key_depends_on_code_and_settings(self):
+        robot_config = {"wheelDiameter": "5.6"}
+        key = ArtifactCache.get_key("fd 1", language="fin", robot_config=robot_config)
+        same_key = ArtifactCache.get_key("fd 1", robot_config=robot_config, language="fin")
+        other_keys = [
+            ArtifactCache.get_key("fd 2", language="fin", robot_config=robot_config),
+            ArtifactCache.get_key("fd 1", language="eng", robot_config=robot_config),
+            ArtifactCache.get_key("fd 1", language="fin", robot_config={"wheelDiameter": "4"}),
+        ]
+        self.assertEqual(key, same_key)
+        self.assertNotIn(key, other_keys)
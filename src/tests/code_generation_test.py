@@ -1,4 +1,6 @@
+import io
 import unittest
+from code_generator.code_sink import CodeSink
 from entities.ast.statementlist import StatementList
 from code_generator.code_generator import default_code_generator
 from entities.ast.node import Node
@@ -176,7 +178,7 @@ class CodegenTest(unittest.TestCase):
         node_function.procedure = Function(name="test", typeclass=Type(logotype=LogoType.VOID))
         node_function.generate_code()
         node_list = default_code_generator.get_generated_code()
-        self.assertEqual("this.func2();", node_list[0])
+        self.assertEqual("this.func1();", node_list[0])
 
     def test_non_void_function_call(self):
         node_function = ProcCall(leaf="test", children=None)
@@ -228,3 +230,52 @@ class CodegenTest(unittest.TestCase):
         node_function.generate_code()
         node_list = default_code_generator.get_generated_code()
         self.assertEqual("System.exit(0);", node_list[0])
+
+    def test_java_code_size_is_known_without_building_the_code(self):
+        Move(node_type=TokenType.FD, children=[Float(100)]).generate_code()
+        java_code = default_code_generator.get_java_code()
+        self.assertIn("this.robot.travel(", java_code)
+        self.assertEqual(default_code_generator.get_java_code_size(), len(java_code))
+
+
+class CodeSinkTest(unittest.TestCase):
+    """Test storing generated code lines in a code sink"""
+
+    def test_lines_are_kept_after_rolling_over_to_disk(self):
+        sink = CodeSink(max_size=64)
+        lines = [
+            f"DoubleVariable temp{index} = new DoubleVariable({index});"
+            for index in range(100)
+        ]
+        for line in lines:
+            sink.append(line)
+        self.assertEqual(list(sink.lines()), lines)
+        self.assertEqual(len(sink), 100)
+        sink.close()
+
+    def test_appending_after_reading_continues_at_end(self):
+        sink = CodeSink()
+        sink.append("a;")
+        list(sink.lines())
+        sink.append("b;")
+        output = io.StringIO()
+        sink.write_to(output)
+        self.assertEqual(output.getvalue(), "a; b; ")
+        self.assertEqual(sink.get_size(), len(output.getvalue()))
+
+    def test_reset_closes_the_file_rolled_over_to_disk(self):
+        with CodeSink(max_size=8) as sink:
+            sink.append("DoubleVariable temp1 = new DoubleVariable(1);")
+            rolled_file = sink._file
+            sink.reset()
+            self.assertTrue(rolled_file.closed)
+            sink.append("a;")
+            self.assertEqual(list(sink.lines()), ["a;"])
+        self.assertTrue(sink._file.closed)
+
+    def test_reset_removes_lines(self):
+        sink = CodeSink()
+        sink.append("a;")
+        sink.reset()
+        sink.append("b;")
+        self.assertEqual(list(sink.lines()), ["b;"])
@@ -0,0 +1,51 @@
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from io import StringIO
+from benchmarks.compiler_phases import (
+    PHASES,
+    TOTAL,
+    find_regressions,
+    load_baseline,
+    run,
+    save_baseline,
+    summarize,
+)
+
+
+class TestCompilerPhases(unittest.TestCase):
+    """Test class for the compiler phase benchmark"""
+
+    def test_summary_has_median_and_percentiles(self):
+        summary = summarize([float(value) for value in range(1, 21)])
+        self.assertEqual(summary["min_ms"], 1)
+        self.assertEqual(summary["median_ms"], 10.5)
+        self.assertEqual(summary["p90_ms"], 18.1)
+        self.assertEqual(summary["p95_ms"], 19.05)
+
+    def test_slower_phase_over_threshold_is_a_regression(self):
+        baseline = {"samples": {"lex": {"min_ms": 1.0}, "parse": {"min_ms": 2.0}}}
+        results = {"samples": {"lex": {"min_ms": 1.1}, "parse": {"min_ms": 2.5}}}
+        self.assertEqual(find_regressions(results, baseline, 0.2), [("samples", "parse", 2.0, 2.5)])
+        self.assertEqual(find_regressions(results, baseline, 0.3), [])
+
+    def test_differences_below_timer_noise_are_not_regressions(self):
+        baseline = {"samples": {"lex": {"min_ms": 0.01}}}
+        results = {"samples": {"lex": {"min_ms": 0.03}}}
+        self.assertEqual(find_regressions(results, baseline), [])
+
+    def test_cases_missing_from_baseline_are_skipped(self):
+        results = {"new case": {"lex": {"min_ms": 1.0}}}
+        self.assertEqual(find_regressions(results, {}), [])
+
+    def test_run_times_every_phase_and_saves_a_baseline(self):
+        with redirect_stdout(StringIO()):
+            results = run({"move": ["fd 10\nrt 90\n"]}, repeat=2)
+        self.assertEqual(set(results["move"]), set(PHASES + (TOTAL,)))
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "baseline.json")
+            self.assertIsNone(load_baseline(path))
+            save_baseline(path, results, "ply")
+            self.assertEqual(find_regressions(results, load_baseline(path)), [])
@@ -0,0 +1,401 @@
+import contextlib
+import io
+import json
+import os
+import tempfile
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import Mock
+from compiler.artifact_cache import ArtifactCache
+from compiler import batch
+from compiler.batch import BatchCompiler, REPORT_NAME
+from compiler.compiler import Compiler
+from compiler.server import CompileServer, StderrConsoleIO
+
+
+class TestCompiler(unittest.TestCase):
+    """Test class for compiling many programs with the same Compiler instance"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.compiler = Compiler(console_io=Mock())
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def _compile(self, code):
+        return self.compiler.compile(
+            code, java_path=self.temp_dir.name, errors_path=self.temp_dir.name
+        )
+
+    def _compile_edit(self, start, end, text):
+        return self.compiler.compile_edit(
+            start, end, text, java_path=self.temp_dir.name, errors_path=self.temp_dir.name
+        )
+
+    def _read_java(self):
+        with open(os.path.join(self.temp_dir.name, "Logo.java"), encoding="utf-8") as file:
+            return file.read()
+
+    def test_valid_program_generates_java(self):
+        result = self._compile("fd 100")
+        self.assertTrue(result.success)
+        self.assertIn("this.robot.travel(temp3.value);", self._read_java())
+
+    def test_errors_do_not_leak_to_next_compilation(self):
+        result = self._compile('fd "kissa')
+        self.assertFalse(result.success)
+        self.assertEqual(len(result.errors), 1)
+
+        result = self._compile("fd 100")
+        self.assertTrue(result.success)
+        self.assertEqual(result.errors, [])
+
+    def test_lexer_errors_are_reported_once(self):
+        result = self._compile("fd 1 ¤")
+        self.assertFalse(result.success)
+        self.assertEqual(len(result.errors), 1)
+
+    def test_error_spans_start_at_the_last_token(self):
+        result = self._compile('make "a 1 + "b')
+        self.assertEqual((result.errors[0]["start"], result.errors[0]["end"]), (8, 12))
+
+    def test_variables_do_not_leak_to_next_compilation(self):
+        self.assertTrue(self._compile('make "a 1 show :a').success)
+        self.assertFalse(self._compile("show :a").success)
+
+    def test_compilers_can_run_in_separate_threads(self):
+        programs = ["fd 100", 'make "a 1 show :a', "to f :x output :x + 1 end show f 1"] * 4
+
+        def compile_program(program):
+            compiler = Compiler(console_io=Mock())
+            results = []
+            for _ in range(3):
+                java_path = tempfile.mkdtemp(dir=self.temp_dir.name)
+                results.append(compiler.compile(program, java_path=java_path).success)
+            return results
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            results = list(executor.map(compile_program, programs))
+        self.assertEqual(results, [[True, True, True]] * len(programs))
+
+    def test_recompiling_generates_same_code(self):
+        code = "to f :x output :x + 1 end show f 1 repeat 2 { fd 1 }"
+        self._compile(code)
+        first = self._read_java()
+        self.compiler.artifact_cache.clear()
+        self._compile(code)
+        self.assertEqual(first, self._read_java())
+
+    def test_recompiling_writes_the_cached_outputs(self):
+        code = "to f :x output :x + 1 end show f 1 repeat 2 { fd 1 }"
+        self._compile(code)
+        first = self._read_java()
+        os.remove(os.path.join(self.temp_dir.name, "Logo.java"))
+
+        self.assertTrue(self._compile(code).success)
+        self.assertEqual(first, self._read_java())
+        self.assertEqual(self.compiler.artifact_cache.hits, 1)
+        self.assertEqual(self.compiler.artifact_cache.misses, 1)
+
+    def test_code_larger_than_the_cache_limit_is_streamed_to_the_file(self):
+        code = "to f :x output :x + 1 end show f 1 repeat 2 { fd 1 }"
+        self._compile(code)
+        first = self._read_java()
+        os.remove(os.path.join(self.temp_dir.name, "Logo.java"))
+        self.compiler.artifact_cache = ArtifactCache(max_code_size=len(first) - 1)
+
+        self.assertTrue(self._compile(code).success)
+        self.assertEqual(first, self._read_java())
+        self.assertEqual(self.compiler.artifact_cache.get_stats()["size"], 0)
+
+    def test_unchanged_java_file_is_not_rewritten(self):
+        self._compile("fd 100")
+        java_path = os.path.join(self.temp_dir.name, "Logo.java")
+        os.utime(java_path, ns=(0, 0))
+        self.compiler.artifact_cache.clear()
+
+        self._compile("fd 100")
+        self.assertEqual(os.stat(java_path).st_mtime_ns, 0)
+        self._compile("fd 50")
+        self.assertNotEqual(os.stat(java_path).st_mtime_ns, 0)
+
+    def test_cached_errors_are_reported_again(self):
+        first = self._compile('make "a 1 + "b')
+        os.remove(os.path.join(self.temp_dir.name, "eng_errors.json"))
+
+        result = self._compile('make "a 1 + "b')
+        self.assertFalse(result.success)
+        self.assertEqual(result.errors, first.errors)
+        self.assertEqual(self.compiler.artifact_cache.hits, 1)
+        with open(os.path.join(self.temp_dir.name, "eng_errors.json"), encoding="utf-8") as file:
+            self.assertEqual(json.load(file)["1"]["start"], 8)
+
+    def test_edit_after_cached_compilation_edits_the_cached_code(self):
+        code = "fd 1\nrt 90\n"
+        self._compile(code)
+        self._compile("bk 1")
+        self._compile(code)
+        result = self._compile_edit(0, 4, "fd 2")
+        self.assertTrue(result.success)
+        self.assertEqual(self.compiler.incremental_parser.code, "fd 2\nrt 90\n")
+        self.assertIn("new DoubleVariable(2.0)", self._read_java())
+
+    def test_compiling_an_edit_generates_same_code_as_compiling_the_code(self):
+        code = 'to f :x output :x + 1 end\nmake "a f 1\nshow :a\nrepeat 2 { fd :a }\n'
+        self._compile(code)
+        start = code.index("show :a")
+        result = self._compile_edit(start, start + len("show :a"), 'show :a * 2\nmake "b "c')
+        self.assertTrue(result.success)
+        edited_java = self._read_java()
+
+        self._compile(self.compiler.incremental_parser.code)
+        self.assertEqual(edited_java, self._read_java())
+
+    def test_errors_of_an_edit_have_positions_in_the_edited_code(self):
+        self._compile("fd 1\nrt 90\nbk 1\nlt 90\n")
+        result = self._compile_edit(0, 0, "show 1\n")
+        self.assertTrue(result.success)
+        result = self._compile_edit(21, 22, '"a')
+        self.assertFalse(result.success)
+        self.assertEqual((result.errors[0]["start"], result.errors[0]["end"]), (18, 21))
+
+    def test_result_has_no_profile_by_default(self):
+        self.assertIsNone(self._compile("fd 100").profile)
+
+    def test_profile_reports_the_phases_and_counters(self):
+        self.compiler = Compiler(console_io=Mock(), profile=True)
+        result = self._compile('to f :x\nfd :x\noutput :x\nend\nfd f 1\n')
+        phases = result.profile["phases"]
+        counters = result.profile["counters"]
+        for phase in ("lexer build", "lex", "preparse", "parse", "check types", "write"):
+            self.assertIn(phase, phases)
+        self.assertEqual(phases["parse"]["calls"], 1)
+        self.assertEqual(counters["tokens"], 11)
+        self.assertEqual(counters["grammar rules added"], 0)
+        self.assertGreater(counters["ast nodes"], 0)
+        self.assertGreater(counters["symbol lookups"], 0)
+        self.assertEqual(counters["type unifications"], 1)
+        self.assertGreater(counters["temporaries"], 0)
+
+        # The report covers the compilations since the previous report
+        result = self._compile('to f :x\nfd :x\noutput :x\nend\nfd f 1\n')
+        self.assertNotIn("lexer build", result.profile["phases"])
+        self.assertEqual(result.profile["counters"], {"artifact cache hits": 1})
+
+
+class TestUnboxedCompiler(unittest.TestCase):
+    """Test class for compiling with unboxed primitive values"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.compiler = Compiler(console_io=Mock(), optimize=True)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def _compile_java(self, code):
+        self.assertTrue(self.compiler.compile(code, java_path=self.temp_dir.name).success)
+        with open(os.path.join(self.temp_dir.name, "Logo.java"), encoding="utf-8") as file:
+            return file.read()
+
+    def _compile_run(self, code):
+        java_code = self._compile_java(code)
+        return java_code[java_code.index("public void run() {") :]
+
+    def test_expressions_are_inlined(self):
+        run = self._compile_run('make "a 1 fd :a + 2 * -:a')
+        self.assertIn("this.robot.travel((var3.value + (2.0 * (-var3.value))));", run)
+        self.assertNotIn("temp", run)
+
+    def test_values_are_boxed_for_variables_and_procedures(self):
+        run = self._compile_run('make "a 1 < 2 show :a to f :x output :x + 1 end show f 5')
+        self.assertIn("var var3 = new BoolVariable(true);", run)
+        self.assertIn("System.out.println(var3.value);", run)
+        self.assertIn("var temp6 = this.func4(new DoubleVariable(5.0));", run)
+
+    def test_for_iterator_is_the_loop_variable(self):
+        run = self._compile_run('for ["i 1 3 1] { show :i }')
+        self.assertIn("var var3 = new DoubleVariable(0);", run)
+        self.assertIn(
+            "for (var3.value = 1.0; var3.value <= 3.0; var3.value += 1.0) "
+            "{ System.out.println(var3.value); }",
+            run,
+        )
+
+    def test_repeat_with_block_is_a_java_loop(self):
+        run = self._compile_run("repeat 4 { fd 10 rt 90 }")
+        self.assertIn(
+            "for (int temp3 = 0; temp3 < 4.0; temp3++) "
+            "{ this.robot.travel(10.0); this.robot.rotate(-90.0); }",
+            run,
+        )
+        self.assertNotIn("Callable", run)
+        self.assertNotIn("ReturnException", run)
+
+    def test_repeat_with_callable_variable_uses_function(self):
+        run = self._compile_run('make "block { fd 10 } repeat 2 :block')
+        self.assertIn("Callable<Void> temp3 = () -> {", run)
+        self.assertIn("this.func1(new DoubleVariable(2.0), var5);", run)
+
+    def test_output_inside_loop_is_a_direct_return(self):
+        java_code = self._compile_java("to f :n repeat 2 { output :n } output 0 end show f 5")
+        self.assertIn("for (int temp5 = 0; temp5 < 2.0; temp5++) { return var4; }", java_code)
+        self.assertNotIn("ReturnException", java_code[java_code.index("func3") :])
+
+    def test_output_is_a_direct_return(self):
+        java_code = self._compile_java(
+            "to fact :n if :n < 2 { output 1 } output :n * fact :n - 1 end show fact 5"
+        )
+        self.assertIn("if ((var4.value < 2.0)) { return new DoubleVariable(1.0); }", java_code)
+        self.assertNotIn("ReturnException", java_code[java_code.index("func3") :])
+
+    def test_output_inside_lambda_is_thrown(self):
+        java_code = self._compile_java(
+            'to f :n make "block { output :n } repeat 2 :block output 0 end show f 5'
+        )
+        self.assertIn("throw new ReturnException(var4);", java_code)
+        self.assertIn("return new DoubleVariable(0.0); } catch (ReturnException error)", java_code)
+
+    def test_edit_after_constant_folding_is_compiled_from_the_code(self):
+        self._compile_java("show 1 + 2\nif 1 < 2 { fd 1 }\nshow 3\n")
+        result = self.compiler.compile_edit(0, 4, "fd", java_path=self.temp_dir.name)
+        self.assertTrue(result.success)
+        with open(os.path.join(self.temp_dir.name, "Logo.java"), encoding="utf-8") as file:
+            edited_java = file.read()
+        self.assertEqual(edited_java, self._compile_java("fd 1 + 2\nif 1 < 2 { fd 1 }\nshow 3\n"))
+
+
+class TestCompileServer(unittest.TestCase):
+    """Test class for the JSON lines compile server"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.compiler = Compiler(console_io=Mock())
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def _serve(self, *requests):
+        input_stream = io.StringIO("\n".join(requests) + "\n")
+        output_stream = io.StringIO()
+        CompileServer(self.compiler, input_stream, output_stream).serve()
+        return [json.loads(line) for line in output_stream.getvalue().splitlines()]
+
+    def _request(self, request_id, code, **kwargs):
+        request = {"id": request_id, "code": code, "output_dir": self.temp_dir.name}
+        request.update(kwargs)
+        return json.dumps(request)
+
+    def _edit_request(self, request_id, edit):
+        return json.dumps({"id": request_id, "edit": edit, "output_dir": self.temp_dir.name})
+
+    def test_stdout_only_has_responses(self):
+        code = 'for ["i 1 2 1] { for ["i 1 2 1] { fd :i } }'
+        for optimize in (False, True):
+            with self.subTest(optimize=optimize):
+                stdout = io.StringIO()
+                requests = io.StringIO(
+                    "\n".join((self._request(1, code), self._request(2, 'fd "kissa'))) + "\n"
+                )
+                with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(io.StringIO()):
+                    compiler = Compiler(console_io=StderrConsoleIO(), optimize=optimize)
+                    CompileServer(compiler, requests).serve()
+                lines = stdout.getvalue().splitlines()
+                self.assertEqual([json.loads(line)["id"] for line in lines], [1, 2])
+
+    def test_requests_are_answered_in_order(self):
+        responses = self._serve(
+            self._request(1, "fd 100"),
+            self._request(2, 'fd "kissa', language="eng"),
+            self._request(3, "bk 100"),
+        )
+        self.assertEqual([response["id"] for response in responses], [1, 2, 3])
+        self.assertEqual([response["success"] for response in responses], [True, False, True])
+        self.assertEqual(len(responses[1]["errors"]), 1)
+        self.assertIn("FLOAT", responses[1]["errors"][0]["message"])
+
+    def test_invalid_request_does_not_stop_server(self):
+        responses = self._serve("not json", self._request(1, "fd 100"))
+        self.assertFalse(responses[0]["success"])
+        self.assertTrue(responses[1]["success"])
+
+    def test_edit_request_changes_the_previous_program(self):
+        responses = self._serve(
+            self._request(1, "fd 100\nbk 100\n"),
+            self._edit_request(2, {"start": 7, "end": 9, "text": "rt"}),
+            self._edit_request(3, {"start": 10, "end": 13, "text": '"a'}),
+        )
+        self.assertEqual([response["success"] for response in responses], [True, True, False])
+
+    def test_stats_request_returns_artifact_cache_stats(self):
+        responses = self._serve(
+            self._request(1, "fd 100"),
+            self._request(2, "fd 100"),
+            json.dumps({"id": 3, "stats": True}),
+        )
+        self.assertEqual(responses[2]["cache"]["hits"], 1)
+        self.assertEqual(responses[2]["cache"]["misses"], 1)
+
+    def test_response_has_profile_when_profiling(self):
+        self.compiler = Compiler(console_io=Mock(), profile=True)
+        responses = self._serve(self._request(1, "fd 100"))
+        self.assertIn("parse", responses[0]["profile"]["phases"])
+
+    def test_unknown_language_is_rejected(self):
+        responses = self._serve(self._request(1, "fd 100", language="swe"))
+        self.assertFalse(responses[0]["success"])
+
+
+class TestBatchCompiler(unittest.TestCase):
+    """Test class for compiling many files with worker processes"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.source_dir = os.path.join(self.temp_dir.name, "src")
+        self.output_dir = os.path.join(self.temp_dir.name, "out")
+        programs = {
+            "move.logo": "fd 100",
+            "broken.logo": 'fd "kissa',
+            os.path.join("student", "show.logo"): "show 1 + 2",
+        }
+        for name, code in programs.items():
+            path = os.path.join(self.source_dir, name)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "w", encoding="utf-8") as file:
+                file.write(code)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def _compile(self, jobs):
+        return BatchCompiler(self.output_dir, jobs=jobs).compile_path(self.source_dir)
+
+    def test_batch_reports_every_file(self):
+        report = self._compile(jobs=2)
+        self.assertEqual(report["compiled"], 2)
+        self.assertEqual(report["failed"], 1)
+
+        broken = report["files"][os.path.join(self.source_dir, "broken.logo")]
+        self.assertFalse(broken["success"])
+        self.assertEqual(len(broken["errors"]), 1)
+
+        with open(os.path.join(self.output_dir, REPORT_NAME), encoding="utf-8") as file:
+            self.assertEqual(json.load(file), report)
+
+    def test_pool_worker_closes_its_compiler_on_exit(self):
+        batch._initialize_pool_worker("eng", "Java", False, "ply")
+        code_generator = batch._worker_compiler.code_generator
+        self.assertFalse(code_generator._main._file.closed)
+        # The finalizer is run by multiprocessing when the worker process exits.
+        batch._worker_finalizer()
+        self.assertTrue(code_generator._main._file.closed)
+        self.assertTrue(code_generator._method._file.closed)
+
+    def test_each_file_has_own_output_directory(self):
+        self._compile(jobs=1)
+        self.assertTrue(os.path.isfile(os.path.join(self.output_dir, "move", "Logo.java")))
+        self.assertTrue(
+            os.path.isfile(os.path.join(self.output_dir, "student", "show", "Logo.java"))
+        )
+        self.assertTrue(os.path.isfile(os.path.join(self.output_dir, "broken", "eng_errors.json")))
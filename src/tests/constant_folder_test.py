@@ -0,0 +1,98 @@
+import unittest
+from unittest.mock import Mock
+from code_generator.code_generator import JavaCodeGenerator
+from entities.ast.node import NodeFactory
+from entities.preconfigured_functions import initialize_logo_functions
+from entities.symbol_table import SymbolTable
+from entities.symbol_tables import SymbolTables
+from lexer.lexer import Lexer
+from optimizer.constant_folder import ConstantFolder
+from parser.parser import Parser
+from utils.error_handler_mock import ErrorHandlerMock
+from utils.logger import Logger
+
+
+class TestConstantFolder(unittest.TestCase):
+    """Test class for the constant folding pass"""
+
+    def setUp(self):
+        self.error_handler = ErrorHandlerMock()
+        self.logger = Logger(console_io=Mock(), error_handler=self.error_handler)
+        self.lexer = Lexer(self.logger)
+        self.lexer.build()
+        self.symbol_tables = SymbolTables(
+            SymbolTable(), functions=initialize_logo_functions(SymbolTable())
+        )
+        self.code_generator = JavaCodeGenerator(logger=self.logger)
+        self.parser = Parser(self.lexer, self.logger, self.symbol_tables, self.code_generator)
+        node_factory = NodeFactory(self.logger, self.symbol_tables, self.code_generator)
+        self.folder = ConstantFolder(node_factory)
+
+    def _fold(self, code):
+        ast = self.parser.parse(code)
+        ast.check_types()
+        self.assertEqual(self.error_handler.get_error_ids(), [])
+        removed = self.folder.fold(ast)
+        return ast, removed
+
+    def _statements(self, ast):
+        return ast.children[0].children
+
+    def test_arithmetic_on_literals_is_folded(self):
+        ast, removed = self._fold("fd 1 + 2 * -3")
+        move = self._statements(ast)[0]
+        self.assertEqual(move.children[0].node_type, "Float")
+        self.assertEqual(move.children[0].leaf, -5.0)
+        self.assertEqual(removed, 5)
+
+    def test_operations_on_variables_are_kept(self):
+        ast, removed = self._fold('make "a 1 fd :a + 2 * 3')
+        binop = self._statements(ast)[1].children[0]
+        self.assertEqual(binop.node_type, "BinOp")
+        self.assertEqual(binop.children[1].leaf, 6.0)
+        self.assertEqual(removed, 2)
+
+    def test_division_by_zero_is_left_to_run_time(self):
+        ast, removed = self._fold("show 1 / 0")
+        self.assertEqual(self._statements(ast)[0].children[0].node_type, "BinOp")
+        self.assertEqual(removed, 0)
+
+    def test_relop_on_literals_is_folded(self):
+        ast, _ = self._fold('show 1 < 2 show "a = "b')
+        statements = self._statements(ast)
+        self.assertEqual(str(statements[0].children[0]), "(Bool, TokenType.TRUE, logo type: LogoType.BOOL)")
+        self.assertEqual(str(statements[1].children[0]), "(Bool, TokenType.FALSE, logo type: LogoType.BOOL)")
+
+    def test_if_with_false_condition_is_removed(self):
+        ast, removed = self._fold("if 1 > 2 { fd 10 } bk 10")
+        statements = self._statements(ast)
+        self.assertEqual(len(statements), 1)
+        self.assertEqual(removed, 7)
+
+    def test_if_with_true_condition_is_replaced_by_block(self):
+        ast, _ = self._fold("if true { fd 10 }")
+        block = self._statements(ast)[0]
+        self.assertEqual(block.node_type, "Block")
+        self.assertEqual(block.children[0].children[0].node_type.value, "FD")
+
+    def test_ifelse_keeps_taken_branch(self):
+        ast, _ = self._fold("ifelse 2 = 2 { fd 10 } { bk 10 }")
+        block = self._statements(ast)[0]
+        self.assertEqual(block.node_type, "Block")
+        self.assertEqual(len(block.children), 1)
+        self.assertEqual(block.children[0].children[0].node_type.value, "FD")
+
+    def test_statements_after_output_in_block_are_removed(self):
+        ast, _ = self._fold("to f output 1 end to g if true { output 1 } output 2 end show g")
+        proc_decl = self._statements(ast)[1]
+        statements = proc_decl.children[1].children
+        self.assertEqual(len(statements), 1)
+        self.assertEqual(statements[0].node_type, "Block")
+
+    def test_folded_program_generates_code(self):
+        ast, _ = self._fold("if true { make \"a 2 * 3 show :a } make \"a 1")
+        ast.generate_code()
+        code = self.code_generator.get_generated_code()
+        self.assertEqual(code[0], "{")
+        self.assertEqual(code[1], "DoubleVariable temp1 = new DoubleVariable(6.0);")
+        self.assertIn("}", code)
@@ -0,0 +1,117 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import Mock
+from compiler.compiler import Compiler, DESCENT_PARSER, PLY_PARSER
+from lexer.lexer import Lexer
+from parser.descent_parser import DescentParser
+from parser.parser import Parser
+from utils.error_handler_mock import ErrorHandlerMock
+from utils.logger import Logger
+
+LOGO_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "logo")
+
+
+class TestDescentParser(unittest.TestCase):
+    """Test class for the recursive descent parser, which must build the same AST as the
+    PLY parser"""
+
+    def setUp(self):
+        self.error_handler = ErrorHandlerMock()
+        self.logger = Logger(console_io=Mock(), error_handler=self.error_handler)
+        self.lexer = Lexer(self.logger)
+        self.lexer.build()
+        self.parser = DescentParser(self.lexer, self.logger)
+        self.ply_parser = Parser(self.lexer, self.logger)
+        self.maxDiff = None
+
+    def assert_same_ast(self, code):
+        self.assertEqual(str(self.parser.parse(code)), str(self.ply_parser.parse(code)))
+        self.assertEqual(self.error_handler.get_error_ids(), [])
+
+    def test_commands(self):
+        self.assert_same_ast(
+            'fd 10 bk 10 lt 90 rt 90 show "a make "a 1 (fd 10) (show 1 2 3) (make "b 2) bye'
+        )
+
+    def test_finnish_commands(self):
+        self.assert_same_ast(
+            "toista 4 { eteen 10 oikealle 90 } miten f :a anna :a valmis tulosta f 1"
+        )
+
+    def test_operator_precedence(self):
+        self.assert_same_ast("show 1 + 2 * 3 - 4 / 5 show -1 * -2 < 3 show (1 + 2) * 3")
+
+    def test_not_equals_has_no_precedence(self):
+        self.assert_same_ast("show 1 <> 2 + 3 show 1 + 2 <> 3 show 1 = 2 <> 3")
+
+    def test_minus_between_arguments(self):
+        self.assert_same_ast(
+            'make "a -2 * 3 make "b -2 -3 make "c - 2 3 repeat 2 -1 { fd 1 } (show 1 -2)'
+        )
+
+    def test_procedures(self):
+        self.assert_same_ast(
+            "f 1 -2 to f :a :b output :a end show f 1 2 + 3 show (f 1 2) (f 1 2) (g 1)"
+        )
+
+    def test_procedure_with_many_parameters(self):
+        self.assert_same_ast(
+            "to f :a :b :c :d :e :f :g :h :i :j output :a end show f 1 2 3 4 5 6 7 8 9 10"
+        )
+
+    def test_conditionals_and_loops(self):
+        self.assert_same_ast(
+            'if { :a > 1 } { fd 1 } if { fd 1 } { fd 1 } if true { } '
+            'ifelse :a = 1 { fd 1 } { bk 1 } (if :a { fd 1 }) '
+            'for ["i 1 10 1] { show :i } make "b { fd 1 } repeat 2 :b'
+        )
+
+    def test_logo_examples(self):
+        for name in ("binops.logo", "expr.logo", "for.logo", "if.logo", "relops.logo", "test.logo"):
+            with open(os.path.join(LOGO_PATH, name), encoding="utf-8") as file:
+                self.assert_same_ast(file.read())
+
+    def test_first_syntax_error_is_reported(self):
+        self.assertIsNone(self.parser.parse('mak "asd 123 fd }'))
+        self.assertEqual(self.error_handler.get_error_ids(), ["parser_error"])
+
+    def test_syntax_error_at_end_of_program(self):
+        self.assertIsNone(self.parser.parse("fd 1 fd"))
+        self.assertEqual(self.error_handler.get_error_ids(), ["parser_error_with_no_lexspan"])
+
+    def test_conditional_at_end_of_program_is_a_syntax_error(self):
+        for code in ("if", "ifelse", "fd 1 if"):
+            with self.subTest(code=code):
+                self.error_handler.discard_errors(0)
+                self.assertIsNone(self.parser.parse(code))
+                self.assertEqual(
+                    self.error_handler.get_error_ids(), ["parser_error_with_no_lexspan"]
+                )
+
+    def test_nonassociative_relops_are_syntax_errors(self):
+        self.assertIsNone(self.parser.parse("show 1 < 2 < 3"))
+        self.assertEqual(self.error_handler.get_error_ids(), ["parser_error"])
+
+    def test_compiler_generates_same_code_with_both_parsers(self):
+        code = "to fact :n if :n < 2 { output 1 } output :n * fact :n - 1 end show fact 5"
+        java_code = []
+        with tempfile.TemporaryDirectory() as temp_dir:
+            for parser_name in (PLY_PARSER, DESCENT_PARSER):
+                compiler = Compiler(console_io=Mock(), parser_name=parser_name)
+                self.assertTrue(compiler.compile(code, java_path=temp_dir).success)
+                with open(os.path.join(temp_dir, "Logo.java"), encoding="utf-8") as file:
+                    java_code.append(file.read())
+        self.assertEqual(java_code[0], java_code[1])
+
+    def test_deeply_nested_blocks_and_parentheses_compile(self):
+        depth = 800
+        code = "repeat 2 { " * depth + "fd " + "(" * depth + "1" + ")" * depth + " }" * depth
+        java_code = []
+        with tempfile.TemporaryDirectory() as temp_dir:
+            for parser_name in (PLY_PARSER, DESCENT_PARSER):
+                compiler = Compiler(console_io=Mock(), parser_name=parser_name)
+                self.assertTrue(compiler.compile(code, java_path=temp_dir).success)
+                with open(os.path.join(temp_dir, "Logo.java"), encoding="utf-8") as file:
+                    java_code.append(file.read())
+        self.assertEqual(java_code[0], java_code[1])
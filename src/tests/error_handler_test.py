@@ -0,0 +1,49 @@
+import unittest
+from unittest.mock import Mock
+from utils.error_handler import ENG, FIN, ErrorHandler
+
+
+class TestErrorHandler(unittest.TestCase):
+    """Test class for utils.error_handler.ErrorHandler"""
+
+    def setUp(self):
+        self.console_mock = Mock()
+        self.error_handler = ErrorHandler(console_io=self.console_mock, language=ENG)
+
+    def test_messages_are_rendered_with_the_params(self):
+        self.error_handler.add_error("undefined_variable", (3, 5), var="x")
+        error = self.error_handler.get_error_messages()[0]
+
+        self.assertEqual(error.get_message(ENG), "You have not told me variable 'x'.")
+        self.assertEqual(error.get_message(FIN), "Et ole kertonut minulle muuttujaa 'x'.")
+        self.assertEqual((error.start, error.end), (3, 5))
+        self.assertEqual(error["eng"], error.get_message(ENG))
+        self.assertEqual((error["start"], error["end"]), (3, 5))
+
+    def test_tags_without_params_are_left_in_the_message(self):
+        self.error_handler.add_error("deref_instead_of_string_literal", (0, 1))
+        error = self.error_handler.get_error_messages()[0]
+        self.assertEqual(error.get_message(ENG), 'You wrote :@var_name, did you mean "@var_name ?')
+
+    def test_same_error_is_added_once(self):
+        self.error_handler.add_error("undefined_variable", (3, 5), var="x")
+        self.error_handler.add_error("undefined_variable", (3, 5), var="x")
+        self.error_handler.add_error("undefined_variable", (3, 5), var="y")
+        self.error_handler.add_error("undefined_variable", (7, 9), var="x")
+        self.assertEqual(self.error_handler.get_error_count(), 3)
+
+    def test_discarded_error_can_be_added_again(self):
+        self.error_handler.add_error("undefined_variable", (3, 5), var="x")
+        self.error_handler.add_error("undefined_variable", (7, 9), var="y")
+        self.error_handler.discard_errors(1)
+        self.error_handler.add_error("undefined_variable", (7, 9), var="y")
+        self.assertEqual(self.error_handler.get_error_count(), 2)
+
+    def test_unknown_message_id_raises(self):
+        with self.assertRaises(KeyError):
+            self.error_handler.add_error("no_such_error", (0, 1))
+
+    def test_errors_are_written_to_console_in_the_selected_language(self):
+        self.error_handler.add_error("undefined_variable", (3, 5), var="x")
+        self.error_handler.write_errors_to_console()
+        self.console_mock.write.assert_called_once_with("You have not told me variable 'x'.")
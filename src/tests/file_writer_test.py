@@ -0,0 +1,57 @@
+import os
+import tempfile
+import unittest
+from code_generator.code_generator import JavaCodeGenerator
+from utils.file_writer import write_chunks_if_changed, write_if_changed
+
+
+class TestFileWriter(unittest.TestCase):
+    """Test class for writing output files only when they change"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.temp_dir.name, "Logo.java")
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def _read(self, path):
+        with open(path, encoding="utf-8") as file:
+            return file.read()
+
+    def test_unchanged_file_is_not_rewritten(self):
+        self.assertTrue(write_if_changed(self.path, "class Logo {}"))
+        os.utime(self.path, ns=(0, 0))
+
+        self.assertFalse(write_if_changed(self.path, "class Logo {}"))
+        self.assertEqual(os.stat(self.path).st_mtime_ns, 0)
+        self.assertTrue(write_if_changed(self.path, "class Logo { }"))
+        self.assertEqual(self._read(self.path), "class Logo { }")
+        self.assertEqual(os.listdir(self.temp_dir.name), ["Logo.java"])
+
+    def test_unchanged_chunks_are_not_rewritten(self):
+        self.assertTrue(write_chunks_if_changed(self.path, ["class ", "Logo {}"]))
+        os.utime(self.path, ns=(0, 0))
+
+        self.assertFalse(write_chunks_if_changed(self.path, iter(["class Logo", " {}"])))
+        self.assertEqual(os.stat(self.path).st_mtime_ns, 0)
+        self.assertTrue(write_chunks_if_changed(self.path, ["class Logo {}", " "]))
+        self.assertEqual(self._read(self.path), "class Logo {} ")
+        self.assertEqual(os.listdir(self.temp_dir.name), ["Logo.java"])
+
+    def test_robot_config_is_written_when_parameters_change(self):
+        code_generator = JavaCodeGenerator()
+        config_path = os.path.join(self.temp_dir.name, "RobotConfig.java")
+        code_generator.write_robot_config({"leftMotor": "C"}, self.temp_dir.name)
+        os.utime(config_path, ns=(0, 0))
+
+        code_generator.write_robot_config({"leftMotor": "C"}, self.temp_dir.name)
+        self.assertEqual(os.stat(config_path).st_mtime_ns, 0)
+        code_generator.write_robot_config({"motorSpeed": "400"}, self.temp_dir.name)
+        config = self._read(config_path)
+        self.assertIn("int motorSpeed = 400;", config)
+        self.assertIn("new EV3LargeRegulatedMotor(MotorPort.A)", config)
+
+    def test_unknown_robot_parameter_raises(self):
+        with self.assertRaises(Exception):
+            JavaCodeGenerator().get_robot_config_code({"wheelRadius": "2"})
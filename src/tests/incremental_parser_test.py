@@ -0,0 +1,134 @@
+import unittest
+from unittest.mock import Mock
+from entities.preconfigured_functions import initialize_logo_functions
+from entities.symbol_table import SymbolTable
+from entities.symbol_tables import SymbolTables
+from lexer.lexer import Lexer
+from parser.descent_parser import DescentParser
+from parser.incremental_parser import IncrementalParser, walk
+from parser.parser import Parser
+from utils.error_handler_mock import ErrorHandlerMock
+from utils.logger import Logger
+
+CODE = """to double :a
+    output :a * 2
+end
+to square :a
+    output :a * :a
+end
+make "x double 2
+fd :x
+rt 90
+show square :x
+"""
+
+
+def positions(start_node):
+    if start_node is None:
+        return None
+    return [
+        (node.position.get_linespan(), node.position.get_lexspan(), node.position.get_pos())
+        for node in walk(start_node)
+    ]
+
+
+class TestIncrementalParser(unittest.TestCase):
+    """Test class for parsing edits of a program incrementally, which must give the same
+    AST as parsing the edited program in full"""
+
+    parser_class = Parser
+
+    def setUp(self):
+        self.error_handler = ErrorHandlerMock()
+        self.logger = Logger(console_io=Mock(), error_handler=self.error_handler)
+        self.lexer = Lexer(self.logger)
+        self.lexer.build()
+        self.symbol_tables = SymbolTables(
+            SymbolTable(), functions=initialize_logo_functions(SymbolTable())
+        )
+        self.parser = IncrementalParser(
+            self.parser_class(self.lexer, self.logger, self.symbol_tables),
+            self.lexer,
+            self.logger,
+        )
+        self.parser.parse(CODE)
+
+    def _parse_in_full(self, code):
+        error_handler = ErrorHandlerMock()
+        logger = Logger(console_io=Mock(), error_handler=error_handler)
+        lexer = Lexer(logger)
+        lexer.build()
+        start_node = self.parser_class(lexer, logger).parse(code)
+        return start_node, error_handler.get_error_ids()
+
+    def _reparse(self, start, end, text):
+        # Errors are reset before each parse, like the compiler does.
+        self.error_handler.discard_errors(0)
+        return self.parser.reparse(start, end, text)
+
+    def _edit(self, old, new):
+        start = self.parser.code.index(old)
+        return self._reparse(start, start + len(old), new)
+
+    def assert_same_as_full_parse(self, start_node):
+        full_start_node, error_ids = self._parse_in_full(self.parser.code)
+        self.assertEqual(str(start_node), str(full_start_node))
+        self.assertEqual(positions(start_node), positions(full_start_node))
+        self.assertEqual(self.error_handler.get_error_ids(), error_ids)
+
+    def test_edit_reuses_the_statements_it_does_not_touch(self):
+        statements = list(self.parser.start_node.children[0].children)
+        start_node = self._edit(":a * :a", ":a * :a * :a")
+
+        self.assert_same_as_full_parse(start_node)
+        new_statements = start_node.children[0].children
+        self.assertIs(new_statements[3], statements[3])
+        self.assertIs(new_statements[5], statements[5])
+        self.assertIsNot(new_statements[1], statements[1])
+
+    def test_edit_moves_the_positions_after_it(self):
+        start_node = self._edit("output :a * 2\n", "make \"b :a\n    output :b *\n 2\n")
+        self.assert_same_as_full_parse(start_node)
+
+    def test_edits_in_a_row(self):
+        self._edit("fd :x", "fd :x + 10")
+        self._reparse(0, 0, "; comment\n")
+        start_node = self._reparse(len(self.parser.code), len(self.parser.code), "bk 1")
+        self.assert_same_as_full_parse(start_node)
+
+    def test_changed_procedure_arity_is_parsed_in_full(self):
+        start_node = self._edit("double :a", "double :a :b")
+        self.assertIsNotNone(self.parser.tokens)
+        self.assert_same_as_full_parse(start_node)
+
+        start_node = self._edit("double 2", "double 2 3")
+        self.assert_same_as_full_parse(start_node)
+
+    def test_syntax_error_is_reported_once(self):
+        start_node = self._edit("rt 90", "rt 90 fd")
+        self.assert_same_as_full_parse(start_node)
+        self.assertEqual(len(self.error_handler.get_error_ids()), 1)
+
+        start_node = self._edit(" fd", "")
+        self.assert_same_as_full_parse(start_node)
+        self.assertEqual(self.error_handler.get_error_ids(), [])
+
+    def test_comment_typed_in_an_edit(self):
+        start_node = self._edit("rt 90", "rt 90 ; fd 1")
+        self.assert_same_as_full_parse(start_node)
+        start_node = self._edit(";", "")
+        self.assert_same_as_full_parse(start_node)
+
+    def test_reused_nodes_are_reset(self):
+        self.parser.start_node.check_types()
+        start_node = self._edit("rt 90", "rt 45")
+        procedures = [node for node in walk(start_node) if node.node_type == "ProcDecl"]
+        arguments = [node for node in walk(start_node) if node.node_type == "ProgArg"]
+        self.assertEqual([node.procedure for node in procedures], [None, None])
+        self.assertEqual([node.symbol for node in arguments], [None, None])
+
+
+class TestIncrementalDescentParser(TestIncrementalParser):
+    """Test class for parsing edits incrementally with the recursive descent parser"""
+
+    parser_class = DescentParser
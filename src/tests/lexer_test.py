@@ -386,3 +386,20 @@ class TestLexer(unittest.TestCase):
         token = self.ply_lexer.token()
         self.assertEqual(token.type, TokenType.NUMBER.value)
         self.assertEqual(token.value, 6)
+
+    def test_token_buffer_replays_lexer_positions(self):
+        token_buffer = self.lexer.tokenize("fd 10\n  bk 20")
+        self.assertEqual(len(token_buffer), 4)
+
+        token_buffer.rewind()
+        token_buffer.token()
+        token = token_buffer.token()
+        self.assertEqual((token.value, token_buffer.lineno, token_buffer.lexpos), (10, 1, 5))
+
+        token = token_buffer.token()
+        self.assertEqual(token.type, TokenType.BK.value)
+        self.assertEqual((token_buffer.lineno, token_buffer.linestartpos), (2, 6))
+
+        token_buffer.token()
+        self.assertIsNone(token_buffer.token())
+        self.assertEqual(token_buffer.lineno, 2)
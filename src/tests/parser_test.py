@@ -1,6 +1,7 @@
 import unittest
 from unittest.mock import Mock
 from lexer.lexer import Lexer
+from parser.globals import Position
 from parser.parser import Parser
 
 from entities.ast.node import *
@@ -32,6 +33,18 @@ class TestParser(unittest.TestCase):
         expected = "(Start, children: [(StatementList, children: [(ProcDecl, turha.funktio, children: [(ProcArgs), (StatementList)]), (ProcCall, turha.funktio)])])"
         self.assertEqual(str(ast), expected)
     
+    def test_procedure_call_before_declaration_without_parentheses(self):
+        test_string = "turha.funktio miten turha.funktio end"
+        ast = self.parser.parse(test_string)
+        expected = "(Start, children: [(StatementList, children: [(ProcCall, turha.funktio), (ProcDecl, turha.funktio, children: [(ProcArgs), (StatementList)])])])"
+        self.assertEqual(str(ast), expected)
+
+    def test_long_statement_list_is_flat(self):
+        ast = self.parser.parse("fd 1\n" * 5000)
+        statements = ast.children[0].children
+        self.assertEqual(len(statements), 5000)
+        self.assertEqual(statements[-1].node_type, TokenType.FD)
+
     def test_procedure_call_without_parantheses_with_argument(self):
         test_string = """
         miten lisää.ykkönen :numero
@@ -303,3 +316,37 @@ class TestParser(unittest.TestCase):
         expected = "(Start, children: [(StatementList, children: [(TokenType.SHOW, logo type: LogoType.VOID, children: [(ProcCall, get.message, children: [(Float, 123.0, logo type: LogoType.FLOAT)])])])])"
         ast = self.parser.parse(test_string)
         self.assertEqual(str(ast), expected)
+
+    def test_parsers_do_not_share_grammar_rules(self):
+        other_lexer = Lexer(self.logger)
+        other_lexer.build()
+        other_parser = Parser(other_lexer, self.logger)
+
+        nine_args = " ".join(f":a{index}" for index in range(9))
+        test_string = f"to f {nine_args} end f 1 2 3 4 5 6 7 8 9"
+        other_parser.parse("fd 1")
+        ast = self.parser.parse(test_string)
+        other_parser.parse("fd 2")
+
+        self.assertEqual(len(ast.children[0].children[1].children), 9)
+        self.assertEqual(str(self.parser.parse(test_string)), str(ast))
+
+    def test_nodes_share_one_compile_context(self):
+        ast = self.parser.parse('to f :a output :a * 2 end make "x f 1 fd :x')
+        nodes = [ast]
+        for node in nodes:
+            nodes.extend(node.children)
+
+        self.assertEqual(len({id(node._context) for node in nodes}), 1)
+        self.assertIs(ast._logger, self.logger)
+        self.assertFalse(any(hasattr(node, "__dict__") for node in nodes))
+        with self.assertRaises(AttributeError):
+            ast.children[0].lexer = self.lexer
+
+    def test_position_is_moved_by_an_edit(self):
+        position = Position.from_span((2, 3), (10, 25), 8)
+        position.shift(4, 1, lambda line_start: line_start + 4)
+
+        self.assertEqual(position.get_linespan(), (3, 4))
+        self.assertEqual(position.get_lexspan(), (14, 29))
+        self.assertEqual(position.get_pos(), (3, 2))
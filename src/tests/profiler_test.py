@@ -0,0 +1,37 @@
+import unittest
+from utils.profiler import Profiler
+
+
+class TestProfiler(unittest.TestCase):
+    """Test class for utils.profiler.Profiler"""
+
+    def test_disabled_profiler_reports_nothing(self):
+        profiler = Profiler()
+        with profiler.phase("parse"):
+            pass
+        profiler.count("tokens", 3)
+        self.assertEqual(profiler.get_report(), {"phases": {}, "counters": {}})
+
+    def test_phases_and_counters_are_summed(self):
+        profiler = Profiler(enabled=True)
+        for _ in range(3):
+            with profiler.phase("parse"):
+                pass
+            profiler.count("tokens", 2)
+        report = profiler.get_report()
+        self.assertEqual(report["phases"]["parse"]["calls"], 3)
+        self.assertGreaterEqual(report["phases"]["parse"]["wall_ms"], 0)
+        self.assertEqual(report["counters"], {"tokens": 6})
+
+    def test_phase_is_timed_when_its_block_raises(self):
+        profiler = Profiler(enabled=True)
+        with self.assertRaises(ValueError):
+            with profiler.phase("parse"):
+                raise ValueError()
+        self.assertEqual(profiler.get_report()["phases"]["parse"]["calls"], 1)
+
+    def test_pop_report_resets_the_profiler(self):
+        profiler = Profiler(enabled=True)
+        profiler.count("tokens")
+        self.assertEqual(profiler.pop_report()["counters"], {"tokens": 1})
+        self.assertEqual(profiler.get_report(), {"phases": {}, "counters": {}})
@@ -0,0 +1,78 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import Mock
+from benchmarks.program_generator import ProgramGenerator
+from compiler.artifact_cache import ArtifactCache
+from compiler.compiler import Compiler, DESCENT_PARSER, PLY_PARSER
+from utils.error_handler import ENG, FIN
+
+
+class TestProgramGenerator(unittest.TestCase):
+    """Test class for compiling the programs of benchmarks.program_generator"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def _compile(self, code, parser_name=PLY_PARSER):
+        compiler = Compiler(
+            console_io=Mock(), parser_name=parser_name, artifact_cache=ArtifactCache(maxsize=0)
+        )
+        result = compiler.compile(
+            code,
+            java_path=self.temp_dir.name,
+            errors_path=self.temp_dir.name,
+            write_errors_to_console=False,
+        )
+        self.assertEqual([error.get_message(ENG) for error in result.errors], [])
+        with open(os.path.join(self.temp_dir.name, "Logo.java"), encoding="utf-8") as file:
+            return file.read()
+
+    def test_same_settings_generate_same_program(self):
+        program = ProgramGenerator(seed=3).generate()
+        self.assertEqual(program, ProgramGenerator(seed=3).generate())
+        self.assertNotEqual(program, ProgramGenerator(seed=4).generate())
+
+    def test_unknown_language_raises(self):
+        with self.assertRaises(ValueError):
+            ProgramGenerator(language="swe")
+
+    def test_generated_programs_compile_with_both_parsers(self):
+        for seed in range(8):
+            generator = ProgramGenerator(
+                procedures=seed % 4,
+                parameters=seed % 3,
+                depth=seed,
+                expression_size=seed % 5,
+                make_chain=seed % 3,
+                statements=12,
+                seed=seed,
+            )
+            code = generator.generate()
+            self.assertEqual(self._compile(code), self._compile(code, DESCENT_PARSER))
+
+    def test_finnish_program_compiles_to_same_code_as_english(self):
+        english = ProgramGenerator(ENG, seed=1).generate()
+        finnish = ProgramGenerator(FIN, seed=1).generate()
+        self.assertIn("miten p0", finnish)
+        self.assertEqual(self._compile(english), self._compile(finnish))
+
+    def _compile_with_both_parsers(self, code):
+        for parser_name in (PLY_PARSER, DESCENT_PARSER):
+            with self.subTest(parser=parser_name):
+                self._compile(code, parser_name)
+
+    def test_deeply_nested_blocks_compile(self):
+        code = ProgramGenerator(procedures=1, depth=800, statements=3, indent=False).generate()
+        self._compile_with_both_parsers(code)
+
+    def test_long_expressions_compile(self):
+        code = ProgramGenerator(procedures=1, expression_size=500, statements=3).generate()
+        self._compile_with_both_parsers(code)
+
+    def test_long_make_chains_compile(self):
+        code = ProgramGenerator(procedures=1, make_chain=2000, statements=3).generate()
+        self._compile_with_both_parsers(code)
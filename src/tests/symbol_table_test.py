@@ -133,3 +133,35 @@ class TestSymbolTable(unittest.TestCase):
         self.st.insert("x", self.value1)
         re = self.st.lookup("X")
         self.assertEqual(re, self.value1)
+
+    def test_free_keeps_the_bindings_of_outer_scopes(self):
+        self.st.insert("x", self.value1)
+        self.st.initialize_scope()
+        self.st.insert("x", self.value2)
+        self.st.insert("y", self.value2)
+        self.st.free()
+        self.assertEqual(self.st.lookup("x"), self.value1)
+        self.assertEqual(self.st.lookup("y"), None)
+        self.assertDictEqual(self.st.get_current_scope(), {})
+
+    def test_global_scope_can_be_reached_after_function_scope_ends(self):
+        self.st.insert("x", self.value1)
+        self.st.initialize_scope(in_function="function x's symbol")
+        self.st.initialize_scope()
+        self.st.insert("y", self.value2)
+        re_in_function = self.st.lookup("x")
+        self.st.finalize_scope()
+        self.st.finalize_scope()
+        self.assertEqual(re_in_function, None)
+        self.assertEqual(self.st.lookup("x"), self.value1)
+        self.assertEqual(self.st.lookup("y"), None)
+        self.assertEqual(self.st.get_in_scope_function_symbol(), None)
+
+    def test_insert_global_is_case_insensitive_and_keeps_scopes(self):
+        self.st.initialize_scope()
+        self.st.insert("x", self.value1)
+        self.st.insert_global("X", self.value2)
+        self.st.insert("z", self.value1)
+        self.assertDictEqual(self.st.get_current_scope(), {"x": self.value1, "z": self.value1})
+        self.st.finalize_scope()
+        self.assertDictEqual(self.st.get_current_scope(), {"x": self.value2})
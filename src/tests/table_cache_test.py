@@ -0,0 +1,80 @@
+import tempfile
+import unittest
+from unittest.mock import Mock
+from lexer.lexer import Lexer
+from parser.parser import Parser
+from parser.table_cache import TableCache
+from utils.logger import Logger
+
+
+class TestTableCache(unittest.TestCase):
+    """Test class for the LALR table cache used by the parser"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.logger = Logger(Mock(), Mock())
+        self.lexer = Lexer(self.logger)
+        self.lexer.build()
+        self.table_cache = TableCache(path=self.temp_dir.name)
+        self.parser = Parser(self.lexer, self.logger, table_cache=self.table_cache)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def _create_parser(self):
+        return Parser(self.lexer, self.logger, table_cache=self.table_cache)
+
+    def test_same_grammar_is_generated_only_once(self):
+        self.parser.parse("fd 1")
+        self._create_parser().parse("show 2")
+        self.assertEqual(self.table_cache.misses, 1)
+        self.assertEqual(self.table_cache.hits, 1)
+
+    def test_parser_is_reused_when_grammar_does_not_change(self):
+        self.parser.parse("fd 1")
+        ply_parser = self.parser.get_ply_parser()
+        self.parser.parse("to f :a end f 1")
+        self.assertIs(self.parser.get_ply_parser(), ply_parser)
+        self.assertEqual(self.table_cache.misses, 1)
+        self.assertEqual(self.table_cache.hits, 0)
+
+    def test_procedures_with_same_arities_share_tables(self):
+        self.parser.parse("to f :a :b :c :d :e :f :g :h :i end f 1 2 3 4 5 6 7 8 9")
+        ast = self._create_parser().parse("to g :a :b :c :d :e :f :g :h :i end g 9 8 7 6 5 4 3 2 1")
+        self.assertEqual(self.table_cache.misses, 1)
+        self.assertEqual(self.table_cache.hits, 1)
+        proc_call = ast.children[0].children[1]
+        self.assertEqual(proc_call.leaf, "g")
+        self.assertEqual(len(proc_call.children), 9)
+
+    def test_base_grammar_arities_share_tables(self):
+        self.parser.parse("to f :a end f 1")
+        self.parser.parse("to f :a :b end f 1 2")
+        self.assertEqual(self.table_cache.misses, 1)
+
+    def test_arities_outside_base_grammar_generate_new_tables(self):
+        self.parser.parse("to f :a end f 1")
+        ast = self.parser.parse("to f :a :b :c :d :e :f :g :h :i end f 1 2 3 4 5 6 7 8 9")
+        self.assertEqual(self.table_cache.misses, 2)
+        self.assertEqual(len(ast.children[0].children[1].children), 9)
+
+    def test_tables_are_loaded_from_disk(self):
+        self.parser.parse("to f :a end f 1")
+
+        table_cache = TableCache(path=self.temp_dir.name)
+        parser = Parser(self.lexer, self.logger, table_cache=table_cache)
+        ast = parser.parse("to f :a end f 1")
+
+        self.assertEqual(table_cache.misses, 0)
+        self.assertEqual(table_cache.hits, 1)
+        self.assertEqual(str(ast), str(self.parser.parse("to f :a end f 1")))
+
+    def test_cached_tables_parse_like_generated_tables(self):
+        code = "make \"a 1 + 2 * 3 if :a > 2 { show :a } repeat 2 { fd 1 }"
+        uncached_parser = Parser(
+            self.lexer, self.logger, table_cache=TableCache(path=self.temp_dir.name, use_disk=False)
+        )
+        expected = str(uncached_parser.parse(code))
+
+        self.parser.parse(code)
+        self.assertEqual(str(self.parser.parse(code)), expected)
@@ -8,6 +8,7 @@ from entities.symbol_tables import SymbolTables
 from entities.symbol_table import SymbolTable
 from entities.symbol import Variable
 from entities.symbol import Function
+from entities.logotypes import LogoType
 
 
 class TestType(unittest.TestCase):
@@ -120,3 +121,63 @@ class TestType(unittest.TestCase):
         typeclass_abc = self.symbol_tables.variables.lookup("abc").typeclass
         typeclass_b = self.symbol_tables.variables.lookup("b").typeclass
         self.assertNotEqual(id(typeclass_abc), id(typeclass_b))
+
+    def test_each_reference_is_looked_up_once(self):
+        test_string = """
+            make "a 1
+            fd :a + :a
+            show :a
+            rt :a
+        """
+        ast = self.parser.parse(test_string)
+        ast.check_types()
+
+        # The make looks up "a" once before creating it, and each deref once.
+        self.assertEqual(self.symbol_tables.variables.lookup_count, 5)
+        str(ast)
+        self.assertEqual(self.symbol_tables.get_lookup_count(), 5)
+
+    def test_symbols_are_bound_only_by_type_check(self):
+        ast = self.parser.parse("fd :a")
+        deref = ast.children[0].children[0].children[0]
+        old_symbol = Variable("a")
+        self.symbol_tables.variables.insert("a", old_symbol)
+        self.assertIs(deref.get_symbol(), old_symbol)
+
+        self.symbol_tables.reset()
+        new_symbol = Variable("a")
+        self.symbol_tables.variables.insert("a", new_symbol)
+        ast.check_types()
+        self.symbol_tables.reset()
+        self.assertIs(deref.get_symbol(), new_symbol)
+        self.assertEqual(self.symbol_tables.get_lookup_count(), 0)
+
+    def test_typeclass_of_variable_out_of_scope_is_concatenated(self):
+        test_string = """
+            TO f :x
+                make "b :x
+                if true {
+                    make "a :x
+                    make "a 1
+                }
+                make "b :x
+            END
+        """
+        ast = self.parser.parse(test_string)
+        ast.check_types()
+
+        self.assertEqual(self.error_handler.get_error_count(), 0)
+        procedure = self.symbol_tables.functions.lookup("f")
+        self.assertEqual(procedure.parameters[0].get_logotype(), LogoType.FLOAT)
+
+    def test_long_chain_of_variables_shares_one_typeclass(self):
+        count = 500
+        test_string = "".join(f'make "w{i} "x\n' for i in range(count))
+        test_string += "".join(f'make "w{i} :w{i + 1}\n' for i in range(count - 1))
+        ast = self.parser.parse(test_string)
+        ast.check_types()
+
+        typeclass = self.symbol_tables.variables.lookup("w0").typeclass
+        self.assertEqual(len(typeclass.variables), count)
+        for i in range(count):
+            self.assertIs(self.symbol_tables.variables.lookup(f"w{i}").typeclass, typeclass)
@@ -0,0 +1,95 @@
+import unittest
+from unittest.mock import Mock
+from code_generator.code_generator import JavaCodeGenerator
+from entities.ast.visitor import Visitor
+from entities.preconfigured_functions import initialize_logo_functions
+from entities.symbol_table import SymbolTable
+from entities.symbol_tables import SymbolTables
+from lexer.lexer import Lexer
+from optimizer.pass_manager import PassManager
+from parser.parser import Parser
+from utils.console_io import default_console_io
+from utils.error_handler_mock import ErrorHandlerMock
+from utils.logger import Logger
+
+DEPTH = 5000
+
+
+class Evaluator(Visitor):
+    def visit_Float(self, node):
+        return node.leaf
+
+    def visit_BinOp(self, node):
+        operand1 = yield node.children[0]
+        operand2 = yield node.children[1]
+        return operand1 + operand2 if node.leaf == "+" else operand1 * operand2
+
+
+class NodeCounter(Visitor):
+    name = "Node counting"
+
+    def __init__(self):
+        self.count = 0
+
+    def run(self, start_node):
+        self.visit(start_node)
+        return f"{self.count} nodes"
+
+    def generic_visit(self, node):
+        self.count += 1
+        yield from super().generic_visit(node)
+
+
+class TestVisitor(unittest.TestCase):
+    """Test class for the iterative AST visitors and the pass manager"""
+
+    def setUp(self):
+        self.error_handler = ErrorHandlerMock()
+        self.console_io = Mock()
+        self.logger = Logger(console_io=self.console_io, error_handler=self.error_handler)
+        self.lexer = Lexer(self.logger)
+        self.lexer.build()
+        self.symbol_tables = SymbolTables(
+            SymbolTable(), functions=initialize_logo_functions(SymbolTable())
+        )
+        self.code_generator = JavaCodeGenerator(logger=self.logger)
+        self.parser = Parser(self.lexer, self.logger, self.symbol_tables, self.code_generator)
+
+    def _expression(self, ast):
+        return ast.children[0].children[0].children[0]
+
+    def test_handlers_get_the_values_of_the_nodes_they_visit(self):
+        ast = self.parser.parse("show 1 + 2 * 3 + 4")
+        self.assertEqual(Evaluator().visit(self._expression(ast)), 11.0)
+
+    def test_deep_expression_does_not_hit_the_recursion_limit(self):
+        ast = self.parser.parse("fd " + " + ".join(["1"] * DEPTH))
+
+        self.assertEqual(Evaluator().visit(self._expression(ast)), DEPTH)
+        ast.check_types()
+        self.assertEqual(self.error_handler.get_error_ids(), [])
+        ast.generate_code()
+        self.assertIn("robot.travel", "\n".join(self.code_generator.get_generated_code()))
+        self.assertEqual(str(ast).count("(BinOp, +"), DEPTH - 1)
+        formatted_ast = default_console_io.get_formatted_ast(ast)
+        self.assertEqual(formatted_ast.count("Type: BinOp"), DEPTH - 1)
+
+    def test_deeply_nested_blocks_are_checked(self):
+        ast = self.parser.parse("repeat 2 { " * 300 + "fd :x" + " }" * 300)
+        ast.check_types()
+        self.assertEqual(self.error_handler.get_error_ids(), ["undefined_variable"])
+
+    def test_pass_manager_runs_passes_in_order(self):
+        pass_manager = PassManager(Logger(self.console_io, self.error_handler, True))
+        self.assertFalse(pass_manager.run(self.parser.parse("fd 1")))
+
+        first, second = NodeCounter(), NodeCounter()
+        second.name = "Second counting"
+        pass_manager.add_pass(first)
+        pass_manager.add_pass(second)
+        self.assertTrue(pass_manager.run(self.parser.parse("fd 1 + 2")))
+
+        self.assertEqual(pass_manager.get_pass_names(), ["Node counting", "Second counting"])
+        self.assertEqual(first.count, 6)
+        self.assertEqual(second.count, 6)
+        self.console_io.write.assert_any_call("Node counting: 6 nodes")
@@ -16,13 +16,18 @@ class ConsoleIO:
 
     @staticmethod
     def get_formatted_ast(ast, indent="", result=""):
-        result += indent + "Type: " + str(ast.node_type) + "\n"
-        result += indent + "Leaf: " + str(ast.leaf) + "\n"
-        result += indent + "Logotype: " + str(ast.get_logotype()) + "\n"
-        result += indent + "Children: " + "\n"
-        for child in ast.children:
-            result += default_console_io.get_formatted_ast(child, (indent + "\t"))
-        return result
+        """Returns the AST as an indented string. The nodes are taken from an explicit
+        stack instead of recursing, so deep trees don't hit the recursion limit."""
+        parts = [result]
+        stack = [(ast, indent)]
+        while stack:
+            node, indent = stack.pop()
+            parts.append(indent + "Type: " + str(node.node_type) + "\n")
+            parts.append(indent + "Leaf: " + str(node.leaf) + "\n")
+            parts.append(indent + "Logotype: " + str(node.get_logotype()) + "\n")
+            parts.append(indent + "Children: " + "\n")
+            stack.extend((child, indent + "\t") for child in reversed(node.children))
+        return "".join(parts)
 
     @staticmethod
     def print_ast(ast):
@@ -1,10 +1,14 @@
 """error_handler.py is responsible for getting error messages from json files
-and storing error messages in a list when they occur during compiling
+and storing errors in a list when they occur during compiling
 """
 
 import json
 import os
+import re
+from collections import namedtuple
+from functools import lru_cache
 from utils.console_io import default_console_io
+from utils.file_writer import write_if_changed
 
 FIN = "fin"
 ENG = "eng"
@@ -13,106 +17,155 @@ PATH = os.path.join(os.path.dirname(os.path.relpath(__file__)), "../../src/error
 ERROR_MESSAGES_PATH = os.path.join(os.path.dirname(os.path.relpath(__file__)), "../../src/language/")
 
 
+# The @-tags of the messages, e.g. @var_name
+TAG = re.compile(r"@([^\W\d]\w*)")
+
+
+@lru_cache(maxsize=None)
+def load_error_messages(language):
+    """Loads the error messages of the given language. The json files are read only once
+    per process."""
+    filename = os.path.join(ERROR_MESSAGES_PATH, f"{language}/{language}_error_messages.json")
+    with open(filename, encoding="utf-8") as file:
+        return json.load(file)
+
+
+@lru_cache(maxsize=None)
+def load_templates(language):
+    """Returns the error messages of the given language as format strings, where the
+    @-tags are replacement fields, e.g. "Row @row" -> "Row {row}"."""
+    return {
+        msg_id: TAG.sub(r"{\1}", message.replace("{", "{{").replace("}", "}}"))
+        for msg_id, message in load_error_messages(language).items()
+    }
+
+
+class _Params(dict):
+    """Params of a message. A tag without a param is left in the message as it is."""
+
+    def __missing__(self, tag):
+        return "@" + tag
+
+
+class Error(namedtuple("Error", ("msg_id", "start", "end", "params"))):
+    """An error of a compilation. params are (tag, value) pairs with the values converted
+    to str. The message is rendered from the template only when it is read, in the
+    language asked for."""
+
+    __slots__ = ()
+
+    def get_message(self, language):
+        """Returns the message in language, with the @-tags replaced by the params."""
+        return load_templates(language)[self.msg_id].format_map(_Params(self.params))
+
+    def __getitem__(self, key):
+        """Reads the error also like the dicts of the earlier versions: error["fin"],
+        error["eng"], error["start"] and error["end"]."""
+        if key in (FIN, ENG):
+            return self.get_message(key)
+        if key == "start":
+            return self.start
+        if key == "end":
+            return self.end
+        return super().__getitem__(key)
+
+
 class ErrorHandler:
     """ErrorHandler class takes all error messages when running the compiler.
-    The messages are stored in a list
+    The errors are stored in a list in the order they occurred, and a set of them
+    drops the duplicates.
     """
 
     def __init__(self, console_io=default_console_io, language=FIN, name=DEFAULT_NAME):
         if language.lower() not in (FIN, ENG):
             raise Exception(f"Language {language} is not defined")
         self.errors = []
+        self._error_set = set()
         self.console_io = console_io
         self.language = language.lower()
 
-        self.fin_messages_dict = self._get_fin_messages()
-        self.eng_messages_dict = self._get_eng_messages()
+        # Both languages have the same message ids.
+        self._msg_ids = load_templates(FIN).keys() & load_templates(ENG).keys()
 
         self._err_msg_filename = name
 
-    def _get_fin_messages(self):
-        with open(os.path.join(ERROR_MESSAGES_PATH, "fin/fin_error_messages.json"), encoding="utf-8") as file:
-            return json.load(file)
-
-    def _get_eng_messages(self):
-        with open(os.path.join(ERROR_MESSAGES_PATH, "eng/eng_error_messages.json"), encoding="utf-8") as file:
-            return json.load(file)
-
-    def _get_message_by_id(self, msg_id: str):
-        msg_dict = {
-            FIN: self.fin_messages_dict[msg_id],
-            ENG: self.eng_messages_dict[msg_id],
-        }
-        return msg_dict
+    def reset(self):
+        """Removes the errors of the previous compilation."""
+        self.errors = []
+        self._error_set = set()
 
     def add_error(self, msg_id: str, lexspan, **kwargs):
-        """Gets the error message frame in the defined language (ENG/FIN),
-        replaces the @-tags with the params given as **kwargs.
-        These messages are then added to a list of messages.
+        """Adds an error, unless the same error has already been added. The @-tags of the
+        error message are replaced with the params given as **kwargs when the message is
+        read.
 
         Args:
-            msg_id (int): ID of the error defined in the error.json files
+            msg_id (str): ID of the error defined in the error.json files
         """
-        msg_dict = self._get_message_by_id(msg_id)
+        if msg_id not in self._msg_ids:
+            raise KeyError(msg_id)
+        params = tuple([(key, str(value)) for key, value in kwargs.items()])
+        self._add(Error(msg_id, lexspan[0], lexspan[1], params))
 
-        fin_msg = msg_dict[FIN]
-        eng_msg = msg_dict[ENG]
+    def extend(self, errors):
+        """Adds Error records, e.g. the errors of an earlier compilation."""
+        for error in errors:
+            self._add(error)
 
-        for key, value in kwargs.items():
-            fin_msg = fin_msg.replace(f"@{key}", str(value))
-            eng_msg = eng_msg.replace(f"@{key}", str(value))
-
-        err_msgs = {
-            FIN: fin_msg,
-            ENG: eng_msg,
-            "start": lexspan[0],
-            "end": lexspan[1]
-        }
-
-        # Lexer is ran multiple times in the program
-        # and causes the same error messages to occur
-        if err_msgs not in self.errors:
-            self.errors.append(err_msgs)
+    def _add(self, error):
+        if error not in self._error_set:
+            self._error_set.add(error)
+            self.errors.append(error)
 
     def get_error_messages(self):
-        """Returns error messages"""
+        """Returns the errors. Their messages are read with error.get_message(language)."""
         return self.errors
 
-    def create_json_file(self):
+    def get_error_count(self):
+        """Returns the number of errors"""
+        return len(self.errors)
+
+    def discard_errors(self, count):
+        """Removes the errors added after the first count errors, e.g. the errors of a
+        partial parse that is redone in full."""
+        self._error_set.difference_update(self.errors[count:])
+        del self.errors[count:]
+
+    def create_json_file(self, path=None):
+        """Writes the error messages in both languages to json files. Files that already
+        have the same errors are not rewritten."""
+        path = path if path is not None else PATH
         fin_dict = {}
         eng_dict = {}
         for index, msg in enumerate(self.errors, start=1):
             fin_dict[index] = {
-                "message": msg[FIN],
-                "start": msg["start"],
-                "end": msg["end"]
+                "message": msg.get_message(FIN),
+                "start": msg.start,
+                "end": msg.end
             }
             eng_dict[index] = {
-                "message": msg[ENG],
-                "start": msg["start"],
-                "end": msg["end"]
+                "message": msg.get_message(ENG),
+                "start": msg.start,
+                "end": msg.end
             }
 
         try:
-            fin_path = PATH + FIN + "_" + self._err_msg_filename + ".json"
-            eng_path = PATH + ENG + "_" + self._err_msg_filename + ".json"
-
-            with open(fin_path, mode="w+", encoding="utf-8") as file:
-                json_object = json.dumps(fin_dict, ensure_ascii=False).encode("utf8")
-                file.write(json_object.decode())
+            fin_path = os.path.join(path, FIN + "_" + self._err_msg_filename + ".json")
+            eng_path = os.path.join(path, ENG + "_" + self._err_msg_filename + ".json")
 
-            with open(eng_path, mode="w+", encoding="utf-8") as file:
-                json_object = json.dumps(eng_dict, ensure_ascii=False).encode("utf8")
-                file.write(json_object.decode())
+            write_if_changed(fin_path, json.dumps(fin_dict, ensure_ascii=False))
+            write_if_changed(eng_path, json.dumps(eng_dict, ensure_ascii=False))
 
         except Exception as error:
-            print(f"An error occurred when writing {self._err_msg_filename}.json file:\n{error}")
+            self.console_io.write(
+                f"An error occurred when writing {self._err_msg_filename}.json file:\n{error}"
+            )
             raise
 
     def write_errors_to_console(self):
         """Writes error messages to console in the selected language"""
         for msg in self.errors:
-            self.console_io.write(msg[self.language])
+            self.console_io.write(msg.get_message(self.language))
 
 
 default_error_handler = ErrorHandler()
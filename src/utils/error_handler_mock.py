@@ -16,6 +16,14 @@ class ErrorHandlerMock:
         """return list of error IDs"""
         return self.error_ids
 
+    def get_error_count(self):
+        """return number of error IDs"""
+        return len(self.error_ids)
+
+    def discard_errors(self, count):
+        """remove error IDs after the first count"""
+        del self.error_ids[count:]
+
     def check_id_is_in_errors(self, error_id):
         """check an error ID is in error list and returns boolean"""
         return error_id in self.error_ids
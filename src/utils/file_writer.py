@@ -0,0 +1,69 @@
+"""Writes the output files of the compiler. A file is only written when its content
+changes, so that its modification time stays the same and Gradle doesn't rebuild the
+classes that depend on it."""
+
+import os
+import threading
+
+# Characters read at a time when comparing files
+CHUNK_SIZE = 64 * 1024
+
+
+def _get_temp_path(path):
+    return f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+
+
+def _has_same_content(path, other_path):
+    """Returns True if the files at path and other_path exist and have the same content."""
+    try:
+        with open(path, "rb") as file, open(other_path, "rb") as other_file:
+            while True:
+                chunk = file.read(CHUNK_SIZE)
+                if chunk != other_file.read(CHUNK_SIZE):
+                    return False
+                if not chunk:
+                    return True
+    except OSError:
+        return False
+
+
+def write_if_changed(path, content):
+    """Writes content to the file at path, unless the file already has the same content.
+    The content is written to a temporary file, which is then renamed over path, so that
+    the file is never left half written. Returns True if the file was written."""
+    try:
+        with open(path, mode="r", encoding="utf-8") as file:
+            if file.read() == content:
+                return False
+    except (OSError, UnicodeDecodeError):
+        pass
+
+    temp_path = _get_temp_path(path)
+    try:
+        with open(temp_path, mode="w", encoding="utf-8") as file:
+            file.write(content)
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+    return True
+
+
+def write_chunks_if_changed(path, chunks):
+    """Like write_if_changed, but the content is an iterable of strings, so that it is
+    never in memory as a whole. The chunks are written to the temporary file, which is
+    compared to the file at path before it is renamed over it."""
+    temp_path = _get_temp_path(path)
+    try:
+        with open(temp_path, mode="w", encoding="utf-8") as file:
+            file.writelines(chunks)
+        if _has_same_content(temp_path, path):
+            os.remove(temp_path)
+            return False
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+    return True
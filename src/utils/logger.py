@@ -1,17 +1,29 @@
 """Module for console printing and error handling."""
 from utils.console_io import default_console_io
 from utils.error_handler import default_error_handler
+from utils.profiler import default_profiler
 
 
 class Logger:
-    """Console IO/Error Handling utilities"""
+    """Console IO/Error Handling utilities. The profiler times the compiler phases."""
 
     def __init__(
-        self, console_io=default_console_io, error_handler=default_error_handler, debug=False
+        self,
+        console_io=default_console_io,
+        error_handler=default_error_handler,
+        debug=False,
+        profiler=default_profiler,
     ):
         self.console = console_io
         self.error_handler = error_handler
         self._debug = debug
+        self.profiler = profiler
+
+    @property
+    def debug_enabled(self):
+        """True if debug messages are printed. Check this before building expensive
+        debug messages."""
+        return self._debug
 
     def debug(self, input_message=""):
         """Prints a debug message using console_io if the DEBUG flag is set."""
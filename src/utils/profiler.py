@@ -0,0 +1,69 @@
+"""Profiler for the compiler phases. Measures the wall and CPU time of each phase and
+collects counters, e.g. the number of tokens, and reports them as a dict that can be
+dumped as JSON."""
+
+from contextlib import contextmanager
+from time import perf_counter, process_time
+
+
+class Profiler:
+    """Collects phase times and counters while enabled. The phases are named sections of
+    the compiler, e.g. "parse", and a phase that runs many times is summed up. A disabled
+    profiler measures nothing, so the phases can be marked in the compiler unconditionally.
+    """
+
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self._phases = {}
+        self._counters = {}
+
+    def reset(self):
+        """Removes the collected times and counters."""
+        self._phases = {}
+        self._counters = {}
+
+    @contextmanager
+    def phase(self, name):
+        """Context manager that adds the time spent in its block to the phase name."""
+        if not self.enabled:
+            yield
+            return
+
+        wall = perf_counter()
+        cpu = process_time()
+        try:
+            yield
+        finally:
+            times = self._phases.setdefault(name, [0.0, 0.0, 0])
+            times[0] += perf_counter() - wall
+            times[1] += process_time() - cpu
+            times[2] += 1
+
+    def count(self, name, value=1):
+        """Adds value to the counter name."""
+        if self.enabled:
+            self._counters[name] = self._counters.get(name, 0) + value
+
+    def get_report(self):
+        """Returns the phases in the order they first ran, with their wall and CPU time in
+        milliseconds and the number of times they ran, and the counters."""
+        return {
+            "phases": {
+                name: {
+                    "wall_ms": round(wall * 1000, 3),
+                    "cpu_ms": round(cpu * 1000, 3),
+                    "calls": calls,
+                }
+                for name, (wall, cpu, calls) in self._phases.items()
+            },
+            "counters": dict(self._counters),
+        }
+
+    def pop_report(self):
+        """Returns the report and resets the profiler."""
+        report = self.get_report()
+        self.reset()
+        return report
+
+
+default_profiler = Profiler()
@@ -28,6 +28,26 @@ def start(ctx, logo_file, debug=False):
     ctx.run(command)
 
 
+@task
+def serve(ctx):
+    ctx.run("python3 src/main.py --serve")
+
+
+@task
+def batch(ctx, path, output="batch_output", jobs=0):
+    jobs_arg = f" --jobs {jobs}" if jobs else ""
+    ctx.run(f"python3 src/main.py batch {path} --output {output}{jobs_arg}")
+
+
+@task
+def bench(ctx, save=False, threshold=0.2, repeat=20):
+    command = f"python3 -m benchmarks.compiler_phases --threshold {threshold} --repeat {repeat}"
+    if save:
+        command += " --save"
+    with ctx.cd("src"):
+        ctx.run(command, pty=True)
+
+
 # From https://github.com/ohjelmistotekniikka-hy/python-todo-app/blob/master/tasks.py
 @task
 def coverage(ctx):